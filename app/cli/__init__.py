@@ -0,0 +1 @@
+# 명령행 도구 패키지
@@ -0,0 +1,294 @@
+"""
+계약서 일괄 분석 (오프라인 배치)
+사용법: python -m app.cli.batch_analyze SOURCE [--output results.ndjson] [--workers 4] [--concurrency 8]
+        [--resume] [--report-interval 10]
+
+SOURCE는 디렉터리 또는 zip/tar(.tar.gz, .tgz) 아카이브입니다.
+API와 같은 서비스 코드(TextExtractor → TextSegmenter → classify_articles)를 그대로 사용하며,
+텍스트 추출만 API와 같은 제한된 작업자 풀(ExtractionPool: 메모리/CPU/시간 제한, 죽은 작업자 교체)에서
+병렬로 실행합니다. LLM 호출은 공유 스케줄러/레이트 리미터의
+bulk 우선순위로 나가므로 동시 요청 수와 속도 제한이 API와 동일하게 적용됩니다.
+
+결과는 문서마다 한 줄(NDJSON)씩 바로 기록하며, 출력 파일이 체크포인트를 겸합니다.
+--resume 이면 출력 파일에 이미 있는 문서는 건너뛰고 이어서 기록합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tarfile
+import zipfile
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import pydantic_core
+
+from app.logging_config import setup_logging
+from app.schemas.contract.types import Article
+from app.schemas.upload.file_upload import FileType
+from app.services.file.text_extractor import text_extractor, ExtractionError
+from app.services.file import sandbox
+from app.services.text_segmenter import TextSegmenter
+from app.services.analyzer import classify_articles, compute_counts, safety_percent, DEGRADED_REASONS
+from app.services.llm_scheduler import request_scope
+from app.services import cascade, usage, metrics
+from app.routers.upload.file_upload import get_file_type
+from app.routers.contract.analyze import extract_document_title
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+def _extract(file_path: str, file_type: str) -> Optional[str]:
+    """프로세스 풀 작업자에서 실행"""
+    return text_extractor.extract_text_sync(file_path, FileType(file_type))
+
+
+def _scratch_path(directory: str, index: int, name: str) -> str:
+    return os.path.join(directory, f"{index}{os.path.splitext(name)[1].lower()}")
+
+
+def iter_sources(source: str, scratch: str) -> Iterator[Tuple[str, str, bool]]:
+    """(문서 id, 파일 경로, 임시 파일 여부)
+
+    아카이브 멤버는 한 번 순회하면서 scratch 디렉터리에 하나씩 풀어 경로를 넘깁니다.
+    (추출기는 파일 경로를 받음)
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if get_file_type(name) != FileType.UNKNOWN:
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), path, False
+    elif source.endswith(".zip"):
+        with zipfile.ZipFile(source) as z:
+            for index, info in enumerate(z.infolist()):
+                if info.is_dir() or get_file_type(info.filename) == FileType.UNKNOWN:
+                    continue
+                path = _scratch_path(scratch, index, info.filename)
+                with z.open(info) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                yield info.filename, path, True
+    elif source.endswith(ARCHIVE_SUFFIXES):
+        with tarfile.open(source) as t:
+            for index, member in enumerate(t):
+                if not member.isfile() or get_file_type(member.name) == FileType.UNKNOWN:
+                    continue
+                path = _scratch_path(scratch, index, member.name)
+                with t.extractfile(member) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                yield member.name, path, True
+    else:
+        raise ValueError(f"디렉터리 또는 zip/tar 아카이브가 아닙니다: {source}")
+
+
+def load_checkpoint(output: str) -> Set[str]:
+    """출력 파일에 이미 기록된 문서 id (마지막 줄이 잘렸으면 잘라냄)"""
+    done: Set[str] = set()
+    if not os.path.exists(output):
+        return done
+    good = 0
+    with open(output, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(line)["source"])
+            except (ValueError, KeyError, TypeError):
+                break
+            good += len(line)
+    if good != os.path.getsize(output):
+        logger.warning("체크포인트 마지막 줄이 손상되어 잘라냅니다 (%d바이트 유지)", good)
+        with open(output, "r+b") as f:
+            f.truncate(good)
+    return done
+
+
+class SentenceMemo:
+    """같은 실행 안에서 이미 분류한 문장 결과 재사용 (템플릿 계약서는 같은 문장이 많음)"""
+
+    def __init__(self):
+        self._results: Dict[str, tuple] = {}
+        self.hits = 0
+
+    def fill(self, articles: List[Article]) -> List[Article]:
+        """기억한 문장은 결과를 채우고, 남은 문장만 담은 조항 목록(분석 대상)을 반환"""
+        targets = []
+        for art in articles:
+            pending = []
+            for s in art.sentences:
+                known = self._results.get(s.text)
+                if known is None:
+                    pending.append(s)
+                else:
+                    s.risk, s.why, s.fix = known
+                    self.hits += 1
+            if pending:
+                # 같은 Sentence 객체를 담으므로 분석 결과가 원래 조항에 바로 반영됨
+                targets.append(Article.model_construct(id=art.id, title=art.title, sentences=pending))
+        return targets
+
+    def remember(self, articles: List[Article]):
+        """모델/규칙으로 실제 분류한 문장만 기억 (장애·예산 초과로 대신 채운 결과는 다음 문서에서 다시 분석)"""
+        for art in articles:
+            for s in art.sentences:
+                if s.why not in DEGRADED_REASONS:
+                    self._results[s.text] = (s.risk, s.why, s.fix)
+
+
+class BatchStats:
+    def __init__(self):
+        self.memo = SentenceMemo()
+        self.started = time.perf_counter()
+        self.documents = 0
+        self.errors = 0
+        self.skipped = 0
+        self.sentences = 0
+
+    def report(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        llm = usage.usage_ledger.endpoints.get("batch", {})
+        return (
+            f"문서 {self.documents}개 (오류 {self.errors}, 건너뜀 {self.skipped}) / {elapsed:.1f}초 - "
+            f"{self.documents / elapsed if elapsed else 0:.2f} 문서/초, "
+            f"{self.sentences / elapsed if elapsed else 0:.1f} 문장/초, 재사용 문장 {self.memo.hits}개, "
+            f"LLM 호출 {llm.get('calls', 0)}회 / 토큰 {llm.get('prompt_tokens', 0) + llm.get('completion_tokens', 0)}"
+        )
+
+
+async def analyze_document(doc_id: str, file_path: str, pool: sandbox.ExtractionPool, memo: SentenceMemo) -> dict:
+    """추출(작업자 프로세스) → 분할 → 분류 → 결과 한 건"""
+    started = time.perf_counter()
+    file_type = get_file_type(doc_id)
+    try:
+        with metrics.stage("extraction", file_type.value):
+            text = await pool.run(_extract, file_path, file_type.value)
+    except (ExtractionError, sandbox.ExtractionLimitError) as e:
+        return {"source": doc_id, "error": f"텍스트를 추출할 수 없습니다: {e}"}
+    if not text:
+        return {"source": doc_id, "error": "텍스트를 추출할 수 없습니다."}
+
+    segmenter = TextSegmenter()
+    with metrics.stage("segmentation", "text"):
+        segmenter.feed(text)
+        segmenter.finish()
+    articles = segmenter.articles
+    if not articles:
+        return {"source": doc_id, "error": "파일에서 계약서 문장을 찾을 수 없습니다."}
+
+    tier_counts = cascade.new_tier_counts() if cascade.CASCADE_ENABLED else None
+    with usage.track("batch", usage.ANALYZE_TOKEN_BUDGET) as tracker, request_scope():
+        tracker.task_id = doc_id
+        targets = memo.fill(articles)
+        await classify_articles(targets, tier_counts)
+    memo.remember(targets)
+
+    counts = compute_counts(articles)
+    return {
+        "source": doc_id,
+        "file_type": file_type.value,
+        "title": extract_document_title(articles),
+        "counts": counts,
+        "safety_percent": safety_percent(counts),
+        "tier_counts": tier_counts,
+        "usage": tracker.summary(),
+        "elapsed": round(time.perf_counter() - started, 3),
+        "articles": articles,
+    }
+
+
+async def run(args) -> BatchStats:
+    stats = BatchStats()
+    done = load_checkpoint(args.output) if args.resume else set()
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 2)
+    # 작업자가 죽거나(OOM) 멈추면 해당 문서만 실패로 기록하고 풀을 새로 만듦
+    pool = sandbox.ExtractionPool(args.workers)
+    with tempfile.TemporaryDirectory(prefix="checky-batch-") as scratch, \
+            open(args.output, "ab" if args.resume else "wb") as out:
+
+        async def produce():
+            # 아카이브 풀기 등 파일 I/O는 스레드에서
+            sources = iter_sources(args.source, scratch)
+            while True:
+                item = await asyncio.to_thread(next, sources, None)
+                if item is None:
+                    break
+                doc_id, path, temporary = item
+                if doc_id in done:
+                    stats.skipped += 1
+                    if temporary:
+                        os.remove(path)
+                    continue
+                await queue.put(item)
+            for _ in range(args.concurrency):
+                await queue.put(None)
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                doc_id, path, temporary = item
+                try:
+                    result = await analyze_document(doc_id, path, pool, stats.memo)
+                except Exception as e:
+                    logger.exception("문서 분석 실패: %s", doc_id)
+                    result = {"source": doc_id, "error": f"{type(e).__name__}: {e}"}
+                finally:
+                    if temporary:
+                        os.remove(path)
+                if "error" in result:
+                    stats.errors += 1
+                else:
+                    stats.sentences += result["counts"]["total"]
+                stats.documents += 1
+                out.write(pydantic_core.to_json(result) + b"\n")
+                out.flush()
+
+        async def report():
+            while True:
+                await asyncio.sleep(args.report_interval)
+                print(stats.report(), file=sys.stderr)
+
+        reporter = asyncio.create_task(report()) if args.report_interval > 0 else None
+        watchdog = asyncio.create_task(pool.start_watchdog())
+        try:
+            await asyncio.gather(produce(), *(consume() for _ in range(args.concurrency)))
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+            await pool.stop_watchdog()
+            watchdog.cancel()
+            pool.shutdown()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계약서 일괄 분석 (NDJSON 출력)")
+    parser.add_argument("source", help="디렉터리 또는 zip/tar 아카이브")
+    parser.add_argument("--output", default="results.ndjson", help="결과 NDJSON 경로 (체크포인트 겸용)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="텍스트 추출 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시에 분석할 문서 수")
+    parser.add_argument("--resume", action="store_true", help="출력 파일에 있는 문서는 건너뛰고 이어서 기록")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="진행 상황 출력 주기(초, 0이면 끔)")
+    args = parser.parse_args()
+
+    listener = setup_logging()
+    listener.start()
+    try:
+        stats = asyncio.run(run(args))
+        print(stats.report(), file=sys.stderr)
+    finally:
+        listener.stop()
+
+
+if __name__ == "__main__":
+    main()
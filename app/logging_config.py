@@ -0,0 +1,104 @@
+import os
+import json
+import queue
+import random
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+# 로그 포맷팅/출력은 별도 스레드(QueueListener)에서 처리해 이벤트 루프를 막지 않음
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json | text
+# DEBUG 로그는 일부만 남김 (1.0이면 전부)
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# LogRecord 기본 속성 (나머지는 extra로 넘긴 구조화 필드)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+
+class RequestContextFilter(logging.Filter):
+    """요청 ID를 레코드에 붙입니다. (로그를 남긴 쪽의 컨텍스트에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """INFO 미만 레코드는 rate 비율만 통과"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.INFO or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class QueueDropHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버림"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 인자만 합치고 포맷팅(JSON 직렬화)은 리스너 스레드에서
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            QueueDropHandler.dropped += 1
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """루트 로거를 큐 핸들러로 교체하고 (시작 전) 리스너를 반환합니다."""
+    stream = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+
+    log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+    handler = QueueDropHandler(log_queue)
+    handler.addFilter(SamplingFilter(LOG_DEBUG_SAMPLE_RATE))
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, QueueDropHandler):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+    return logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+
+
+def summarize_articles(articles) -> dict:
+    """로그용 조항/문장 요약 (본문은 남기지 않음)"""
+    sentences = [s for a in articles for s in a.sentences]
+    return {
+        "articles": len(articles),
+        "sentences": len(sentences),
+        "chars": sum(len(s.text) for s in sentences),
+    }
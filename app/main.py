@@ -1,27 +1,144 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import os
 import asyncio
+import logging
+import time
+import uuid
 from contextlib import asynccontextmanager
 
+# 구조화 로깅 (요청 ID 포함, 큐 기반 비동기 출력)
+from app.logging_config import setup_logging, request_id_var
+
 # 파일 정리 서비스
 from app.services.file.file_cleaner import file_cleaner
+# 과부하 진입 제어
+from app.services.admission import admission, OverloadedError
+# 요청/단계별 메트릭, 트레이싱
+from app.services import metrics, tracing
+# 응답 압축
+from app.services.compression import CompressionMiddleware
+# 문서 텍스트 추출 (무거운 라이브러리는 시작 후 백그라운드에서 미리 로드)
+from app.services.file.text_extractor import text_extractor
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 서버 시작 시
+    log_listener = setup_logging()
+    log_listener.start()
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
     asyncio.create_task(file_cleaner.start_cleaner())
+    if text_extractor.sandbox is not None:
+        asyncio.create_task(text_extractor.sandbox.start_watchdog())
+    # 포트는 바로 열고, 추출 라이브러리 로드가 끝나면 /ready 가 200을 반환
+    app.state.ready = False
+    asyncio.create_task(_warm_up(app))
     yield
     # 서버 종료 시
     await file_cleaner.stop_cleaner()
+    if text_extractor.sandbox is not None:
+        await text_extractor.sandbox.stop_watchdog()
+        text_extractor.sandbox.shutdown()
+    log_listener.stop()
+
+async def _warm_up(app: FastAPI):
+    try:
+        await asyncio.to_thread(text_extractor.warm_up)
+    except Exception as e:
+        logging.getLogger(__name__).warning("추출기 워밍업 실패: %s", e)
+    app.state.ready = True
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
     title="Checky API",
     description="AI 계약서 독소조항 분석기 API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=metrics.TimedJSONResponse,
 )
 
+# 과부하 시 요청을 조기에 거절 (503 + Retry-After)
+# CORS 미들웨어보다 먼저 등록해야 503 응답에도 CORS 헤더가 붙음
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    gate = admission.gate_for(request.method, request.url.path)
+    if gate is None:
+        return await call_next(request)
+
+    try:
+        gate.enter()
+    except OverloadedError as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": f"서버가 혼잡합니다. 잠시 후 다시 시도해주세요. ({e.reason})"},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    started = time.monotonic()
+    try:
+        return await call_next(request)
+    finally:
+        gate.exit(time.monotonic() - started)
+
+# 단계별 처리 시간을 Server-Timing 헤더로 반환
+# 관리자 토큰을 X-Profile 헤더로 보내면 이 요청 동안 샘플링 프로파일을 저장 (X-Profile-Id)
+@app.middleware("http")
+async def request_tracing(request: Request, call_next):
+    trace = tracing.start()
+    profiler = None
+    if tracing.profiling_allowed(request.headers.get("x-profile")):
+        profiler = tracing.SamplingProfiler()
+        if not profiler.start():
+            profiler = None
+
+    try:
+        response = await call_next(request)
+    finally:
+        folded = profiler.stop() if profiler is not None else None
+
+    response.headers["Server-Timing"] = trace.server_timing()
+    if folded is not None:
+        response.headers["X-Profile-Id"] = await asyncio.to_thread(tracing.save_profile, folded)
+    return response
+
+# 라우트 템플릿별 요청 수/처리 시간 (503 거절 포함)
+_route_paths = {}
+
+def _route_label(request: Request) -> str:
+    endpoint = request.scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    if not _route_paths:
+        _route_paths.update({route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")})
+    return _route_paths.get(endpoint, "unmatched")
+
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.observe_request(request.method, _route_label(request), status, time.perf_counter() - started)
+
+# 요청 ID (X-Request-ID를 받으면 그대로 사용) → 로그와 응답 헤더에 연결
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex[:16]
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+# 큰 JSON 응답 압축 (gzip, brotli 설치 시 br) - 스트리밍 응답은 그대로 통과
+app.add_middleware(CompressionMiddleware)
+
 # CORS 설정 (프론트엔드 연동용)
 app.add_middleware(
     CORSMiddleware,
@@ -32,11 +149,13 @@ app.add_middleware(
 )
 
 # 라우터 포함
-from app.routers.upload.file_upload import router as file_upload_router
+from app.routers.upload.file_upload import router as file_upload_router, UPLOAD_DIR
 from app.routers.chat.chat_router import router as chat_router
+from app.routers.metrics.metrics_router import router as metrics_router
 
 app.include_router(file_upload_router)
 app.include_router(chat_router)
+app.include_router(metrics_router)
 
 # 기본 라우트
 @app.get("/")
@@ -47,6 +166,13 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """트래픽을 받을 준비가 됐는지 (/health는 프로세스 생존 여부만 확인)"""
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
 
 from app.routers.contract import analyze
 app.include_router(analyze.router)
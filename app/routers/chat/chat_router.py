@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 from datetime import datetime
 from app.schemas.chat.types import ChatRequest, ChatResponse
 from app.services.chat_service import chat_service
+from app.services import usage
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -22,11 +23,12 @@ async def chat(request: ChatRequest):
         if not request.message or not request.message.strip():
             raise HTTPException(status_code=400, detail="메시지가 비어있습니다.")
         
-        # AI 응답 생성
-        ai_response = await chat_service.get_chat_response(
-            user_message=request.message,
-            conversation_history=request.conversation_history
-        )
+        # AI 응답 생성 (토큰 사용량은 요청 단위로 집계)
+        with usage.track("chat", usage.CHAT_TOKEN_BUDGET):
+            ai_response = await chat_service.get_chat_response(
+                user_message=request.message,
+                conversation_history=request.conversation_history
+            )
         
         # 대화 기록 업데이트
         updated_history = chat_service.format_conversation_history(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Header, Query
 from fastapi.exceptions import RequestValidationError
 from app.schemas.contract.types import AnalyzeRequest, AnalyzeResponse
 from app.services.analyzer import (
@@ -6,10 +6,21 @@ from app.services.analyzer import (
     compute_counts,
     safety_percent,
 )
+from app.services.single_flight import analyze_flight, request_key, IdempotencyConflict
+from app.services.segmenter import segment_clauses, is_preamble_sentence, is_non_article_sentence
+from app.services.analysis_store import analysis_store
+from app.services.revision import apply_revision
+from app.services import cascade, usage, metrics
+from app.services.projection import Projection
+from app.services.llm_scheduler import request_scope
+from app.logging_config import summarize_articles
 import re
 import os
+import logging
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/contract", tags=["contract"])
 
 def extract_document_title(articles):
@@ -19,7 +30,7 @@ def extract_document_title(articles):
     
     # 첫 번째 문장에서 제목 추출 시도
     first_sentence = articles[0].sentences[0].text
-    print(f"첫 번째 문장에서 제목 추출 시도: {first_sentence}")
+    logger.debug("첫 번째 문장에서 제목 추출 시도 (%d자)", len(first_sentence))
     
     # "근로계약서", "임대차계약서", "매매계약서" 등 패턴 찾기
     title_patterns = [
@@ -41,250 +52,129 @@ def extract_document_title(articles):
     # 패턴이 없으면 기본값
     return "계약서 분석 결과"
 
-def is_non_article_sentence(text):
-    """조항이 아닌 문장인지 판단하는 함수"""
-    # 먼저 조항인지 확인 (제N조 패턴이 있으면 조항으로 간주)
-    if re.search(r'제\s*(\d+)\s*조', text):
-        return False
-    
-    non_article_patterns = [
-        r'본 계약의 효력을 증명하기 위하여',
-        r'계약 당사자가 서명 또는 날인한다',
-        r'^\d{4}년 \d{1,2}월 \d{1,2}일',  # 문장 시작에 날짜만 있는 경우
-        r'사용자\(대표자\)',
-        r'근로자:',
-        r'임대인:',
-        r'임차인:',
-        r'매도인:',
-        r'매수인:',
-    ]
-    
-    for pattern in non_article_patterns:
-        if re.search(pattern, text):
-            return True
-    return False
-
-def is_preamble_sentence(text):
-    """서문 문장인지 판단하는 함수"""
-    preamble_patterns = [
-        r'본 계약은.*간의.*체결한다',
-        r'본 계약은.*간의.*다음과 같이',
-        r'본 계약서는.*간의.*체결한다',
-        r'본 계약서는.*간의.*다음과 같이',
-        r'^근로계약서$',
-        r'^임대차계약서$',
-        r'^매매계약서$',
-        r'^도급계약서$',
-        r'^용역계약서$',
-    ]
-    
-    for pattern in preamble_patterns:
-        if re.search(pattern, text):
-            return True
-    return False
-
 def group_articles_by_clause(articles):
-    """조항별로 그룹화하는 함수 - 문장 안에서 '제N조' 패턴 찾기"""
-    from app.schemas.contract.types import Article, Sentence
-    
-    grouped = {}
-    current_clause = None
-    current_sentences = []
-    non_article_sentences = []  # 조항이 아닌 문장들
-    preamble_sentences = []  # 서문 문장들
-    
-    for article in articles:
-        for sentence in article.sentences:
-            # 서문 문장인지 먼저 확인
-            if is_preamble_sentence(sentence.text):
-                preamble_sentences.append(sentence)
-                continue
-            
-            # 조항이 아닌 문장인지 확인
-            if is_non_article_sentence(sentence.text):
-                # 조항이 아닌 문장은 별도로 저장 (숫자 제거하지 않음)
-                non_article_sentences.append(sentence)
-                continue
-            
-            # 문장 안에서 "제n조" 패턴 찾기 (괄호 있음/없음 모두 처리)
-            clause_match = re.search(r'제\s*(\d+)\s*조(?:\s*\([^)]+\))?', sentence.text)
-            
-            if clause_match:
-                # 새로운 조항이 시작됨
-                if current_clause and current_sentences:
-                    # 이전 조항 저장 (제목은 이미 생성됨)
-                    grouped[current_clause] = {
-                        'title': grouped[current_clause]['title'],
-                        'sentences': current_sentences.copy()
-                    }
-                
-                # 새 조항 시작
-                clause_num = clause_match.group(1)
-                
-                # 제목 생성 (괄호 내용이 있으면 포함)
-                full_match = clause_match.group(0)  # 전체 매칭된 문자열
-                title = f'제{clause_num}조'
-                
-                # 괄호 내용이 있으면 제목에 포함
-                if '(' in full_match and ')' in full_match:
-                    # 괄호 내용 추출
-                    paren_match = re.search(r'\(([^)]+)\)', full_match)
-                    if paren_match:
-                        title = f'제{clause_num}조 ({paren_match.group(1)})'
-                
-                current_clause = clause_num
-                current_sentences = []
-                
-                # 제목을 저장 (나중에 사용하기 위해)
-                grouped[clause_num] = {
-                    'title': title,
-                    'sentences': []
-                }
-                
-                # 문장에서 "제n조" 부분을 제거하고 실제 내용만 추출
-                clean_text = re.sub(r'제\s*\d+\s*조(?:\s*\([^)]+\))?\s*', '', sentence.text).strip()
-                
-                # 문장 시작의 불필요한 숫자 제거 (예: "1 근로시간은..." → "근로시간은...")
-                clean_text = re.sub(r'^\s*\d+\s*', '', clean_text).strip()
-                
-                if clean_text:
-                    sentence_obj = Sentence(
-                        id=sentence.id,
-                        text=clean_text,
-                        risk=sentence.risk,
-                        why=sentence.why,
-                        fix=sentence.fix
-                    )
-                    current_sentences.append(sentence_obj)
-                    grouped[clause_num]['sentences'].append(sentence_obj)
-            else:
-                # 조항 내 문장들
-                if current_clause:
-                    # 현재 조항에 속하는 문장
-                    clean_text = sentence.text.strip()
-                    
-                    # 괄호 내용 뒤의 불필요한 숫자 제거 (예: "(근로시간 및 휴게시간) 1" → "(근로시간 및 휴게시간)")
-                    clean_text = re.sub(r'(\([^)]+\))\s*\d+\s*', r'\1', clean_text).strip()
-                    
-                    # 문장 시작의 불필요한 숫자 제거 (예: "1 근로시간은..." → "근로시간은...")
-                    clean_text = re.sub(r'^\s*\d+\s*', '', clean_text).strip()
-                    
-                    if clean_text:
-                        sentence_obj = Sentence(
-                            id=sentence.id,
-                            text=clean_text,
-                            risk=sentence.risk,
-                            why=sentence.why,
-                            fix=sentence.fix
-                        )
-                        current_sentences.append(sentence_obj)
-                        grouped[current_clause]['sentences'].append(sentence_obj)
-                else:
-                    # 조항 매칭에 실패한 문장들은 기타사항으로 분류
-                    non_article_sentences.append(sentence)
-    
-    # 마지막 조항 저장
-    if current_clause and current_sentences:
-        grouped[current_clause] = {
-            'title': grouped[current_clause]['title'],
-            'sentences': current_sentences.copy()
-        }
-    
-    # Article 객체로 변환
-    result = []
-    
-    # 서문이 있으면 맨 앞에 추가
-    if preamble_sentences:
-        result.append(Article(
-            id="preamble",
-            title="서문",
-            sentences=preamble_sentences
-        ))
-    
-    # 조항들을 순서대로 추가
-    for clause_num, data in grouped.items():
-        result.append(Article(
-            id=int(clause_num),
-            title=data['title'],
-            sentences=data['sentences']
-        ))
-    
-    # 조항이 아닌 문장들을 별도 Article로 추가
-    if non_article_sentences:
-        result.append(Article(
-            id="non_article",
-            title="기타 사항",
-            sentences=non_article_sentences
-        ))
-    
-    return result
+    """조항별로 그룹화하는 함수 - 문장 안에서 '제N조' 패턴 찾기 (app.services.segmenter 참고)"""
+    return segment_clauses(articles)
 
 @router.post("/analyze-debug")
 async def analyze_contract_debug(request: Request):
     """디버깅용 엔드포인트 - 원시 데이터 확인"""
     try:
         body = await request.json()
-        print(f"받은 원시 데이터: {body}")
-        print(f"데이터 타입: {type(body)}")
+        logger.debug("디버그 요청 수신", extra={"body_type": type(body).__name__})
         
         # 스키마 검증 시도
         try:
             payload = AnalyzeRequest(**body)
-            print(f"스키마 검증 성공: {payload}")
+            logger.info("스키마 검증 성공", extra=summarize_articles(payload.articles))
             return {"success": True, "message": "데이터 형식이 올바릅니다."}
         except Exception as e:
-            print(f"스키마 검증 실패: {str(e)}")
+            logger.info("스키마 검증 실패: %s", e)
             return {"success": False, "error": str(e), "received_data": body}
             
     except Exception as e:
-        print(f"JSON 파싱 실패: {str(e)}")
+        logger.info("JSON 파싱 실패: %s", e)
         return {"success": False, "error": f"JSON 파싱 실패: {str(e)}"}
 
 @router.post("/analyze", response_model=AnalyzeResponse, summary="계약서 문장 위험도 분석")
-async def analyze_contract(payload: AnalyzeRequest, file_name: Optional[str] = None) -> AnalyzeResponse:
+async def analyze_contract(
+    payload: AnalyzeRequest,
+    file_name: Optional[str] = None,
+    idempotency_key: Optional[str] = Header(None, description="같은 키의 재요청은 기존 분석 결과를 공유"),
+    fields: Optional[str] = Query(None, description="문장 필드 선택 (예: id,risk)"),
+    risk: Optional[str] = Query(None, description="위험도 필터 (예: danger,warning)"),
+    offset: int = Query(0, description="조항 페이지 시작 위치"),
+    limit: Optional[int] = Query(None, description="조항 페이지 크기 (0이면 조항 없이 요약만)"),
+):
     """
     프론트에서 보낸 계약서 조항/문장 배열을 분석하여
     각 문장의 risk/why/fix를 채워 반환합니다.
+
+    동일한 요청(같은 payload 또는 Idempotency-Key)이 동시에 들어오면
+    한 번만 분석하고 결과를 공유하며, 완료된 결과는 잠시 재사용합니다.
+
+    previous_task_id 또는 previous_articles를 보내면 이전 분석과 문장 단위로 비교해
+    수정/추가된 문장만 분석하고 나머지는 이전 결과를 재사용합니다.
+
+    fields/risk/offset/limit을 주면 counts 등 요약은 그대로 두고 조항 목록만 줄여서
+    반환합니다. (page: {offset, limit, total} 추가)
     """
     try:
-        print(f"받은 데이터: {payload}")
-        print(f"articles 개수: {len(payload.articles)}")
-        
-        # 1) 조항별로 그룹화
-        grouped_articles = group_articles_by_clause(payload.articles)
-        print(f"그룹화된 조항 개수: {len(grouped_articles)}")
-        
-        # 2) 문장 분석 (OpenAI 연동 또는 mock/fallback)
-        articles = await classify_articles(grouped_articles)
+        projection = Projection.parse(fields, risk, offset, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-        # 3) 카운트/안전지수 계산
-        counts = compute_counts(articles)
-        sp = safety_percent(counts)
+    try:
+        logger.info("분석 요청", extra=summarize_articles(payload.articles))
 
-        # AI가 문서 내용에서 제목 추출
-        document_title = extract_document_title(payload.articles)
-        print(f"AI가 추출한 문서 제목: {document_title}")
-        
-        # 파일명이 있으면 로그에 출력 (디버깅용)
-        if file_name:
-            print(f"원본 파일명: {file_name}")
-            clean_filename = os.path.splitext(file_name)[0]
-            print(f"파일명 기반 제목: {clean_filename}")
-        print(f"최종 사용할 제목: {document_title}")
-        
-        # 4) 응답 (AI 추출 제목 포함)
-        response = AnalyzeResponse(
-            articles=articles,
-            counts=counts,
-            safety_percent=sp,
-            title=document_title,  # AI가 추출한 제목 포함
-        )
-        
-        return response
+        if payload.previous_task_id and payload.previous_articles is None \
+                and payload.previous_task_id not in analysis_store:
+            raise HTTPException(status_code=404, detail="이전 분석 결과를 찾을 수 없습니다.")
+
+        key, fingerprint = request_key(payload.model_dump(mode="json"), idempotency_key)
+        result, source = await analyze_flight.run(key, lambda: _run_analysis(payload, file_name), fingerprint)
+        headers = {"Idempotent-Replayed": "true"} if source != "executed" else None
+        # 서버가 만든 모델이므로 response_model 재검증 없이 바로 직렬화
+        if projection is None:
+            return metrics.TimedJSONResponse(result, headers=headers)
+        body = result.model_dump(mode="json", exclude={"articles"})
+        body.update(projection.apply(result.articles))
+        return metrics.TimedJSONResponse(body, headers=headers)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except HTTPException:
         # FastAPI용 예외는 그대로 전달
         raise
     except Exception as e:
         # 예기치 못한 에러는 500으로 래핑 (로그는 서버 콘솔에서 확인)
-        print(f"에러 발생: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Analyze failed: {type(e).__name__}")
\ No newline at end of file
+        logger.exception("분석 실패")
+        raise HTTPException(status_code=500, detail=f"Analyze failed: {type(e).__name__}")
+
+
+async def _run_analysis(payload: AnalyzeRequest, file_name: Optional[str] = None) -> AnalyzeResponse:
+    """그룹화 → 문장 분석 → 카운트/제목 계산"""
+    # 1) 조항별로 그룹화
+    with metrics.stage("segmentation", "clauses"):
+        articles = group_articles_by_clause(payload.articles)
+    logger.debug("그룹화된 조항 개수: %d", len(articles))
+
+    # 수정본이면 변경 없는 문장은 이전 결과 재사용, 바뀐 문장만 분석 대상
+    targets, revision = articles, None
+    previous = payload.previous_articles
+    if previous is None and payload.previous_task_id:
+        stored = analysis_store.get(payload.previous_task_id)
+        previous = stored.articles if stored is not None else None
+    if previous is not None:
+        targets, revision = apply_revision(previous, articles)
+        logger.info("수정본 재분석: 재사용 %d개, 분석 대상 %d개",
+                    revision.unchanged, len(revision.modified) + len(revision.inserted))
+    
+    # 2) 문장 분석 (OpenAI 연동 또는 mock/fallback)
+    # 토큰 예산을 넘으면 남은 문장은 규칙 기반으로만 판단
+    tier_counts = cascade.new_tier_counts() if cascade.CASCADE_ENABLED else None
+    # 조항 수와 관계없이 요청당 동시 LLM 호출 수는 LLM_REQUEST_FAN_OUT까지
+    with usage.track("analyze", usage.ANALYZE_TOKEN_BUDGET) as tracker, request_scope():
+        await classify_articles(targets, tier_counts)
+
+    # 3) 카운트/안전지수 계산
+    counts = compute_counts(articles)
+    sp = safety_percent(counts)
+
+    # AI가 문서 내용에서 제목 추출
+    document_title = extract_document_title(payload.articles)
+    
+    # 파일명이 있으면 로그에 출력 (디버깅용)
+    if file_name:
+        logger.debug("파일명 기반 제목: %s", os.path.splitext(file_name)[0])
+    logger.debug("최종 사용할 제목: %s", document_title)
+    
+    # 4) 응답 (AI 추출 제목 포함)
+    return AnalyzeResponse(
+        articles=articles,
+        counts=counts,
+        safety_percent=sp,
+        title=document_title,  # AI가 추출한 제목 포함
+        revision=revision,
+        tier_counts=tier_counts,
+        usage=tracker.summary(),
+    )
@@ -0,0 +1,141 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import PlainTextResponse
+from app.services.chat_cache import chat_cache
+from app.services.rate_limiter import llm_limiter
+from app.services.llm_scheduler import llm_scheduler
+from app.services.admission import admission
+from app.services.single_flight import analyze_flight
+from app.services import cascade, analyzer
+from app.services.prompts import prompt_registry
+from app.services.usage import usage_ledger
+from app.services.analysis_store import analysis_store
+from app.services.file.text_extractor import text_extractor
+from app.services.file.file_cleaner import file_cleaner
+from app.services import metrics, tracing
+from app import logging_config
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+# 수집 시점에 읽는 게이지
+registry = metrics.registry
+# 업로드 디렉터리 (파일 수, 바이트): 스크레이프마다 스레드에서 한 번 계산
+_upload_dir_usage = [0, 0]
+registry.gauge("checky_llm_in_flight", "실행 중인 LLM 호출 수", lambda: llm_scheduler.in_flight)
+registry.gauge("checky_llm_queued", "LLM 스케줄러 대기 수",
+               lambda: {(name,): llm_scheduler.queue_depth(name) for name in llm_scheduler.weights}, ("priority",))
+registry.gauge("checky_extraction_pending", "텍스트 추출 대기 + 실행 중 작업 수", lambda: text_extractor.pending)
+registry.gauge("checky_extraction_queue_depth", "추출 워커를 기다리는 작업 수", lambda: text_extractor.queue_depth)
+registry.gauge("checky_cache_entries", "캐시/저장소 항목 수", lambda: {
+    ("chat_answer",): chat_cache.stats()["size"],
+    ("analyze_replay",): analyze_flight.snapshot()["replay_entries"],
+    ("analysis_store",): len(analysis_store),
+}, ("cache",))
+registry.gauge("checky_admission_in_flight", "엔드포인트별 처리 중 요청 수",
+               lambda: {(name,): gate.in_flight for name, gate in admission.gates.items()}, ("endpoint",))
+registry.gauge("checky_upload_dir_bytes", "업로드 디렉터리 사용량(바이트)", lambda: _upload_dir_usage[1])
+registry.gauge("checky_log_dropped", "로그 큐가 가득 차 버린 레코드 수",
+               lambda: logging_config.QueueDropHandler.dropped)
+registry.gauge("checky_upload_dir_files", "업로드 디렉터리 파일 수", lambda: _upload_dir_usage[0])
+
+
+@router.get("", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Prometheus 텍스트 형식 메트릭 (요청/단계별 지연 시간 히스토그램, 게이지)"""
+    # 디렉터리 순회는 이벤트 루프 밖에서
+    _upload_dir_usage[:] = await asyncio.to_thread(metrics.directory_size, file_cleaner.upload_dir)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/chat-cache")
+async def get_chat_cache_metrics():
+    """챗봇 응답 캐시 통계 (히트율, 크기)"""
+    return chat_cache.stats()
+
+
+@router.get("/chat-cache/top")
+async def get_chat_cache_top_entries(x_profile: Optional[str] = Header(None)):
+    """자주 묻는 질문 (정규화된 사용자 질문이므로 관리자 토큰 필요)"""
+    if not tracing.profiling_allowed(x_profile):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+    return {"top_entries": chat_cache.top_entries()}
+
+
+@router.get("/llm-limiter")
+async def get_llm_limiter_metrics():
+    """LLM 호출 한도/재시도/서킷 브레이커 상태"""
+    return llm_limiter.snapshot()
+
+
+@router.get("/llm-scheduler")
+async def get_llm_scheduler_metrics():
+    """LLM 스케줄러 우선순위 클래스별 대기열/처리량"""
+    return llm_scheduler.snapshot()
+
+
+@router.get("/admission")
+async def get_admission_metrics():
+    """엔드포인트별 진입 제어 상태 (동시 처리 수, 지연 시간, 거절 수)"""
+    return admission.snapshot()
+
+
+@router.get("/analyze-flight")
+async def get_analyze_flight_metrics():
+    """계약서 분석 요청 병합/재사용 통계"""
+    return analyze_flight.snapshot()
+
+
+@router.get("/cascade")
+async def get_cascade_metrics():
+    """모델 캐스케이드 단계별 누적 처리 문장 수"""
+    return {
+        "enabled": cascade.CASCADE_ENABLED,
+        "first_pass_model": cascade.FIRST_PASS_MODEL,
+        "escalation_model": cascade.ESCALATION_MODEL,
+        "confidence_threshold": cascade.CONFIDENCE_THRESHOLD,
+        "tiers": cascade.tier_totals,
+    }
+
+
+@router.get("/classification")
+async def get_classification_metrics():
+    """LLM 응답 파싱/부분 재요청 통계"""
+    return {
+        "response_format": analyzer.RESPONSE_FORMAT,
+        "structured_enabled": analyzer.structured_enabled(),
+        "reask_rounds": analyzer.REASK_ROUNDS,
+        **analyzer.parse_stats,
+    }
+
+
+@router.get("/prompts")
+async def get_prompt_metrics():
+    """프롬프트 버전별 고정 접두사 크기, 요청당 입력/캐시 토큰, 지연 시간"""
+    return prompt_registry.snapshot()
+
+
+@router.get("/usage")
+async def get_usage_metrics():
+    """엔드포인트/모델별 누적 LLM 토큰 사용량과 비용"""
+    return usage_ledger.snapshot()
+
+
+@router.get("/usage/{task_id}")
+async def get_task_usage(task_id: str):
+    """분석 작업 하나의 LLM 토큰 사용량"""
+    result = usage_ledger.task(task_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="사용량 기록을 찾을 수 없습니다.")
+    return result
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """저장된 요청 프로파일 (folded stack, flamegraph.pl/speedscope 호환). 관리자 토큰 필요"""
+    if not tracing.profiling_allowed(x_profile):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+    folded = tracing.load_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+    return PlainTextResponse(folded)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response, Query
 import os
 import uuid
+import asyncio
 import time
+import logging
 from typing import Optional
 import aiofiles
 import mimetypes
@@ -11,27 +13,31 @@ from app.schemas.upload.file_upload import (
     FileValidationError,
     FileType,
     UploadStatusResponse,
+    UploadAnalyzeResponse,
     AnalysisResult
 )
 from app.schemas.contract.types import AnalyzeRequest, AnalyzeResponse
-from app.services.file.text_extractor import text_extractor
+from app.services.file.text_extractor import text_extractor, ExtractionError, ExtractorUnavailable
 from app.services.file.file_cleaner import file_cleaner
+from app.services.text_segmenter import TextSegmenter
+from app.services.analyzer import classify_articles, compute_counts, safety_percent
+from app.services.analysis_store import analysis_store
+from app.services import cascade, usage, metrics
+from app.services.projection import Projection
+from app.services.llm_scheduler import request_scope
+from app.routers.contract.analyze import extract_document_title
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
-UPLOAD_DIR = "files"
+UPLOAD_DIR = "files"  # 디렉터리는 앱 시작(lifespan) 때 생성
 MAX_FILE_SIZE = 20 * 1024 * 1024  # 20MB (프론트엔드와 동일)
 ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt', '.hwp', '.jpg', '.jpeg', '.png'}
 
-# 업로드 디렉토리 생성
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 # 파일별 상태 저장 (실제로는 DB 사용)
 file_statuses = {}
 
-# 분석 결과 저장소 (실제로는 DB 사용 권장)
-analysis_results = {}
-
 
 def validate_file(file: UploadFile) -> tuple[bool, Optional[str]]:
     """파일 유효성 검사"""
@@ -51,8 +57,10 @@ def get_file_type(filename: str) -> FileType:
     ext = os.path.splitext(filename)[1].lower()
     if ext == '.pdf':
         return FileType.PDF
-    elif ext in ['.doc', '.docx']:
+    elif ext == '.docx':
         return FileType.DOCX
+    elif ext == '.doc':
+        return FileType.DOC
     elif ext == '.txt':
         return FileType.TXT
     elif ext == '.hwp':
@@ -69,9 +77,10 @@ async def save_uploaded_file(file: UploadFile) -> tuple[str, str]:
     file_ext = os.path.splitext(file.filename)[1].lower()
     file_path = os.path.join(UPLOAD_DIR, f"{task_id}{file_ext}")
     
-    async with aiofiles.open(file_path, "wb") as f:
-        while content := await file.read(1024):
-            await f.write(content)
+    with metrics.stage("upload_write"):
+        async with aiofiles.open(file_path, "wb") as f:
+            while content := await file.read(1024):
+                await f.write(content)
     
     return task_id, file_path
 
@@ -98,7 +107,7 @@ async def upload_file(
         try:
             extracted_text = await text_extractor.extract_text(file_path, file_type)
         except Exception as e:
-            print(f"텍스트 추출 실패: {str(e)}")
+            logger.warning("텍스트 추출 실패: %s", e)
             # 텍스트 추출 실패해도 업로드는 성공으로 처리
         
         return FileUploadResponse(
@@ -117,6 +126,81 @@ async def upload_file(
         raise HTTPException(status_code=500, detail=f"파일 업로드 중 오류가 발생했습니다: {str(e)}")
 
 
+@router.post("/analyze", response_model=UploadAnalyzeResponse)
+async def upload_and_analyze(
+    file: UploadFile = File(..., description="분석할 계약서 파일")
+):
+    """파일 업로드 → 텍스트 추출 → 조항/문장 분리 → 위험도 분석을 서버에서 한 번에 처리
+
+    추출된 텍스트가 들어오는 대로 조항을 나누고, 완성된 조항부터 바로 분석을 시작합니다.
+    """
+    try:
+        is_valid, error_message = validate_file(file)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_message)
+
+        task_id, file_path = await save_uploaded_file(file)
+        file_type = get_file_type(file.filename)
+        file_size = os.path.getsize(file_path)
+
+        segmenter = TextSegmenter()
+        tier_counts = cascade.new_tier_counts() if cascade.CASCADE_ENABLED else None
+        pending = []
+        try:
+            with usage.track("upload_analyze", usage.ANALYZE_TOKEN_BUDGET) as tracker, request_scope():
+                tracker.task_id = task_id
+                async for chunk in text_extractor.stream_text(file_path, file_type):
+                    with metrics.stage("segmentation", "text"):
+                        completed = segmenter.feed(chunk)
+                    for article in completed:
+                        pending.append(asyncio.create_task(classify_articles([article], tier_counts)))
+                for article in segmenter.finish():
+                    pending.append(asyncio.create_task(classify_articles([article], tier_counts)))
+                await asyncio.gather(*pending)
+        except BaseException:
+            # 추출 실패, 예산 초과, 요청 취소 시 이미 시작한 조항 분석도 멈춤 (받을 사람이 없는 LLM 호출 방지)
+            await _cancel_all(pending)
+            raise
+
+        articles = segmenter.articles
+        if not articles:
+            raise HTTPException(status_code=422, detail="파일에서 계약서 문장을 찾을 수 없습니다.")
+
+        counts = compute_counts(articles)
+        title = extract_document_title(articles)
+        # 서버가 만든 조항 모델이므로 다시 검증하지 않음
+        analysis_store.put(AnalysisResult.model_construct(id=task_id, title=title, articles=articles))
+
+        return metrics.TimedJSONResponse(UploadAnalyzeResponse(
+            task_id=task_id,
+            file_name=file.filename,
+            file_size=file_size,
+            file_type=file_type,
+            articles=articles,
+            counts=counts,
+            safety_percent=safety_percent(counts),
+            title=title,
+            tier_counts=tier_counts,
+            usage=tracker.summary(),
+        ))
+
+    except HTTPException:
+        raise
+    except ExtractorUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ExtractionError as e:
+        raise HTTPException(status_code=422, detail=f"파일에서 텍스트를 추출할 수 없습니다: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"파일 분석 중 오류가 발생했습니다: {str(e)}")
+
+
+async def _cancel_all(tasks: list):
+    """끝나지 않은 태스크를 취소하고 정리될 때까지 대기"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @router.get("/status/{task_id}", response_model=UploadStatusResponse)
 async def get_upload_status(task_id: str):
     """업로드 상태 확인 (Mock 상태 전환)"""
@@ -176,8 +260,22 @@ async def get_upload_status(task_id: str):
 
 
 @router.get("/analysis/{task_id}", response_model=AnalysisResult)
-async def get_analysis_result(task_id: str):
-    """분석 결과 조회 (Mock 데이터)"""
+async def get_analysis_result(
+    task_id: str,
+    fields: Optional[str] = Query(None, description="문장 필드 선택 (예: id,risk)"),
+    risk: Optional[str] = Query(None, description="위험도 필터 (예: danger,warning)"),
+    offset: int = Query(0, description="조항 페이지 시작 위치"),
+    limit: Optional[int] = Query(None, description="조항 페이지 크기"),
+):
+    """분석 결과 조회 (Mock 데이터)
+
+    fields/risk/offset/limit을 주면 조항 목록을 줄여서 반환합니다. (page: {offset, limit, total} 추가)
+    """
+    try:
+        projection = Projection.parse(fields, risk, offset, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
     try:
         # 파일 존재 여부 확인
         file_exists = False
@@ -197,16 +295,22 @@ async def get_analysis_result(task_id: str):
             await file_cleaner.clean_file_now(file_path)
             raise HTTPException(status_code=410, detail="파일이 만료되어 삭제되었습니다. (24시간 TTL)")
         
-        # 실제 분석 결과가 있으면 반환, 없으면 Mock 데이터 반환
-        if task_id in analysis_results:
-            return analysis_results[task_id]
+        # 실제 분석 결과가 있으면 저장소의 압축 형식에서 바로 JSON으로, 없으면 Mock 데이터 반환
+        if projection is None:
+            stored = analysis_store.get_json(task_id)
+            if stored is not None:
+                return Response(content=stored, media_type="application/json")
+        else:
+            stored = analysis_store.get(task_id)
+            if stored is not None:
+                return metrics.TimedJSONResponse({"id": stored.id, "title": stored.title, **projection.apply(stored.articles)})
         
         # AI가 추출한 제목 사용 (실제로는 analyze_contract에서 처리됨)
         # 여기서는 기본값만 사용
         title = "계약서 분석 결과"
         
         # Mock 분석 결과 데이터
-        return AnalysisResult(
+        mock = AnalysisResult(
             id=task_id,
             title=title,
             articles=[
@@ -279,7 +383,10 @@ async def get_analysis_result(task_id: str):
                 }
             ]
         )
-        
+        if projection is not None:
+            return metrics.TimedJSONResponse({"id": mock.id, "title": mock.title, **projection.apply(mock.articles)})
+        return mock
+
     except HTTPException:
         raise
     except Exception as e:
@@ -293,12 +400,8 @@ async def save_analysis_result(task_id: str, analysis_data: AnalyzeResponse, fil
         # 여기서는 기본값만 사용
         title = "계약서 분석 결과"
         
-        # 분석 결과를 저장
-        analysis_results[task_id] = AnalysisResult(
-            id=task_id,
-            title=title,
-            articles=analysis_data.articles
-        )
+        # 분석 결과를 저장 (요청 본문에서 이미 검증된 조항이므로 다시 검증하지 않음)
+        analysis_store.put(AnalysisResult.model_construct(id=task_id, title=title, articles=analysis_data.articles))
         
         return {"success": True, "message": "분석 결과가 저장되었습니다."}
     except Exception as e:
@@ -17,9 +17,21 @@ class Article(BaseModel):
 
 class AnalyzeRequest(BaseModel):
     articles: List[Article]
+    # 수정본 재분석: 이전 분석(task_id 또는 결과)과 비교해 바뀐 문장만 분석
+    previous_task_id: Optional[str] = None
+    previous_articles: Optional[List[Article]] = None
+
+class RevisionSummary(BaseModel):
+    unchanged: int                # 이전 결과를 재사용한 문장 수
+    modified: List[str] = []      # 수정된 문장 id
+    inserted: List[str] = []      # 추가된 문장 id
+    deleted: List[str] = []       # 삭제된 (이전 분석의) 문장 id
 
 class AnalyzeResponse(BaseModel):
     articles: List[Article]
     counts: dict                  # {"danger":..,"warning":..,"safe":..,"total":..}
     safety_percent: float         # 예: 87.5 (0.1% 단위 반올림)
-    title: str                    # AI가 추출한 문서 제목
\ No newline at end of file
+    title: str                    # AI가 추출한 문서 제목
+    revision: Optional[RevisionSummary] = None  # 수정본 재분석 시 변경 내역
+    tier_counts: Optional[dict] = None  # 모델 캐스케이드 단계별 처리 문장 수
+    usage: Optional[dict] = None        # 이 요청의 LLM 토큰 사용량/비용
\ No newline at end of file
@@ -1,11 +1,13 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Union
+from app.schemas.contract.types import AnalyzeResponse
 
 
 class FileType(str, Enum):
     PDF = "PDF"
     DOCX = "DOCX"
+    DOC = "DOC"
     TXT = "TXT"
     HWP = "HWP"
     IMAGE = "IMAGE"
@@ -43,7 +45,7 @@ class Sentence(BaseModel):
 
 
 class Article(BaseModel):
-    id: int
+    id: Union[int, str]  # 조항 번호 또는 "preamble" / "non_article"
     title: str
     sentences: List[Sentence]
 
@@ -54,6 +56,13 @@ class AnalysisResult(BaseModel):
     articles: List[Article]
 
 
+class UploadAnalyzeResponse(AnalyzeResponse):
+    task_id: str
+    file_name: str
+    file_size: int
+    file_type: FileType
+
+
 class UploadStatusResponse(BaseModel):
     task_id: str
     status: str
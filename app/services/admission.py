@@ -0,0 +1,131 @@
+import os
+import math
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .llm_scheduler import llm_scheduler, INTERACTIVE, BULK
+from .file.text_extractor import text_extractor
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_mapping(raw: str) -> Dict[str, float]:
+    mapping = {}
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            mapping[name.strip()] = float(value)
+    return mapping
+
+
+MAX_IN_FLIGHT = _parse_mapping(os.getenv("ADMISSION_MAX_IN_FLIGHT", "analyze=8,upload=4,upload_analyze=4,chat=32"))
+LATENCY_TARGET = _parse_mapping(os.getenv("ADMISSION_LATENCY_TARGET", "analyze=30,upload=15,upload_analyze=45,chat=10"))
+LLM_QUEUE_MAX = int(os.getenv("ADMISSION_LLM_QUEUE_MAX", "256"))
+EXTRACTION_QUEUE_MAX = int(os.getenv("ADMISSION_EXTRACTION_QUEUE_MAX", "8"))
+
+# (메서드, 경로) → 엔드포인트 이름
+ROUTES = {
+    ("POST", "/contract/analyze"): "analyze",
+    ("POST", "/upload/analyze"): "upload_analyze",
+    ("POST", "/upload/"): "upload",
+    ("POST", "/chat/"): "chat",
+}
+
+
+class OverloadedError(Exception):
+    """과부하로 요청을 받지 않는 경우"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class EndpointGate:
+    """엔드포인트별 동시 처리 한도 + 지연 시간 기반 한도 조정"""
+
+    def __init__(self, name: str, max_in_flight: int, latency_target: float,
+                 signals: List[Tuple[str, Callable[[], int], int]] = ()):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.latency_target = latency_target
+        self.signals = list(signals)  # (이름, 현재 대기열 길이, 최대 허용치)
+        self.in_flight = 0
+        self.latency_ewma = 0.0
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def limit(self) -> int:
+        """최근 지연 시간이 목표를 넘으면 동시 처리 한도를 비례해서 줄입니다."""
+        if self.latency_ewma <= self.latency_target or self.latency_ewma == 0:
+            return self.max_in_flight
+        return max(1, int(self.max_in_flight * self.latency_target / self.latency_ewma))
+
+    def _retry_after(self) -> int:
+        expected = self.latency_ewma or self.latency_target
+        return max(1, min(60, math.ceil(expected * (self.in_flight + 1) / max(1, self.limit))))
+
+    def enter(self):
+        for signal, depth, maximum in self.signals:
+            if depth() >= maximum:
+                self.rejected += 1
+                raise OverloadedError(f"{signal} 대기열이 가득 찼습니다.", self._retry_after())
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            raise OverloadedError("동시 처리 한도를 초과했습니다.", self._retry_after())
+        self.in_flight += 1
+        self.admitted += 1
+
+    def exit(self, elapsed: float):
+        self.in_flight -= 1
+        self.latency_ewma = elapsed if self.latency_ewma == 0 else 0.8 * self.latency_ewma + 0.2 * elapsed
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "limit": self.limit,
+            "max_in_flight": self.max_in_flight,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1),
+            "latency_target_ms": self.latency_target * 1000,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "signals": {signal: {"depth": depth(), "max": maximum} for signal, depth, maximum in self.signals},
+        }
+
+
+class AdmissionController:
+    """과부하 시 요청을 조기에 거절(503 + Retry-After)하는 진입 제어"""
+
+    def __init__(self):
+        llm_bulk = ("llm_bulk", lambda: llm_scheduler.queue_depth(BULK), LLM_QUEUE_MAX)
+        llm_interactive = ("llm_interactive", lambda: llm_scheduler.queue_depth(INTERACTIVE), LLM_QUEUE_MAX)
+        extraction = ("extraction", lambda: text_extractor.queue_depth, EXTRACTION_QUEUE_MAX)
+        self.gates = {
+            "analyze": self._gate("analyze", [llm_bulk]),
+            "upload": self._gate("upload", [extraction]),
+            # 업로드 후 바로 분석: 추출과 LLM 호출을 모두 하므로 두 대기열을 함께 봄
+            "upload_analyze": self._gate("upload_analyze", [extraction, llm_bulk]),
+            "chat": self._gate("chat", [llm_interactive]),
+        }
+
+    @staticmethod
+    def _gate(name: str, signals) -> EndpointGate:
+        return EndpointGate(
+            name,
+            max_in_flight=int(MAX_IN_FLIGHT.get(name, 16)),
+            latency_target=LATENCY_TARGET.get(name, 30),
+            signals=signals,
+        )
+
+    def gate_for(self, method: str, path: str) -> Optional[EndpointGate]:
+        name = ROUTES.get((method, path))
+        return self.gates.get(name) if name else None
+
+    def snapshot(self) -> dict:
+        return {name: gate.snapshot() for name, gate in self.gates.items()}
+
+
+# 전역 인스턴스
+admission = AdmissionController()
@@ -0,0 +1,179 @@
+import sys
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from app.schemas.upload.file_upload import AnalysisResult, Article, RiskLevel, Sentence
+from app.services import json_response
+
+RISK_CODES = ("danger", "warning", "safe")
+_RISK_INDEX = {risk: code for code, risk in enumerate(RISK_CODES)}
+
+
+class SentenceRow(NamedTuple):
+    id: str
+    text: str
+    risk: str
+    why: Optional[str]
+    fix: Optional[str]
+
+
+class ArticleRow(NamedTuple):
+    id: Union[int, str]
+    title: str
+    sentences: List[SentenceRow]
+
+
+class CompactAnalysis:
+    """저장용 열(column) 형식 분석 결과
+
+    문장마다 pydantic 모델을 두지 않고 문장 순서대로 나란히 놓인 배열로 보관합니다.
+    - 문장 id/본문: 하나의 문자열 버퍼 + 시작 위치 배열
+    - 위험도: 작은 정수 코드 (RISK_CODES 인덱스)
+    - why/fix: 문자열 테이블 인덱스 (0은 None, 같은 사유 문자열은 한 번만 보관)
+    읽기 전용 조회(프로젝션, 수정본 재분석)는 가벼운 행(row) 튜플로 하고,
+    pydantic 모델은 응답을 만들 때(to_result)만 다시 만듭니다.
+    """
+
+    __slots__ = ("id", "title", "article_ids", "article_titles", "article_starts",
+                 "ids", "id_offsets", "text", "text_offsets", "risks", "why", "fix", "strings")
+
+    @classmethod
+    def from_result(cls, result: AnalysisResult) -> "CompactAnalysis":
+        self = cls()
+        self.id = result.id
+        self.title = result.title
+        self.article_ids = [a.id for a in result.articles]
+        self.article_titles = [a.title for a in result.articles]
+        self.article_starts = array("I", [0])
+        self.risks = array("B")
+        self.why = array("I")
+        self.fix = array("I")
+        self.strings: List[Optional[str]] = [None]
+        index: Dict[str, int] = {}
+
+        def intern(value: Optional[str]) -> int:
+            if value is None:
+                return 0
+            code = index.get(value)
+            if code is None:
+                # sys.intern: 다른 분석 결과와도 같은 문자열 객체를 공유
+                code = index[value] = len(self.strings)
+                self.strings.append(sys.intern(value))
+            return code
+
+        ids: List[str] = []
+        texts: List[str] = []
+        for article in result.articles:
+            for s in article.sentences:
+                ids.append(s.id)
+                texts.append(s.text)
+                self.risks.append(_RISK_INDEX[s.risk])
+                self.why.append(intern(s.why))
+                self.fix.append(intern(s.fix))
+            self.article_starts.append(len(ids))
+        self.ids, self.id_offsets = _pack(ids)
+        self.text, self.text_offsets = _pack(texts)
+        return self
+
+    def __len__(self) -> int:
+        """문장 수"""
+        return len(self.risks)
+
+    def _sentence(self, i: int) -> SentenceRow:
+        return SentenceRow(
+            self.ids[self.id_offsets[i]:self.id_offsets[i + 1]],
+            self.text[self.text_offsets[i]:self.text_offsets[i + 1]],
+            RISK_CODES[self.risks[i]],
+            self.strings[self.why[i]],
+            self.strings[self.fix[i]],
+        )
+
+    @property
+    def articles(self) -> List[ArticleRow]:
+        """읽기 전용 조항/문장 행 (Article/Sentence와 같은 속성 이름)"""
+        starts = self.article_starts
+        return [
+            ArticleRow(article_id, title, [self._sentence(i) for i in range(starts[n], starts[n + 1])])
+            for n, (article_id, title) in enumerate(zip(self.article_ids, self.article_titles))
+        ]
+
+    def to_result(self) -> AnalysisResult:
+        """pydantic 모델로 복원"""
+        return AnalysisResult.model_construct(
+            id=self.id,
+            title=self.title,
+            articles=[
+                Article.model_construct(
+                    id=row.id, title=row.title,
+                    sentences=[
+                        Sentence.model_construct(id=s.id, text=s.text, risk=RiskLevel(s.risk), why=s.why, fix=s.fix)
+                        for s in row.sentences
+                    ],
+                )
+                for row in self.articles
+            ],
+        )
+
+    def to_json(self) -> bytes:
+        """모델을 거치지 않고 바로 JSON (AnalysisResult 직렬화와 같은 바이트)"""
+        ids, id_offsets, text, text_offsets = self.ids, self.id_offsets, self.text, self.text_offsets
+        risks, why, fix, strings, starts = self.risks, self.why, self.fix, self.strings, self.article_starts
+        articles = []
+        for n, (article_id, title) in enumerate(zip(self.article_ids, self.article_titles)):
+            articles.append({
+                "id": article_id,
+                "title": title,
+                "sentences": [
+                    {
+                        "id": ids[id_offsets[i]:id_offsets[i + 1]],
+                        "text": text[text_offsets[i]:text_offsets[i + 1]],
+                        "risk": RISK_CODES[risks[i]],
+                        "why": strings[why[i]],
+                        "fix": strings[fix[i]],
+                    }
+                    for i in range(starts[n], starts[n + 1])
+                ],
+            })
+        return json_response.dumps({"id": self.id, "title": self.title, "articles": articles})
+
+
+def _pack(values: List[str]):
+    """문자열 목록 → (이어 붙인 버퍼, 시작 위치 배열)"""
+    offsets = array("I", [0])
+    total = 0
+    for value in values:
+        total += len(value)
+        offsets.append(total)
+    return "".join(values), offsets
+
+
+class AnalysisStore:
+    """분석 결과 저장소 (실제로는 DB 사용 권장)"""
+
+    def __init__(self):
+        self._results: Dict[str, CompactAnalysis] = {}
+
+    def put(self, result: AnalysisResult):
+        self._results[result.id] = CompactAnalysis.from_result(result)
+
+    def get(self, task_id: str) -> Optional[CompactAnalysis]:
+        """저장된 결과 (id/title/articles 조회용, 모델이 필요하면 to_result())"""
+        return self._results.get(task_id)
+
+    def get_json(self, task_id: str) -> Optional[bytes]:
+        """저장된 결과 JSON (모델을 만들지 않고 바로 직렬화)"""
+        compact = self._results.get(task_id)
+        return compact.to_json() if compact is not None else None
+
+    def delete(self, task_id: str):
+        self._results.pop(task_id, None)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+# 전역 인스턴스
+analysis_store = AnalysisStore()
@@ -1,107 +1,217 @@
-import os, json
-from typing import List
+import os, time, asyncio
+from typing import List, Optional
+import httpx
+import logging
 from app.schemas.contract.types import Article
 from .openai_client import chat_completion
-
-PROMPT = """당신은 계약서 분석 전문가입니다. 모든 답변은 한국어로만 하며,
-요청된 JSON 형식과 길이를 반드시 지킵니다. 설명 문구나 마크다운을 출력하지 않습니다.
-
-다음 '문장들' 배열(길이 {n})의 각 항목을 아래 기준으로 분류하세요.
-반드시 길이가 {n}인 JSON "배열"만 반환합니다. 다른 텍스트/설명/마크다운 금지.
-
-[분류 키]
-- risk: "danger" | "warning" | "safe"
-- why:  한 줄(최대 120자), 한국 법/관행/판례 흐름에 맞춘 간결 근거
-- fix:  한 줄(최대 120자), 실무적으로 적용 가능한 개선 문구, "~이다" 체로 끝나도록 해주세요. 계약서에 바로 쓸 수있는 문구로 해주세요.
-
-[판단 기준]
-- "danger" (즉시 위험)
-  • 해고: 즉시 해고/예고 없이 해고/서면통지 없음/정당사유 불명
-  • 임금·수당: 연장·야간·휴일근로 수당 미지급/포괄임금으로 수당 전면 배제
-  • 손해배상: 사업상 위험·모든 손해의 전적 부담 등 포괄 전가
-  • 업무조건: 일방적 근로조건 변경/근로시간 중 대기·지시로 휴게 침해
-- "warning" (주의·조정 필요)
-  • 경업금지: 과도한 범위/지역/기간(일반적으로 1년 초과, 직무 불특정, 전 업종 등)
-  • 비밀유지: 비밀 범위 불명확/과도한 포괄성
-  • 기타: 불명확 표현으로 근로자 권리 침해 우려
-- "safe"
-  • 법정 기준 충족 또는 통상적·명확한 조항
-
-[타이브레이커]
-- 애매하면 근로자 보호 관점에서 더 보수적으로("warning" → "danger" 우선).
-
-[출력 형식(배열, 길이 {n}) — 예시]
-[
-  {"risk":"danger","why":"해고예고·서면통지 의무 위반 소지","fix":"해고는 정당사유·서면통지·예고수당 원칙을 준수한다"},
-  {"risk":"warning","why":"경업금지 기간·범위 과도","fix":"기간은 1년 내로, 직무·지역을 한정하고 비밀보호 범위를 특정한다"},
-  {"risk":"safe","why":"법정 기준에 부합","fix":""}
-]
-
-문장들:
-{texts_json}
-"""
+from .parse import parse_llm_array
+from .prompts import prompt_registry
+from .rules import apply_rules
+from . import cascade, usage, metrics
+
+logger = logging.getLogger(__name__)
+
+# 구조화 출력 방식: json_schema | json_object | none (지원하지 않는 제공자는 none)
+RESPONSE_FORMAT = os.getenv("OPENAI_RESPONSE_FORMAT", "json_schema")
+# 누락/형식 오류 문장만 다시 묻는 횟수
+REASK_ROUNDS = int(os.getenv("LLM_REASK_ROUNDS", "1"))
+# 제공자가 구조화 출력을 거부한 뒤 일반 응답으로 지내는 시간(초), 지나면 다시 시도
+STRUCTURED_RETRY_SECONDS = float(os.getenv("LLM_STRUCTURED_RETRY_SECONDS", "3600"))
+
+CLASSIFY_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "sentence_risks",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer"},
+                            "risk": {"type": "string", "enum": ["danger", "warning", "safe"]},
+                            "why": {"type": "string"},
+                            "fix": {"type": "string"},
+                        },
+                        "required": ["index", "risk", "why", "fix"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["items"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# 응답 파싱 통계
+parse_stats = {"requests": 0, "invalid_items": 0, "reasks": 0, "unresolved_items": 0, "format_fallbacks": 0}
+_structured = {"enabled": RESPONSE_FORMAT in ("json_schema", "json_object"), "disabled_until": 0.0}
+
+def structured_enabled() -> bool:
+    return _structured["enabled"] and time.monotonic() >= _structured["disabled_until"]
+
+def _unsupported_format(e: httpx.HTTPStatusError) -> bool:
+    """400 응답 중 response_format 자체를 지원하지 않는다는 오류만 (문맥 길이 초과 등 다른 400은 제외)"""
+    if e.response.status_code != 400:
+        return False
+    try:
+        body = e.response.text.lower()
+    except Exception:
+        return False
+    return "response_format" in body or "json_schema" in body
+
+def _response_format():
+    if not structured_enabled():
+        return None
+    if RESPONSE_FORMAT == "json_object":
+        return {"type": "json_object"}
+    return CLASSIFY_SCHEMA
+
+# 모델/규칙 판단이 아니라 장애·예산 초과로 대신 채운 결과의 사유 (배치 재사용 등에서 구분)
+UNAVAILABLE_WHY = "AI 분석에 실패하여 규칙 기반으로만 판단했습니다. 직접 검토가 필요합니다."
+OVER_BUDGET_WHY = "분석 토큰 예산을 초과하여 규칙 기반으로만 판단했습니다. 직접 검토가 필요합니다."
+DEGRADED_REASONS = frozenset({UNAVAILABLE_WHY, OVER_BUDGET_WHY})
 
 def _fallback(n: int):
     return [{"risk": "safe", "why": "-", "fix": "-"} for _ in range(n)]
 
-async def classify_articles(articles: List[Article]) -> List[Article]:
+def _rules_only(texts: List[str], why: str):
+    with metrics.stage("rules"):
+        return [{"risk": apply_rules(t, "warning"), "why": why, "fix": ""} for t in texts]
+
+def _unavailable(texts: List[str]):
+    """AI 분석 실패 시 전부 safe로 처리하지 않고 규칙 기반으로 보수적으로 판단"""
+    return _rules_only(texts, UNAVAILABLE_WHY)
+
+def _over_budget(texts: List[str]):
+    """요청 토큰 예산을 다 쓴 뒤 남은 문장은 규칙 기반으로만 판단"""
+    tracker = usage.current()
+    if tracker is not None:
+        tracker.degraded_sentences += len(texts)
+    return _rules_only(texts, OVER_BUDGET_WHY)
+
+async def _request_items(title: str, texts: List[str], model: Optional[str] = None):
+    """한 번 요청해서 항목별로 검증된 결과를 받습니다. (형식이 잘못된 항목은 None)"""
+    response_format = _response_format()
+    # 고정된 system 접두사 + 조항 제목/번호 붙인 문장만 user 메시지로
+    template = prompt_registry.get("classify_json" if response_format else "classify")
+    messages = template.messages(texts, title)
+    parse_stats["requests"] += 1
+    started = time.monotonic()
+    try:
+        res = await chat_completion(messages, model=model, response_format=response_format)
+    except httpx.HTTPStatusError as e:
+        # response_format을 지원하지 않는 제공자 → 한동안 일반 텍스트 응답을 파싱
+        if response_format is None or not _unsupported_format(e):
+            raise
+        logger.warning("구조화 출력 미지원, %.0f초 동안 일반 응답으로 전환: %s", STRUCTURED_RETRY_SECONDS, e)
+        _structured["disabled_until"] = time.monotonic() + STRUCTURED_RETRY_SECONDS
+        parse_stats["format_fallbacks"] += 1
+        return await _request_items(title, texts, model)
+    prompt_registry.record(template, messages, res, time.monotonic() - started)
+    return parse_llm_array(res["choices"][0]["message"]["content"], len(texts))
+
+async def _llm_classify(title: str, texts: List[str], model: Optional[str] = None) -> List[dict]:
+    """조항 문장들의 risk/why/fix를 LLM으로 분석합니다.
+
+    누락되었거나 형식이 잘못된 문장만 다시 묻고, 끝내 받지 못한 문장은
+    safe로 채우지 않고 규칙 기반 판단(_unavailable)으로 표시합니다.
+    """
+    results: List[Optional[dict]] = [None] * len(texts)
+    pending = list(range(len(texts)))
+
+    for attempt in range(REASK_ROUNDS + 1):
+        if attempt:
+            parse_stats["reasks"] += 1
+            logger.info("AI 응답 누락/형식 오류 %d개 문장 재요청", len(pending))
+        try:
+            items = await _request_items(title, [texts[i] for i in pending], model)
+        except usage.BudgetExceeded:
+            for i, fallback in zip(pending, _over_budget([texts[i] for i in pending])):
+                results[i] = fallback
+            return results
+        except Exception as e:
+            # 전송 오류는 LLM 리미터가 이미 재시도했으므로 다시 묻지 않음
+            logger.warning("AI 분석 실패: %s", e)
+            break
+        for i, item in zip(pending, items):
+            if item is not None:
+                results[i] = item.model_dump()
+        pending = [i for i in pending if results[i] is None]
+        if not pending:
+            break
+        parse_stats["invalid_items"] += len(pending)
+
+    if pending:
+        parse_stats["unresolved_items"] += len(pending)
+        for i, fallback in zip(pending, _unavailable([texts[i] for i in pending])):
+            results[i] = fallback
+    return results
+
+async def _classify_article(art: Article, api_key: str):
+    # 각 조항의 문장들을 AI에게 분석 요청
+    texts = [s.text for s in art.sentences]
+    
+    if not api_key:
+        parsed = _fallback(len(texts))
+    else:
+        parsed = await _llm_classify(art.title, texts)
+
+    # 결과를 문장에 업데이트
+    for s, p in zip(art.sentences, parsed):
+        s.risk = p.get("risk", s.risk)
+        s.why  = p.get("why", s.why)
+        s.fix  = p.get("fix", s.fix)
+
+async def _cascade_article(art: Article, tier_counts: dict):
+    """규칙/저렴한 모델로 1차 분류 후, 위험하거나 애매한 문장만 상위 모델로 분석"""
+    sentences = art.sentences
+    with metrics.stage("rules"):
+        rule_risks = [apply_rules(s.text, "safe") if cascade.CASCADE_USE_RULES else "safe" for s in sentences]
+
+    # 규칙에 걸린 문장은 1차 분류 없이 바로 상위 모델로
+    escalate = [i for i, r in enumerate(rule_risks) if r != "safe"]
+    cascade.record(tier_counts, "rules", len(escalate))
+
+    rest = [i for i, r in enumerate(rule_risks) if r == "safe"]
+    if rest:
+        cascade.record(tier_counts, "first_pass", len(rest))
+        results = await cascade.first_pass([sentences[i].text for i in rest])
+        for i, (risk, confidence) in zip(rest, results):
+            if risk == "safe" and confidence >= cascade.CONFIDENCE_THRESHOLD:
+                sentences[i].risk, sentences[i].why, sentences[i].fix = "safe", cascade.SAFE_WHY, ""
+                cascade.record(tier_counts, "resolved_first_pass", 1)
+            else:
+                escalate.append(i)
+
+    if not escalate:
+        return
+    escalate.sort()
+    cascade.record(tier_counts, "escalated", len(escalate))
+    parsed = await _llm_classify(art.title, [sentences[i].text for i in escalate], model=cascade.ESCALATION_MODEL)
+    for i, p in zip(escalate, parsed):
+        s = sentences[i]
+        # 규칙이 잡은 위험도보다 낮게 내려가지 않도록 (위험 조항 재현율 유지)
+        s.risk = cascade.stronger(rule_risks[i], p.get("risk", s.risk))
+        s.why  = p.get("why", s.why)
+        s.fix  = p.get("fix", s.fix)
+
+async def classify_articles(articles: List[Article], tier_counts: Optional[dict] = None) -> List[Article]:
+    """문장별 risk/why/fix를 채웁니다. tier_counts를 넘기면 단계별 처리 문장 수를 누적"""
     api_key = os.getenv("OPENAI_API_KEY") or os.getenv("AI_API_KEY")
+    targets = [art for art in articles if art.sentences]
 
-    for art in articles:
-        if not art.sentences:
-            continue
-
-        # 각 조항의 문장들을 AI에게 분석 요청
-        texts = [s.text for s in art.sentences]
-        
-        if not api_key:
-            parsed = _fallback(len(texts))
+    # 조항별 요청을 동시에 보내고, 실제 동시 실행 수는 LLM 스케줄러가 제한
+    with metrics.stage("classify"):
+        if api_key and cascade.CASCADE_ENABLED:
+            counts = tier_counts if tier_counts is not None else cascade.new_tier_counts()
+            await asyncio.gather(*(_cascade_article(art, counts) for art in targets))
         else:
-            # 조항별 분석을 위한 프롬프트 생성
-            article_prompt = f"""다음은 계약서의 '{art.title}' 조항에 속한 문장들입니다.
-각 문장의 위험도를 분석해주세요.
-
-문장들:
-{json.dumps(texts, ensure_ascii=False)}
-
-위험도는 다음 중 하나로 분류해주세요:
-- danger: 위험한 조항 (법적 문제 가능성 높음)
-- warning: 주의가 필요한 조항 (개선 권장)
-- safe: 안전한 조항 (문제없음)
-
-각 문장에 대해 다음을 제공해주세요:
-1. 위험도 (danger/warning/safe)
-2. 위험한 이유 (why)
-3. 개선 방안 (fix)
-
-반드시 길이가 {len(texts)}인 JSON 배열만 반환하세요:
-[
-  {{"risk":"danger","why":"해고예고·서면통지 의무 위반 소지","fix":"해고는 정당사유·서면통지·예고수당 원칙을 준수한다"}},
-  {{"risk":"warning","why":"경업금지 기간·범위 과도","fix":"기간은 1년 내로, 직무·지역을 한정하고 비밀보호 범위를 특정한다"}},
-  {{"risk":"safe","why":"법정 기준에 부합","fix":""}}
-]"""
-            
-            try:
-                res = await chat_completion([
-                    {"role": "system", "content": "당신은 계약서 분석 전문가입니다. 한국어로 간결하게 답하세요. 반드시 JSON 배열만 반환하세요."},
-                    {"role": "user", "content": article_prompt},
-                ])
-                content = res["choices"][0]["message"]["content"]
-                parsed = json.loads(content)
-                if not isinstance(parsed, list):
-                    parsed = _fallback(len(texts))
-                if len(parsed) != len(texts):
-                    parsed = (parsed + _fallback(len(texts)))[:len(texts)]
-            except Exception as e:
-                print(f"AI 분석 실패: {str(e)}")
-                parsed = _fallback(len(texts))
-
-        # 결과를 문장에 업데이트
-        for s, p in zip(art.sentences, parsed):
-            s.risk = p.get("risk", s.risk)
-            s.why  = p.get("why", s.why)
-            s.fix  = p.get("fix", s.fix)
-
+            await asyncio.gather(*(_classify_article(art, api_key) for art in targets))
     return articles
 
 def compute_counts(articles):
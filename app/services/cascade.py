@@ -0,0 +1,65 @@
+import os
+import time
+import logging
+from typing import List, Tuple
+
+from .openai_client import chat_completion
+from .parse import extract_json_array, index_items
+from .prompts import prompt_registry
+
+logger = logging.getLogger(__name__)
+
+# 1차: 규칙 엔진 + 저렴한 모델이 위험도/확신도만 판단
+# 2차: danger/warning 이거나 확신도가 낮은 문장만 상위 모델이 why/fix 까지 생성
+CASCADE_ENABLED = os.getenv("CASCADE_ENABLED", "false").lower() == "true"
+CASCADE_USE_RULES = os.getenv("CASCADE_USE_RULES", "true").lower() == "true"
+FIRST_PASS_MODEL = os.getenv("CASCADE_FIRST_PASS_MODEL", "gpt-4o-mini")
+ESCALATION_MODEL = os.getenv("CASCADE_ESCALATION_MODEL") or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+CONFIDENCE_THRESHOLD = float(os.getenv("CASCADE_CONFIDENCE_THRESHOLD", "0.8"))
+
+SAFE_WHY = "법정 기준에 부합"
+
+RISK_ORDER = {"safe": 0, "warning": 1, "danger": 2}
+
+# 요청 전체 누적 통계
+tier_totals = {"rules": 0, "first_pass": 0, "resolved_first_pass": 0, "escalated": 0}
+
+
+def new_tier_counts() -> dict:
+    return {key: 0 for key in tier_totals}
+
+
+def record(tier_counts: dict, key: str, n: int):
+    tier_counts[key] += n
+    tier_totals[key] += n
+
+
+def stronger(a: str, b: str) -> str:
+    """두 위험도 중 더 위험한 쪽"""
+    return a if RISK_ORDER.get(a, 0) >= RISK_ORDER.get(b, 0) else b
+
+
+async def first_pass(texts: List[str]) -> List[Tuple[str, float]]:
+    """저렴한 모델로 (위험도, 확신도)를 판단합니다. 실패하면 모두 확신도 0"""
+    template = prompt_registry.get("first_pass")
+    messages = template.messages(texts)
+    started = time.monotonic()
+    try:
+        res = await chat_completion(messages, temperature=0, model=FIRST_PASS_MODEL)
+        prompt_registry.record(template, messages, res, time.monotonic() - started)
+        parsed = index_items(extract_json_array(res["choices"][0]["message"]["content"]), len(texts))
+    except Exception as e:
+        logger.warning("1차 분류 실패: %s", e)
+        parsed = [None] * len(texts)
+
+    results = []
+    for entry in parsed:
+        # index가 없거나 중복된 문장은 확신도 0 → 상위 모델로
+        item = entry or {}
+        risk = item.get("risk") if item.get("risk") in RISK_ORDER else "warning"
+        try:
+            confidence = float(item.get("confidence", 0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        results.append((risk, confidence))
+    return results
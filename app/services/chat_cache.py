@@ -0,0 +1,158 @@
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "512"))
+CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "21600"))  # 6시간
+SIMILARITY_THRESHOLD = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.8"))
+NGRAM = 2
+
+_STRIP_PATTERN = re.compile(r"[\s\W_]+", re.UNICODE)
+# 유사 질문이라도 숫자/부정 표현이 다르면 답이 달라짐 ("3개월 이상" vs "6개월 이상", "있나요" vs "없나요")
+_GUARD_PATTERN = re.compile(r"\d+|없|않|못|아니|불가|금지")
+
+
+def normalize_question(text: str) -> str:
+    """공백/문장부호/대소문자 차이를 없앤 캐시 키를 만듭니다."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _STRIP_PATTERN.sub("", text)
+
+
+def _guard(key: str) -> tuple:
+    """유사도 매칭 시 정확히 같아야 하는 토큰 (숫자, 부정 표현)"""
+    return tuple(_GUARD_PATTERN.findall(key))
+
+
+def _ngrams(key: str) -> frozenset:
+    if len(key) <= NGRAM:
+        return frozenset([key])
+    return frozenset(key[i:i + NGRAM] for i in range(len(key) - NGRAM + 1))
+
+
+class _Entry:
+    __slots__ = ("answer", "grams", "guard", "expires_at", "hits")
+
+    def __init__(self, answer: str, key: str, expires_at: float):
+        self.answer = answer
+        self.grams = _ngrams(key)
+        self.guard = _guard(key)
+        self.expires_at = expires_at
+        self.hits = 0
+
+
+class ChatAnswerCache:
+    """반복되는 챗봇 질문에 대한 응답 캐시 (TTL + LRU, n-gram 유사도 매칭)"""
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL,
+                 threshold: float = SIMILARITY_THRESHOLD):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def is_cacheable(self, history_len: int) -> bool:
+        """대화 기록이 없는 첫 질문만 캐시를 조회/저장합니다.
+
+        "그럼 그 조항은?" 같은 후속 질문은 앞선 대화에 따라 답이 달라지므로
+        맥락 없이 만든 캐시 응답을 돌려주지 않습니다.
+        """
+        return self.max_size > 0 and history_len == 0
+
+    def get(self, question: str) -> Optional[str]:
+        """정규화된 질문으로 캐시된 응답을 찾습니다. 없으면 None"""
+        key = normalize_question(question)
+        if not key:
+            return None
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[key]
+            entry = None
+
+        if entry is not None:
+            self.exact_hits += 1
+        else:
+            key, entry = self._find_similar(key, now)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.similar_hits += 1
+
+        entry.hits += 1
+        self._entries.move_to_end(key)
+        return entry.answer
+
+    def put(self, question: str, answer: str):
+        """응답을 캐시에 저장합니다. 용량 초과 시 가장 오래 사용되지 않은 항목부터 제거"""
+        key = normalize_question(question)
+        if not key or self.max_size <= 0:
+            return
+
+        self._entries[key] = _Entry(answer, key, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _find_similar(self, key: str, now: float):
+        """숫자/부정 표현이 같은 항목 중 n-gram Jaccard 유사도가 가장 높은 항목을 찾습니다."""
+        grams = _ngrams(key)
+        guard = _guard(key)
+        size = len(grams)
+        best_key, best_entry, best_score = None, None, self.threshold
+        expired = []
+
+        for cand_key, entry in self._entries.items():
+            if entry.expires_at <= now:
+                expired.append(cand_key)
+                continue
+            if entry.guard != guard:
+                continue
+            other = len(entry.grams)
+            # 크기 차이만으로 임계값을 넘을 수 없으면 건너뜀
+            if min(size, other) < best_score * max(size, other):
+                continue
+            inter = len(grams & entry.grams)
+            score = inter / (size + other - inter)
+            if score >= best_score:
+                best_key, best_entry, best_score = cand_key, entry, score
+
+        for cand_key in expired:
+            del self._entries[cand_key]
+
+        return best_key, best_entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        hits = self.exact_hits + self.similar_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def top_entries(self, limit: int = 10) -> list:
+        """히트 수가 많은 캐시 항목 목록"""
+        ranked = sorted(self._entries.items(), key=lambda kv: kv[1].hits, reverse=True)
+        return [{"key": key, "hits": entry.hits} for key, entry in ranked[:limit]]
+
+
+# 전역 인스턴스
+chat_cache = ChatAnswerCache()
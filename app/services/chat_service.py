@@ -3,6 +3,9 @@ from typing import List
 from datetime import datetime
 from app.schemas.chat.types import ChatMessage
 from .openai_client import chat_completion
+from .llm_scheduler import INTERACTIVE
+from .chat_cache import chat_cache
+from . import metrics
 
 
 class ChatService:
@@ -35,6 +38,16 @@ class ChatService:
         Returns:
             AI가 생성한 응답 메시지
         """
+        history_len = len(conversation_history) if conversation_history else 0
+        use_cache = chat_cache.is_cacheable(history_len)
+
+        # 반복 질문은 캐시된 응답을 바로 반환 (LLM 호출 없음)
+        if use_cache:
+            with metrics.stage("cache_lookup", "chat"):
+                cached = chat_cache.get(user_message)
+            if cached is not None:
+                return cached
+
         try:
             # 대화 기록을 OpenAI API 형식으로 변환
             messages = [{"role": "system", "content": self.system_prompt}]
@@ -51,11 +64,15 @@ class ChatService:
             messages.append({"role": "user", "content": user_message})
             
             # OpenAI API 호출
-            response = await chat_completion(messages, temperature=0.7)
+            response = await chat_completion(messages, temperature=0.7, priority=INTERACTIVE)
             
             # 응답 추출
             ai_response = response["choices"][0]["message"]["content"]
             
+            # 대화 맥락에 의존하지 않는 응답만 캐시에 저장
+            if use_cache:
+                chat_cache.put(user_message, ai_response)
+            
             return ai_response
             
         except Exception as e:
@@ -0,0 +1,130 @@
+import os
+import gzip
+import asyncio
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from . import metrics
+
+# Accept-Encoding 협상으로 큰 JSON/텍스트 응답을 압축 (brotli는 설치된 경우만)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+# 이 크기 이상은 이벤트 루프를 막지 않도록 스레드에서 압축
+COMPRESSION_OFFLOAD_SIZE = int(os.getenv("COMPRESSION_OFFLOAD_SIZE", "65536"))
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_COMPRESSIBLE = ("application/json", "text/", "application/javascript")
+
+compressed_bytes = metrics.registry.counter(
+    "checky_compression_bytes_total", "압축 전/후 응답 바이트", ("encoding", "kind")
+)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding에서 사용할 인코딩 선택 (br > gzip, q=0은 제외)"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """응답 압축 ASGI 미들웨어
+
+    HEAD 요청, 스트리밍(SSE) 응답, 이미 인코딩된 응답은 그대로 통과시키고,
+    압축 대상 형식은 본문을 모았다가 COMPRESSION_MIN_SIZE 이상일 때만 압축합니다.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        # HEAD 응답은 본문 없이 원래 Content-Length를 보내므로 건드리지 않음
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(send, encoding, self.minimum_size).send)
+
+
+class _Responder:
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start = None
+        self.buffering = False
+        self.chunks: List[bytes] = []
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            length = headers.get("content-length")
+            self.buffering = (
+                content_type.startswith(_COMPRESSIBLE)
+                and not content_type.startswith("text/event-stream")
+                and "content-encoding" not in headers
+                and not (length is not None and int(length) < self.minimum_size)
+            )
+            if content_type.startswith(_COMPRESSIBLE):
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            if self.buffering:
+                self.start = message
+                return
+            await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or not self.buffering:
+            await self._send(message)
+            return
+
+        self.chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        body = b"".join(self.chunks)
+        headers = MutableHeaders(raw=self.start["headers"])
+        if len(body) >= self.minimum_size:
+            with metrics.stage("compression", self.encoding):
+                if len(body) >= COMPRESSION_OFFLOAD_SIZE:
+                    compressed = await asyncio.to_thread(compress, body, self.encoding)
+                else:
+                    compressed = compress(body, self.encoding)
+            compressed_bytes.inc(self.encoding, "in", value=len(body))
+            compressed_bytes.inc(self.encoding, "out", value=len(compressed))
+            if len(compressed) < len(body):
+                body = compressed
+                headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(body))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": body})
@@ -0,0 +1,85 @@
+import struct
+from typing import List
+
+# Word 97-2003(.doc) 본문 텍스트: WordDocument 스트림의 FIB → 테이블 스트림의 조각 테이블(piece table)
+# 각 조각은 UTF-16LE 또는 8비트(cp1252) 압축 텍스트이며, 본문(ccpText) 범위만 읽습니다.
+
+_FIB_FLAGS = 0x000A
+_FIB_CCP_TEXT = 0x004C
+_FIB_FC_CLX = 0x01A2
+_WHICH_TABLE_STREAM = 0x0200
+_ENCRYPTED = 0x0100
+
+# 문단/셀/줄 구분 문자 → 줄바꿈, 필드 코드(0x13 명령 0x14 결과 0x15)는 결과만 남김
+_PARAGRAPH_MARKS = {"\r": "\n", "\x07": "\n", "\x0b": "\n", "\x0c": "\n"}
+_FIELD_BEGIN, _FIELD_SEPARATOR, _FIELD_END = "\x13", "\x14", "\x15"
+
+
+class DocFormatError(ValueError):
+    pass
+
+
+def _pieces(clx: bytes):
+    """Clx → (cp 시작, cp 끝, 파일 오프셋, 압축 여부)"""
+    pos = 0
+    while pos < len(clx) and clx[pos] == 0x01:  # Prc (서식 변경 정보)는 건너뜀
+        pos += 3 + struct.unpack_from("<H", clx, pos + 1)[0]
+    if pos >= len(clx) or clx[pos] != 0x02:
+        raise DocFormatError("조각 테이블을 찾을 수 없습니다.")
+    size = struct.unpack_from("<I", clx, pos + 1)[0]
+    plc = clx[pos + 5:pos + 5 + size]
+    count = (size - 4) // 12
+    cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+    for i in range(count):
+        fc = struct.unpack_from("<I", plc, 4 * (count + 1) + 8 * i + 2)[0]
+        compressed = bool(fc & 0x40000000)
+        offset = (fc & 0x3FFFFFFF) // 2 if compressed else fc
+        yield cps[i], cps[i + 1], offset, compressed
+
+
+def _clean(text: str) -> str:
+    out: List[str] = []
+    depth = 0
+    instruction = []  # 필드마다 명령 부분인지 여부
+    for ch in text:
+        if ch == _FIELD_BEGIN:
+            depth += 1
+            instruction.append(True)
+        elif ch == _FIELD_SEPARATOR and depth:
+            instruction[-1] = False
+        elif ch == _FIELD_END and depth:
+            depth -= 1
+            instruction.pop()
+        elif depth and instruction[-1]:
+            continue
+        elif ch in _PARAGRAPH_MARKS:
+            out.append(_PARAGRAPH_MARKS[ch])
+        elif ch >= " " or ch == "\t":
+            out.append(ch)
+    return "".join(out)
+
+
+def extract_text(file_path: str, olefile) -> str:
+    """olefile 모듈은 호출하는 쪽에서 (선택 의존성 지연 import)"""
+    with olefile.OleFileIO(file_path) as ole:
+        if not ole.exists("WordDocument"):
+            raise DocFormatError("Word 문서가 아닙니다.")
+        word = ole.openstream("WordDocument").read()
+        flags = struct.unpack_from("<H", word, _FIB_FLAGS)[0]
+        if flags & _ENCRYPTED:
+            raise DocFormatError("암호화된 문서입니다.")
+        table_name = "1Table" if flags & _WHICH_TABLE_STREAM else "0Table"
+        table = ole.openstream(table_name).read()
+
+    ccp_text = struct.unpack_from("<I", word, _FIB_CCP_TEXT)[0]
+    fc_clx, lcb_clx = struct.unpack_from("<II", word, _FIB_FC_CLX)
+    parts: List[str] = []
+    for cp_start, cp_end, offset, compressed in _pieces(table[fc_clx:fc_clx + lcb_clx]):
+        if cp_start >= ccp_text:
+            break
+        n = min(cp_end, ccp_text) - cp_start
+        if compressed:
+            parts.append(word[offset:offset + n].decode("cp1252", errors="replace"))
+        else:
+            parts.append(word[offset:offset + 2 * n].decode("utf-16-le", errors="replace"))
+    return _clean("".join(parts))
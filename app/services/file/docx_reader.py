@@ -0,0 +1,279 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# DOCX 스트리밍 추출: word/document.xml 을 zip 스트림에서 iterparse로 읽어 문단 단위로 내보냄
+# (전체 XML을 메모리에 올리지 않고, word/media 등 이미지 파트는 열지 않음)
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY, _P, _PPR, _TBL = W + "body", W + "p", W + "pPr", W + "tbl"
+
+DOCUMENT_PART = "word/document.xml"
+NUMBERING_PART = "word/numbering.xml"
+STYLES_PART = "word/styles.xml"
+
+# 문단 안에서 텍스트를 읽지 않는 요소 (그림, 도형, 삽입 개체, 변경 추적으로 삭제된 내용)
+_SKIP = {W + "drawing", W + "pict", W + "object", W + "del"}
+# "Heading 1", "heading1", "제목 1" 스타일
+_HEADING_STYLE_PATTERN = re.compile(r'^(?:heading|제목)\s*(\d)$', re.IGNORECASE)
+_CLAUSE_LABEL_PATTERN = re.compile(r'^제\s*\d+\s*조$')
+
+_CIRCLED = "①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳"
+_GANADA = "가나다라마바사아자차카타파하"
+_CHOSUNG = "ㄱㄴㄷㄹㅁㅂㅅㅇㅈㅊㅋㅌㅍㅎ"
+
+
+class Paragraph(NamedTuple):
+    text: str
+    label: str = ""                 # 자동 번호 (예: "제3조", "①", "1.")
+    level: Optional[int] = None     # 제목 수준 (0 = 제목 1), 본문이면 None
+
+    @property
+    def line(self) -> str:
+        """조항 분할기(TextSegmenter)가 헤딩/항 번호를 알아볼 수 있는 한 줄"""
+        if not self.label:
+            return self.text
+        if self.level is not None and _CLAUSE_LABEL_PATTERN.match(self.label) \
+                and self.text and not self.text.startswith("("):
+            # 번호 매기기 스타일의 "제1조" + "목적" → "제1조 (목적)"
+            return f"{self.label} ({self.text})"
+        return f"{self.label} {self.text}".strip()
+
+
+def _roman(n: int) -> str:
+    out = ""
+    for value, numeral in ((1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+                           (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")):
+        while n >= value:
+            out += numeral
+            n -= value
+    return out
+
+
+def _format_number(n: int, fmt: str) -> str:
+    if fmt == "decimalEnclosedCircle" and 1 <= n <= len(_CIRCLED):
+        return _CIRCLED[n - 1]
+    if fmt in ("ganada", "koreanLegal") and 1 <= n <= len(_GANADA):
+        return _GANADA[n - 1]
+    if fmt == "chosung" and 1 <= n <= len(_CHOSUNG):
+        return _CHOSUNG[n - 1]
+    if fmt in ("lowerLetter", "upperLetter") and n >= 1:
+        letter = chr(ord("a") + (n - 1) % 26) * ((n - 1) // 26 + 1)
+        return letter.upper() if fmt == "upperLetter" else letter
+    if fmt in ("lowerRoman", "upperRoman") and n >= 1:
+        return _roman(n).lower() if fmt == "lowerRoman" else _roman(n)
+    if fmt in ("bullet", "none"):
+        return ""
+    return str(n)
+
+
+def _val(element: Optional[ET.Element], tag: str) -> Optional[str]:
+    child = element.find(W + tag) if element is not None else None
+    return child.get(W + "val") if child is not None else None
+
+
+def _num_pr(ppr: Optional[ET.Element]) -> Tuple[Optional[str], Optional[int]]:
+    num_pr = ppr.find(W + "numPr") if ppr is not None else None
+    if num_pr is None:
+        return None, None
+    ilvl = _val(num_pr, "ilvl")
+    return _val(num_pr, "numId"), int(ilvl) if ilvl is not None else None
+
+
+class _Numbering:
+    """numbering.xml 의 번호 형식과 문단 순서대로 증가하는 카운터"""
+
+    def __init__(self, root: Optional[ET.Element]):
+        # abstractNumId -> {ilvl: (start, numFmt, lvlText)}
+        abstract: Dict[str, Dict[int, Tuple[int, str, str]]] = {}
+        self.levels: Dict[str, Dict[int, Tuple[int, str, str]]] = {}
+        self.counters: Dict[str, List[int]] = {}
+        if root is None:
+            return
+        for node in root.iter(W + "abstractNum"):
+            abstract[node.get(W + "abstractNumId")] = self._parse_levels(node)
+        for num in root.iter(W + "num"):
+            levels = dict(abstract.get(_val(num, "abstractNumId"), {}))
+            for override in num.iter(W + "lvlOverride"):
+                ilvl = int(override.get(W + "ilvl", "0"))
+                lvl = override.find(W + "lvl")
+                if lvl is not None:
+                    levels.update(self._parse_levels(override))
+                start = _val(override, "startOverride")
+                if start is not None and ilvl in levels:
+                    levels[ilvl] = (int(start),) + levels[ilvl][1:]
+            self.levels[num.get(W + "numId")] = levels
+
+    @staticmethod
+    def _parse_levels(node: ET.Element) -> Dict[int, Tuple[int, str, str]]:
+        return {
+            int(lvl.get(W + "ilvl", "0")): (
+                int(_val(lvl, "start") or 1),
+                _val(lvl, "numFmt") or "decimal",
+                _val(lvl, "lvlText") or "",
+            )
+            for lvl in node.findall(W + "lvl")
+        }
+
+    def label(self, num_id: Optional[str], ilvl: Optional[int]) -> str:
+        levels = self.levels.get(num_id) if num_id not in (None, "0") else None
+        if not levels:
+            return ""
+        ilvl = ilvl or 0
+        if ilvl not in levels:
+            return ""
+        counters = self.counters.setdefault(num_id, [0] * 9)
+        counters[ilvl] += 1
+        for lower in range(ilvl + 1, len(counters)):
+            counters[lower] = 0
+        text = levels[ilvl][2]
+        for i in range(ilvl + 1):
+            if f"%{i + 1}" in text:
+                start, fmt, _ = levels.get(i, (1, "decimal", ""))
+                n = start + max(counters[i], 1) - 1
+                text = text.replace(f"%{i + 1}", _format_number(n, fmt))
+        return text.strip()
+
+
+class _Styles:
+    """문단 스타일의 제목 수준과 번호 매기기 (basedOn 상속 포함)"""
+
+    def __init__(self, root: Optional[ET.Element]):
+        self._raw: Dict[str, Tuple[Optional[str], Optional[int], Tuple[Optional[str], Optional[int]]]] = {}
+        self._resolved: Dict[str, Tuple[Optional[int], Tuple[Optional[str], Optional[int]]]] = {}
+        if root is None:
+            return
+        for style in root.iter(W + "style"):
+            if style.get(W + "type") != "paragraph":
+                continue
+            ppr = style.find(W + "pPr")
+            level = None
+            outline = _val(ppr, "outlineLvl")
+            if outline is not None:
+                level = int(outline)
+            else:
+                match = _HEADING_STYLE_PATTERN.match(_val(style, "name") or "")
+                if match:
+                    level = int(match.group(1)) - 1
+            self._raw[style.get(W + "styleId")] = (_val(style, "basedOn"), level, _num_pr(ppr))
+
+    def resolve(self, style_id: Optional[str], depth: int = 0) -> Tuple[Optional[int], Tuple[Optional[str], Optional[int]]]:
+        if style_id is None or style_id not in self._raw or depth > 10:
+            return None, (None, None)
+        if style_id not in self._resolved:
+            based_on, level, (num_id, ilvl) = self._raw[style_id]
+            parent_level, (parent_num, parent_ilvl) = self.resolve(based_on, depth + 1)
+            self._resolved[style_id] = (
+                level if level is not None else parent_level,
+                (num_id or parent_num, ilvl if ilvl is not None else parent_ilvl),
+            )
+        return self._resolved[style_id]
+
+
+def _check_size(z: zipfile.ZipFile, name: str, max_bytes: Optional[int]):
+    """압축 해제 크기 상한 (zip 항목은 선언된 크기까지만 풀리므로 선언 크기로 판단)"""
+    if max_bytes is not None and z.getinfo(name).file_size > max_bytes:
+        raise ValueError(f"{name} 압축 해제 크기가 제한({max_bytes // (1 << 20)}MB)을 넘었습니다.")
+
+
+def _load_part(z: zipfile.ZipFile, name: str, max_bytes: Optional[int]) -> Optional[ET.Element]:
+    try:
+        _check_size(z, name, max_bytes)
+        with z.open(name) as f:
+            return ET.parse(f).getroot()
+    except KeyError:
+        return None
+
+
+def _paragraph_text(p: ET.Element) -> str:
+    parts: List[str] = []
+
+    def walk(node: ET.Element):
+        for child in node:
+            tag = child.tag
+            if tag in _SKIP:
+                continue
+            if tag == W + "t":
+                parts.append(child.text or "")
+            elif tag == W + "tab":
+                parts.append("\t")
+            elif tag in (W + "br", W + "cr"):
+                parts.append("\n")
+            elif tag != W + "pPr":
+                walk(child)
+
+    walk(p)
+    return "".join(parts)
+
+
+def iter_paragraphs(file_path: str, max_bytes: Optional[int] = None) -> Iterator[Paragraph]:
+    """DOCX 본문 문단을 문서 순서대로 (표 안의 문단 포함), max_bytes는 파트별 압축 해제 상한"""
+    with zipfile.ZipFile(file_path) as z:
+        # 번호/스타일 정의는 작은 파트라 한 번에 읽음
+        numbering = _Numbering(_load_part(z, NUMBERING_PART, max_bytes))
+        styles = _Styles(_load_part(z, STYLES_PART, max_bytes))
+
+        _check_size(z, DOCUMENT_PART, max_bytes)
+        with z.open(DOCUMENT_PART) as f:
+            body = None
+            paragraph_depth = table_depth = 0
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    if tag == _P:
+                        paragraph_depth += 1
+                    elif tag == _TBL:
+                        table_depth += 1
+                    elif tag == _BODY:
+                        body = elem
+                    continue
+                if tag == _TBL:
+                    table_depth -= 1
+                    if not table_depth and body is not None:
+                        body.clear()  # 끝난 표는 바로 버려 메모리를 유지
+                    continue
+                if tag != _P:
+                    continue
+                paragraph_depth -= 1
+                # 글상자(도형) 안의 문단은 건너뜀 (바깥 문단과 함께 버려짐)
+                if paragraph_depth:
+                    continue
+
+                ppr = elem.find(_PPR)
+                level, (style_num, style_ilvl) = styles.resolve(_val(ppr, "pStyle"))
+                outline = _val(ppr, "outlineLvl")
+                if outline is not None:
+                    level = int(outline)
+                num_id, ilvl = _num_pr(ppr)
+                if num_id is None:
+                    num_id, ilvl = style_num, style_ilvl
+                elif ilvl is None:
+                    ilvl = style_ilvl
+                label = numbering.label(num_id, ilvl)
+                text = _paragraph_text(elem).strip()
+                if text or label:
+                    yield Paragraph(text, label, level if level is not None and level < 9 else None)
+
+                elem.clear()
+                if not table_depth and body is not None:
+                    body.clear()
+
+
+def iter_text(file_path: str, chunk_chars: int = 16384, max_bytes: Optional[int] = None) -> Iterator[str]:
+    """문단을 모아 chunk_chars 안팎의 텍스트 조각으로 (문단 사이는 빈 줄)"""
+    buffer: List[str] = []
+    size = 0
+    for paragraph in iter_paragraphs(file_path, max_bytes):
+        line = paragraph.line
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_chars:
+            yield "\n\n".join(buffer) + "\n\n"
+            buffer = []
+            size = 0
+    if buffer:
+        yield "\n\n".join(buffer) + "\n\n"
+
+
+def extract_text(file_path: str, max_bytes: Optional[int] = None) -> str:
+    return "".join(iter_text(file_path, max_bytes=max_bytes)).strip()
@@ -0,0 +1,117 @@
+import re
+import struct
+import zlib
+from typing import Iterator
+
+# HWP 5.0 본문 텍스트: BodyText/SectionN 스트림(보통 raw deflate 압축)의 PARA_TEXT 레코드
+# 압축 해제는 조금씩 하며 전체 해제 크기를 max_bytes로 제한합니다. (압축 폭탄 방지)
+
+_FILE_HEADER_SIGNATURE = b"HWP Document File"
+_COMPRESSED = 0x1
+_ENCRYPTED = 0x2
+_DISTRIBUTION = 0x4
+
+_TAG_PARA_TEXT = 67  # HWPTAG_BEGIN(16) + 51
+_CHUNK = 65536
+
+# 제어 문자: 문자 제어(0, 10, 13, 24~31)는 1 WCHAR, 인라인/확장 제어는 같은 코드로 시작하고 끝나는 8 WCHAR
+_INLINE_CONTROL_PATTERN = re.compile(r'([\x01-\x09\x0b\x0c\x0e-\x17])[\s\S]{6}\1')
+_CHAR_CONTROL_PATTERN = re.compile(r'[\x00-\x08\x0a-\x1f]')
+
+
+class HwpFormatError(ValueError):
+    pass
+
+
+class DecompressionLimitError(ValueError):
+    pass
+
+
+class _Budget:
+    """문서 전체(모든 구역)에 걸친 압축 해제 한도"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used = 0
+
+    def consume(self, n: int):
+        self.used += n
+        if self.used > self.max_bytes:
+            raise DecompressionLimitError(f"본문 압축 해제 크기가 제한({self.max_bytes // (1 << 20)}MB)을 넘었습니다.")
+
+
+def _inflate(stream, compressed: bool, budget: _Budget) -> Iterator[bytes]:
+    """스트림을 조금씩 읽어 (압축 해제한) 바이트 조각으로"""
+    inflater = zlib.decompressobj(-15) if compressed else None
+    while True:
+        data = stream.read(_CHUNK)
+        if not data:
+            break
+        while data:
+            if inflater is None:
+                out, data = data, b""
+            else:
+                # 출력 크기를 제한해 한 번에 거대한 버퍼가 만들어지지 않게 함
+                out = inflater.decompress(data, _CHUNK)
+                data = inflater.unconsumed_tail
+            budget.consume(len(out))
+            if out:
+                yield out
+        if inflater is not None and inflater.eof:
+            break
+
+
+def _paragraph_text(data: bytes) -> str:
+    text = data.decode("utf-16-le", errors="replace")
+    text = _INLINE_CONTROL_PATTERN.sub(lambda m: "\t" if m.group(1) == "\t" else "", text)
+    return _CHAR_CONTROL_PATTERN.sub(lambda m: "\n" if m.group(0) in "\r\n" else "", text)
+
+
+def _records(chunks: Iterator[bytes]) -> Iterator[tuple]:
+    """(태그, 데이터) - 레코드 경계가 조각 경계와 어긋나도 이어 붙여 처리"""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while len(buffer) - pos >= 4:
+            header = struct.unpack_from("<I", buffer, pos)[0]
+            tag, size = header & 0x3FF, header >> 20
+            start = pos + 4
+            if size == 0xFFF:
+                if len(buffer) - pos < 8:
+                    break
+                size = struct.unpack_from("<I", buffer, start)[0]
+                start += 4
+            if len(buffer) < start + size:
+                break
+            yield tag, bytes(buffer[start:start + size])
+            pos = start + size
+        if pos:
+            del buffer[:pos]
+
+
+def iter_paragraphs(file_path: str, olefile, max_bytes: int) -> Iterator[str]:
+    """olefile 모듈은 호출하는 쪽에서 (선택 의존성 지연 import)"""
+    with olefile.OleFileIO(file_path) as ole:
+        header = ole.openstream("FileHeader").read(256)
+        if not header.startswith(_FILE_HEADER_SIGNATURE):
+            raise HwpFormatError("HWP 5.0 문서가 아닙니다.")
+        flags = struct.unpack_from("<I", header, 36)[0]
+        if flags & (_ENCRYPTED | _DISTRIBUTION):
+            raise HwpFormatError("암호화되었거나 배포용으로 저장된 문서입니다.")
+
+        sections = sorted(
+            (entry for entry in ole.listdir() if len(entry) == 2 and entry[0] == "BodyText"
+             and entry[1].startswith("Section") and entry[1][7:].isdigit()),
+            key=lambda entry: int(entry[1][7:]),
+        )
+        budget = _Budget(max_bytes)
+        for entry in sections:
+            stream = ole.openstream(entry)
+            for tag, data in _records(_inflate(stream, bool(flags & _COMPRESSED), budget)):
+                if tag == _TAG_PARA_TEXT:
+                    yield _paragraph_text(data).rstrip("\n")
+
+
+def extract_text(file_path: str, olefile, max_bytes: int) -> str:
+    return "\n".join(p for p in iter_paragraphs(file_path, olefile, max_bytes) if p.strip())
@@ -0,0 +1,196 @@
+import os
+import sys
+import signal
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+from weakref import WeakSet
+
+from app.services import metrics
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# 텍스트 추출을 별도 작업자 프로세스에서 실행 (큰/악성 파일이 API 프로세스 메모리를 키우거나 OOM으로 죽이지 않도록)
+EXTRACTION_SANDBOX = os.getenv("EXTRACTION_SANDBOX", "true").lower() == "true"
+# 작업자 프로세스 주소 공간 상한(MB, 0이면 제한 없음)과 작업 하나의 CPU 시간 상한(초)
+# RLIMIT_AS는 RSS가 아니라 예약한 가상 주소 공간 전체라서 easyocr/torch를 import하면 수 GB가 잡혀
+# 이미지 OCR이 실패하므로 기본은 끄고 RSS 워치독으로 메모리를 관리 (OCR을 쓰지 않을 때만 켜는 것을 권장)
+EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", "0"))
+EXTRACTION_CPU_SECONDS = int(os.getenv("EXTRACTION_CPU_SECONDS", "30"))
+# C 확장 안에서 시그널을 받지 못하고 계속 도는 작업 대비 벽시계 상한(초): 넘으면 작업자를 강제 종료
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "60"))
+# 작업자 하나가 처리할 작업 수 (넘으면 새 프로세스로 교체)
+EXTRACTION_MAX_TASKS_PER_CHILD = int(os.getenv("EXTRACTION_MAX_TASKS_PER_CHILD", "50"))
+# 워치독: 작업자 RSS가 이 값(MB)을 넘으면 풀을 새로 만듦
+EXTRACTION_WORKER_RSS_MB = int(os.getenv("EXTRACTION_WORKER_RSS_MB", "300"))
+EXTRACTION_WATCHDOG_INTERVAL = float(os.getenv("EXTRACTION_WATCHDOG_INTERVAL", "5"))
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+recycles = metrics.registry.counter(
+    "checky_extraction_worker_recycles_total", "추출 작업자 풀 재생성 횟수", ("reason",)
+)
+retries = metrics.registry.counter(
+    "checky_extraction_retries_total", "다른 작업의 시간 초과로 풀이 종료되어 다시 실행한 추출 작업 수"
+)
+
+
+class ExtractionLimitError(Exception):
+    """작업자의 CPU/메모리 제한을 넘은 추출 작업"""
+
+
+def _cpu_exceeded(signum, frame):
+    raise ExtractionLimitError(f"추출 CPU 시간 제한({EXTRACTION_CPU_SECONDS}초)을 넘었습니다.")
+
+
+def init_worker():
+    """작업자 프로세스 초기화: 주소 공간 제한, CPU 제한 시그널을 예외로"""
+    if resource is None:
+        return
+    if EXTRACTION_MEMORY_LIMIT_MB > 0:
+        limit = EXTRACTION_MEMORY_LIMIT_MB << 20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    signal.signal(signal.SIGXCPU, _cpu_exceeded)
+
+
+def run_limited(fn: Callable, *args):
+    """작업 하나에 CPU 시간 상한을 걸고 실행 (RLIMIT_CPU는 누적값이라 지금까지 쓴 시간에 더해 소프트 한도만 설정)
+
+    소프트 한도를 넘으면 SIGXCPU → ExtractionLimitError 이고, 주소 공간 한도를 넘는 할당은 MemoryError가 됩니다.
+    (하드 한도는 한 번 낮추면 되돌릴 수 없어 건드리지 않음)
+    """
+    if resource is None or EXTRACTION_CPU_SECONDS <= 0:
+        return fn(*args)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + EXTRACTION_CPU_SECONDS
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        return fn(*args)
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """/proc 에서 읽은 상주 메모리(MB), 읽을 수 없으면 None"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1 << 20)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _mp_context():
+    # 스레드가 있는 API 프로세스를 fork하지 않도록 forkserver(없으면 spawn)
+    if sys.platform.startswith("linux"):
+        context = multiprocessing.get_context("forkserver")
+        # 작업자는 이 모듈들이 import된 forkserver에서 fork됨 (설치되지 않은 모듈은 무시)
+        context.set_forkserver_preload(["app.services.file.text_extractor", "pypdf", "olefile", "chardet"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def create_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_mp_context(),
+        initializer=init_worker,
+        max_tasks_per_child=EXTRACTION_MAX_TASKS_PER_CHILD or None,
+    )
+
+
+class ExtractionPool:
+    """제한이 걸린 작업자 프로세스 풀 + RSS 워치독
+
+    작업자가 죽으면(OOM kill 등) 해당 작업만 실패시키고 풀을 새로 만들며,
+    워치독은 RSS가 EXTRACTION_WORKER_RSS_MB를 넘은 작업자가 있으면 풀을 교체합니다.
+    (진행 중인 작업은 기존 풀에서 끝까지 실행된 뒤 작업자가 종료됨)
+    시간 제한을 넘은 작업 때문에 풀을 강제 종료하면 같은 풀의 다른 작업은 새 풀에서 한 번 더 실행합니다.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None  # 첫 작업 때 생성
+        self._killed: "WeakSet[ProcessPoolExecutor]" = WeakSet()
+        self.is_running = False
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = create_pool(self.workers)
+        return self._pool
+
+    def worker_rss(self) -> Dict[int, float]:
+        """작업자 pid별 RSS(MB)"""
+        if self._pool is None:
+            return {}
+        # ProcessPoolExecutor는 작업자 목록을 공개하지 않음
+        processes = dict(getattr(self._pool, "_processes", None) or {})
+        return {pid: rss for pid in processes if (rss := rss_mb(pid)) is not None}
+
+    def recycle(self, reason: str, kill: bool = False):
+        old, self._pool = self._pool, None
+        if old is not None:
+            if kill:
+                # 멈춘 작업자는 shutdown으로 끝나지 않으므로 직접 종료
+                # (작업자 하나만 죽여도 ProcessPoolExecutor는 풀 전체를 깨뜨리므로 나머지 작업은 run()에서 다시 실행)
+                self._killed.add(old)
+                for process in list((getattr(old, "_processes", None) or {}).values()):
+                    process.terminate()
+            old.shutdown(wait=False)
+        recycles.inc(reason)
+        logger.warning("추출 작업자 풀 재생성 (%s)", reason)
+
+    async def run(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self.pool
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(pool, run_limited, fn, *args), EXTRACTION_TIMEOUT or None
+                )
+            except asyncio.TimeoutError:
+                if self._pool is pool:
+                    self.recycle("timeout", kill=True)
+                raise ExtractionLimitError(f"추출 시간 제한({EXTRACTION_TIMEOUT:g}초)을 넘었습니다.")
+            except BrokenProcessPool:
+                if pool in self._killed and not attempt:
+                    # 다른 작업의 시간 초과로 종료된 풀: 이 작업의 문제가 아니므로 새 풀에서 다시 실행
+                    retries.inc()
+                    continue
+                if self._pool is pool:
+                    self.recycle("broken")
+                raise ExtractionLimitError("추출 작업자가 비정상 종료되었습니다. (메모리/CPU 제한 초과)")
+
+    async def start_watchdog(self):
+        """RSS 워치독 시작 (lifespan에서 태스크로 실행)"""
+        if self.is_running or resource is None:
+            return
+        self.is_running = True
+        while self.is_running:
+            await asyncio.sleep(EXTRACTION_WATCHDOG_INTERVAL)
+            try:
+                over = {pid: rss for pid, rss in self.worker_rss().items() if rss > EXTRACTION_WORKER_RSS_MB}
+                if over:
+                    logger.warning("추출 작업자 RSS 초과: %s", {pid: round(rss) for pid, rss in over.items()})
+                    self.recycle("rss")
+            except Exception as e:
+                logger.error("추출 워치독 오류: %s", e)
+
+    async def stop_watchdog(self):
+        self.is_running = False
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
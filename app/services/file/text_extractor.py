@@ -1,112 +1,303 @@
 import os
 import asyncio
-from typing import Optional
+import logging
+import threading
+import importlib
+import importlib.util
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import AsyncIterator, Dict, Optional
 from app.schemas.upload.file_upload import FileType
+from app.services import metrics
+from . import docx_reader, doc_reader, hwp_reader, sandbox
 import mimetypes
 
-# PDF 처리
-try:
-    import pypdf
-except ImportError:
-    pypdf = None
-
-# DOCX 처리
-try:
-    import docx2txt
-except ImportError:
-    docx2txt = None
-
-# 이미지 OCR 처리
-try:
-    from PIL import Image
-    import easyocr
-    import pillow_heif
-    pillow_heif.register_heif_opener()  # HEIF 지원 활성화
-except ImportError:
-    Image = None
-    easyocr = None
-
-# HWP 파일 처리
-try:
-    import olefile
-except ImportError:
-    olefile = None
-
-# 텍스트 파일 처리
-try:
-    import chardet
-except ImportError:
-    chardet = None
+# PDF(pypdf), 이미지 OCR(PIL, easyocr, pillow_heif), HWP/DOC(olefile), 인코딩 감지(chardet)는
+# 선택 의존성이며 처음 사용할 때 import 합니다. (앱 import/콜드 스타트 시간 단축)
+_modules: Dict[str, Optional[ModuleType]] = {}
+
+
+def _available(*names: str) -> bool:
+    """모듈을 import하지 않고 설치 여부만 확인"""
+    return all(importlib.util.find_spec(name) is not None for name in names)
+
+
+def _module(name: str) -> Optional[ModuleType]:
+    """선택 의존성을 처음 쓸 때 import (설치되지 않았으면 None)"""
+    if name not in _modules:
+        try:
+            _modules[name] = importlib.import_module(name)
+        except ImportError:
+            _modules[name] = None
+    return _modules[name]
+
+
+def _image_module() -> Optional[ModuleType]:
+    """PIL.Image (pillow_heif가 있으면 HEIF 지원 활성화)"""
+    if "PIL.Image" not in _modules:
+        pillow_heif = _module("pillow_heif")
+        if pillow_heif is not None:
+            pillow_heif.register_heif_opener()
+        Image = _module("PIL.Image")
+        if Image is not None:
+            # 압축 폭탄 이미지: 한도를 넘으면 경고 대신 예외
+            Image.MAX_IMAGE_PIXELS = EXTRACTION_MAX_IMAGE_PIXELS
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+    return _module("PIL.Image")
+
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))
+# 입력 크기 상한: PDF 페이지 수, 추출 텍스트 길이, 이미지 픽셀 수, HWP/DOCX 압축 해제 크기(MB)
+EXTRACTION_MAX_PAGES = int(os.getenv("EXTRACTION_MAX_PAGES", "300"))
+EXTRACTION_MAX_CHARS = int(os.getenv("EXTRACTION_MAX_CHARS", "1000000"))
+EXTRACTION_MAX_IMAGE_PIXELS = int(os.getenv("EXTRACTION_MAX_IMAGE_PIXELS", "40000000"))
+EXTRACTION_MAX_DECOMPRESSED_MB = int(os.getenv("EXTRACTION_MAX_DECOMPRESSED_MB", "64"))
+# PDF 스트리밍 시 작업 하나가 추출하는 페이지 수: 첫 조항을 빨리 내보내도록 작게 시작해 두 배씩 늘림
+# (작업마다 파일을 다시 열어 페이지 트리를 읽으므로 고정 크기면 큰 PDF에서 파싱이 페이지 수의 제곱에 비례)
+PDF_PAGE_BATCH = 4
+PDF_PAGE_BATCH_MAX = 64
+# 서버 시작 시 EasyOCR 모델까지 미리 로드할지 (기본은 첫 이미지 요청 때 로드)
+OCR_PRELOAD = os.getenv("OCR_PRELOAD", "false").lower() == "true"
+
+
+class ExtractionError(Exception):
+    """파일에서 텍스트를 추출하지 못한 경우 (손상된 파일, 지원하지 않는 구조, 크기/시간 제한 초과)"""
+
+
+class ExtractorUnavailable(ExtractionError):
+    """형식에 필요한 선택 의존성이 설치되지 않아 추출할 수 없는 경우"""
 
 
 class TextExtractor:
     def __init__(self):
         self.supported_types = {
-            FileType.PDF: pypdf is not None,
-            FileType.DOCX: docx2txt is not None,
+            FileType.PDF: _available("pypdf"),
+            FileType.DOCX: True,  # 표준 라이브러리(zipfile + iterparse)로 직접 파싱
+            FileType.DOC: _available("olefile"),
             FileType.TXT: True,
-            FileType.HWP: olefile is not None,
-            FileType.IMAGE: easyocr is not None,
+            FileType.HWP: _available("olefile"),
+            FileType.IMAGE: _available("PIL", "easyocr"),
         }
-        
-        # EasyOCR 리더 초기화
+
+        # EasyOCR 리더는 모델 로딩이 무거우므로 첫 이미지 요청 때 생성
         self.easyocr_reader = None
-        if easyocr is not None:
-            try:
-                self.easyocr_reader = easyocr.Reader(['ko', 'en'])
-            except Exception as e:
-                print(f"EasyOCR 초기화 실패: {str(e)}")
-                self.easyocr_reader = None
+        self._ocr_loaded = False
+        self._ocr_lock = threading.Lock()
+
+        # 추출 작업은 제한이 걸린 작업자 프로세스에서 실행 (샌드박스를 끄면 스레드 풀)
+        self.workers = EXTRACTION_WORKERS
+        if sandbox.EXTRACTION_SANDBOX:
+            self.sandbox = sandbox.ExtractionPool(self.workers)
+            self._executor = None
+        else:
+            self.sandbox = None
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extract")
+        self.pending = 0  # 대기 + 실행 중 작업 수
+
+    def _ocr_reader(self):
+        if not self._ocr_loaded:
+            with self._ocr_lock:
+                if not self._ocr_loaded:
+                    easyocr = _module("easyocr")
+                    if easyocr is not None:
+                        try:
+                            self.easyocr_reader = easyocr.Reader(['ko', 'en'])
+                        except Exception as e:
+                            logger.warning("EasyOCR 초기화 실패: %s", e)
+                    self._ocr_loaded = True
+        return self.easyocr_reader
+
+    def warm_up(self, ocr: bool = OCR_PRELOAD):
+        """지원 형식의 라이브러리를 미리 import (lifespan에서 스레드로 실행)
+
+        샌드박스 모드에서는 API 프로세스가 아니라 작업자 프로세스를 미리 띄웁니다.
+        """
+        if self.sandbox is not None:
+            self.sandbox.pool.submit(_warm_up_worker, ocr).result()
+        else:
+            self._import_libraries(ocr)
+
+    def _import_libraries(self, ocr: bool):
+        for file_type, name in ((FileType.PDF, "pypdf"), (FileType.HWP, "olefile")):
+            if self.supported_types[file_type]:
+                _module(name)
+        _module("chardet")
+        if ocr and self.supported_types[FileType.IMAGE]:
+            _image_module()
+            self._ocr_reader()
+
+    @property
+    def queue_depth(self) -> int:
+        """워커를 기다리고 있는 추출 작업 수"""
+        return max(0, self.pending - self.workers)
+
+    async def _run(self, fn, *args):
+        """작업자 프로세스 또는 스레드 풀에서 실행 (fn은 프로세스로 넘길 수 있는 모듈 함수)"""
+        try:
+            if self.sandbox is not None:
+                return await self.sandbox.run(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except sandbox.ExtractionLimitError as e:
+            raise ExtractionError(str(e)) from e
 
     async def extract_text(self, file_path: str, file_type: FileType) -> Optional[str]:
-        """파일에서 텍스트를 추출합니다."""
+        """파일에서 텍스트를 추출합니다. 추출하지 못하면 ExtractionError (의존성 없음은 ExtractorUnavailable)"""
+        self.pending += 1
+        try:
+            value = getattr(file_type, "value", str(file_type))
+            with metrics.stage("extraction", value):
+                return await self._run(_extract_in_worker, file_path, value)
+        except ExtractionError as e:
+            logger.warning("텍스트 추출 실패 (%s): %s", file_type, e)
+            raise
+        finally:
+            self.pending -= 1
+
+    async def stream_text(self, file_path: str, file_type: FileType) -> AsyncIterator[str]:
+        """텍스트를 순서대로 내보냅니다. (PDF는 페이지, DOCX는 문단 묶음 단위, 그 외 형식은 한 번에)
+
+        샌드박스 모드의 DOCX는 작업자 프로세스에서 한 번에 추출합니다. (API 프로세스에서 XML을 파싱하지 않음)
+        중간에 실패하면 이미 내보낸 부분과 상관없이 ExtractionError를 올립니다. (일부만 추출된 결과를 완성본으로 쓰지 않도록)
+        """
+        if file_type == FileType.DOCX and self.sandbox is None:
+            async for chunk in self._stream_docx(file_path):
+                yield chunk
+            return
+        if file_type != FileType.PDF or not self.supported_types[FileType.PDF]:
+            text = await self.extract_text(file_path, file_type)
+            if text:
+                yield text
+            return
+
+        self.pending += 1
+        try:
+            # 페이지 묶음 단위로 작업자에서 추출 (작업마다 파일을 다시 열어 PdfReader를 API 프로세스에 두지 않음)
+            start, total, remaining = 0, None, EXTRACTION_MAX_CHARS
+            batch = PDF_PAGE_BATCH
+            while (total is None or start < total) and remaining > 0:
+                with metrics.stage("extraction", "pdf_pages"):
+                    texts, total = await self._run(_pdf_pages_in_worker, file_path, start, batch)
+                for text in texts:
+                    text = (text or "")[:remaining]
+                    remaining -= len(text)
+                    yield text + "\n"
+                start += batch
+                batch = min(batch * 2, PDF_PAGE_BATCH_MAX)
+        except ExtractionError as e:
+            logger.warning("텍스트 추출 실패 (%s): %s", file_type, e)
+            raise
+        except Exception as e:
+            logger.warning("텍스트 추출 실패 (%s): %s", file_type, e)
+            raise ExtractionError(f"PDF 텍스트 추출 실패: {e}") from e
+        finally:
+            self.pending -= 1
+
+    async def _stream_docx(self, file_path: str) -> AsyncIterator[str]:
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            chunks = docx_reader.iter_text(file_path, max_bytes=EXTRACTION_MAX_DECOMPRESSED_MB << 20)
+            while True:
+                with metrics.stage("extraction", "docx_chunk"):
+                    chunk = await loop.run_in_executor(self._executor, next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        except Exception as e:
+            logger.warning("텍스트 추출 실패 (%s): %s", FileType.DOCX, e)
+            raise ExtractionError(f"DOCX 텍스트 추출 실패: {e}") from e
+        finally:
+            self.pending -= 1
+
+    def extract_text_sync(self, file_path: str, file_type: FileType) -> Optional[str]:
+        """동기 추출 (배치 CLI의 프로세스 풀 등 이벤트 루프 밖에서 호출), 실패하면 ExtractionError"""
+        return self._extract_sync(file_path, file_type)
+
+    def _extract_sync(self, file_path: str, file_type: FileType) -> Optional[str]:
+        text = self._extract_by_type(file_path, file_type)
+        if text and len(text) > EXTRACTION_MAX_CHARS:
+            logger.warning("추출 텍스트가 %d자를 넘어 잘라냅니다 (%s)", EXTRACTION_MAX_CHARS, file_type)
+            text = text[:EXTRACTION_MAX_CHARS]
+        return text
+
+    def _extract_by_type(self, file_path: str, file_type: FileType) -> Optional[str]:
         try:
             if file_type == FileType.PDF:
-                return await self._extract_from_pdf(file_path)
+                return self._extract_from_pdf(file_path)
             elif file_type == FileType.DOCX:
-                return await self._extract_from_docx(file_path)
+                return self._extract_from_docx(file_path)
+            elif file_type == FileType.DOC:
+                return self._extract_from_doc(file_path)
             elif file_type == FileType.TXT:
-                return await self._extract_from_txt(file_path)
+                return self._extract_from_txt(file_path)
             elif file_type == FileType.HWP:
-                return await self._extract_from_hwp(file_path)
+                return self._extract_from_hwp(file_path)
             elif file_type == FileType.IMAGE:
-                return await self._extract_from_image(file_path)
+                return self._extract_from_image(file_path)
             else:
                 return None
+        except ExtractionError:
+            raise
         except Exception as e:
-            print(f"텍스트 추출 실패 ({file_type}): {str(e)}")
-            return None
+            # 형식별 처리에서 놓친 예외 (작업자의 MemoryError, CPU 제한 등)
+            raise ExtractionError(f"텍스트 추출 실패: {e}") from e
 
-    async def _extract_from_pdf(self, file_path: str) -> Optional[str]:
+    def _extract_from_pdf(self, file_path: str) -> Optional[str]:
         """PDF에서 텍스트를 추출합니다."""
+        pypdf = _module("pypdf")
         if not pypdf:
-            return "PDF 처리 라이브러리가 설치되지 않았습니다."
+            raise ExtractorUnavailable("PDF 처리 라이브러리가 설치되지 않았습니다.")
         
         try:
-            text = ""
+            parts = []
+            size = 0
             with open(file_path, 'rb') as file:
                 pdf_reader = pypdf.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
+                # 페이지 수/글자 수 상한까지만
+                for page in pdf_reader.pages[:EXTRACTION_MAX_PAGES]:
+                    text = page.extract_text() + "\n"
+                    parts.append(text)
+                    size += len(text)
+                    if size > EXTRACTION_MAX_CHARS:
+                        break
+            return "".join(parts).strip()
         except Exception as e:
-            return f"PDF 텍스트 추출 실패: {str(e)}"
+            raise ExtractionError(f"PDF 텍스트 추출 실패: {str(e)}") from e
 
-    async def _extract_from_docx(self, file_path: str) -> Optional[str]:
+    def _extract_pdf_pages(self, file_path: str, start: int, count: int):
+        """(start부터 count 페이지의 텍스트 목록, 상한을 적용한 전체 페이지 수)"""
+        with open(file_path, 'rb') as file:
+            pdf_reader = _module("pypdf").PdfReader(file)
+            total = min(len(pdf_reader.pages), EXTRACTION_MAX_PAGES)
+            return [pdf_reader.pages[i].extract_text() for i in range(start, min(start + count, total))], total
+
+    def _extract_from_docx(self, file_path: str) -> Optional[str]:
         """DOCX에서 텍스트를 추출합니다."""
-        if not docx2txt:
-            return "DOCX 처리 라이브러리가 설치되지 않았습니다."
-        
         try:
-            text = docx2txt.process(file_path)
-            return text.strip()
+            return docx_reader.extract_text(file_path, max_bytes=EXTRACTION_MAX_DECOMPRESSED_MB << 20)
         except Exception as e:
-            return f"DOCX 텍스트 추출 실패: {str(e)}"
+            raise ExtractionError(f"DOCX 텍스트 추출 실패: {str(e)}") from e
+
+    def _extract_from_doc(self, file_path: str) -> Optional[str]:
+        """Word 97-2003(.doc)에서 텍스트를 추출합니다."""
+        olefile = _module("olefile")
+        if olefile is None:
+            raise ExtractorUnavailable("olefile이 설치되지 않았습니다.")
 
-    async def _extract_from_txt(self, file_path: str) -> Optional[str]:
+        try:
+            return doc_reader.extract_text(file_path, olefile).strip()
+        except Exception as e:
+            raise ExtractionError(f"DOC 텍스트 추출 실패: {str(e)}") from e
+
+    def _extract_from_txt(self, file_path: str) -> Optional[str]:
         """TXT 파일에서 텍스트를 추출합니다."""
         try:
             # 인코딩 감지
+            chardet = _module("chardet")
             if chardet:
                 with open(file_path, 'rb') as file:
                     raw_data = file.read()
@@ -119,12 +310,14 @@ class TextExtractor:
                 text = file.read()
             return text.strip()
         except Exception as e:
-            return f"TXT 텍스트 추출 실패: {str(e)}"
+            raise ExtractionError(f"TXT 텍스트 추출 실패: {str(e)}") from e
 
-    async def _extract_from_image(self, file_path: str) -> Optional[str]:
+    def _extract_from_image(self, file_path: str) -> Optional[str]:
         """이미지에서 OCR로 텍스트를 추출합니다."""
         # EasyOCR 사용
-        if self.easyocr_reader is not None:
+        reader = self._ocr_reader() if self.supported_types[FileType.IMAGE] else None
+        if reader is not None:
+            Image = _image_module()
             try:
                 # 이미지 전처리
                 image = Image.open(file_path)
@@ -142,7 +335,7 @@ class TextExtractor:
                 image.save(processed_path)
                 
                 # EasyOCR로 텍스트 추출
-                results = self.easyocr_reader.readtext(processed_path)
+                results = reader.readtext(processed_path)
                 text = ' '.join([result[1] for result in results])
                 
                 # 임시 파일 삭제
@@ -151,46 +344,20 @@ class TextExtractor:
                 
                 return text.strip()
             except Exception as e:
-                return f"EasyOCR 실패: {str(e)}"
+                raise ExtractionError(f"EasyOCR 실패: {str(e)}") from e
         
-        return "EasyOCR이 설치되지 않았습니다."
+        raise ExtractorUnavailable("EasyOCR이 설치되지 않았습니다.")
+
+    def _extract_from_hwp(self, file_path: str) -> Optional[str]:
+        """HWP 5.0 파일에서 텍스트를 추출합니다. (BodyText 구역의 문단 텍스트)"""
+        olefile = _module("olefile")
+        if olefile is None:
+            raise ExtractorUnavailable("olefile이 설치되지 않았습니다.")
 
-    async def _extract_from_hwp(self, file_path: str) -> Optional[str]:
-        """HWP 파일에서 텍스트를 추출합니다."""
         try:
-            if olefile is None:
-                return "olefile이 설치되지 않았습니다."
-            
-            # HWP 파일은 OLE 구조를 가진 파일입니다
-            # 기본적인 텍스트 추출을 시도합니다
-            with open(file_path, 'rb') as file:
-                # HWP 파일의 기본 구조에서 텍스트를 찾기 위한 간단한 방법
-                content = file.read()
-                
-                # HWP 파일에서 텍스트 부분을 찾기 위한 패턴
-                # 실제로는 더 복잡한 파싱이 필요할 수 있습니다
-                text_parts = []
-                
-                # 바이너리에서 읽을 수 있는 텍스트 부분 추출
-                try:
-                    # UTF-8로 디코딩 시도
-                    decoded = content.decode('utf-8', errors='ignore')
-                    # 의미있는 텍스트만 필터링
-                    lines = decoded.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if len(line) > 3 and any(c.isalpha() or c.isdigit() for c in line):
-                            text_parts.append(line)
-                except:
-                    pass
-                
-                if text_parts:
-                    return '\n'.join(text_parts)
-                else:
-                    return "HWP 파일에서 텍스트를 추출할 수 없습니다."
-                    
+            return hwp_reader.extract_text(file_path, olefile, EXTRACTION_MAX_DECOMPRESSED_MB << 20).strip()
         except Exception as e:
-            return f"HWP 텍스트 추출 실패: {str(e)}"
+            raise ExtractionError(f"HWP 텍스트 추출 실패: {str(e)}") from e
 
     def is_supported(self, file_type: FileType) -> bool:
         """파일 타입이 지원되는지 확인합니다."""
@@ -199,3 +366,16 @@ class TextExtractor:
 
 # 전역 인스턴스
 text_extractor = TextExtractor()
+
+
+# 작업자 프로세스에서 실행하는 함수 (프로세스 풀로 넘기려면 모듈 수준 함수여야 함)
+def _extract_in_worker(file_path: str, file_type: str) -> Optional[str]:
+    return text_extractor._extract_sync(file_path, FileType(file_type))
+
+
+def _pdf_pages_in_worker(file_path: str, start: int, count: int):
+    return text_extractor._extract_pdf_pages(file_path, start, count)
+
+
+def _warm_up_worker(ocr: bool):
+    text_extractor._import_libraries(ocr)
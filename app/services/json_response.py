@@ -0,0 +1,25 @@
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# 응답 JSON 인코딩 (orjson이 없으면 pydantic_core의 Rust 인코더 사용)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """JSON bytes로 인코딩 (pydantic 모델은 dict 변환/재검증 없이 바로 직렬화)"""
+    if isinstance(content, BaseModel) or orjson is None:
+        return pydantic_core.to_json(content)
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """라우트가 모델 인스턴스를 그대로 감싸 반환하면 response_model 재검증과
+    jsonable_encoder를 건너뛰고 한 번에 직렬화합니다.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
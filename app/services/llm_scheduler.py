@@ -0,0 +1,194 @@
+import os
+import time
+import asyncio
+import itertools
+import logging
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+
+def _parse_weights(raw: str) -> Dict[str, float]:
+    weights = {}
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            weights[name.strip()] = float(value)
+    return weights
+
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+PRIORITY_WEIGHTS = _parse_weights(os.getenv("LLM_PRIORITY_WEIGHTS", f"{INTERACTIVE}=8,{BULK}=1"))
+# 요청 하나가 동시에 스케줄러에 올릴 수 있는 LLM 호출 수 (0이면 제한 없음)
+REQUEST_FAN_OUT = int(os.getenv("LLM_REQUEST_FAN_OUT", "16"))
+
+
+class DeadlineExceeded(RuntimeError):
+    """대기 중 마감 시간이 지나 LLM 호출이 취소된 경우"""
+
+
+class _Waiter:
+    __slots__ = ("tag", "seq", "deadline", "future", "enqueued_at")
+
+    def __init__(self, tag: float, seq: int, deadline: Optional[float], future: asyncio.Future):
+        self.tag = tag
+        self.seq = seq
+        self.deadline = deadline
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    """우선순위 클래스별 가중 공정 큐잉(WFQ) + 전역 동시 실행 제한"""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, weights: Dict[str, float] = None):
+        self.max_concurrency = max_concurrency
+        self.weights = dict(weights or PRIORITY_WEIGHTS)
+        self._queues: Dict[str, deque] = {name: deque() for name in self.weights}
+        self._last_finish: Dict[str, float] = {name: 0.0 for name in self.weights}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self.in_flight = 0
+        self.dispatched = {name: 0 for name in self.weights}
+        self.dropped = {name: 0 for name in self.weights}
+        self.wait_seconds = {name: 0.0 for name in self.weights}
+
+    def queue_depth(self, priority: Optional[str] = None) -> int:
+        if priority is not None:
+            return len(self._queues.get(priority, ()))
+        return sum(len(q) for q in self._queues.values())
+
+    @asynccontextmanager
+    async def slot(self, priority: str = BULK, deadline: Optional[float] = None):
+        """실행 슬롯을 배정받은 동안만 LLM을 호출합니다. deadline은 time.monotonic() 기준"""
+        await self._acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: str, deadline: Optional[float]):
+        if priority not in self.weights:
+            priority = BULK
+
+        if self.in_flight < self.max_concurrency and not self.queue_depth():
+            self.in_flight += 1
+            self.dispatched[priority] += 1
+            return
+
+        # 가상 완료 시각: 가중치가 클수록 작은 값 → 먼저 배정
+        start = max(self._virtual_time, self._last_finish[priority])
+        tag = start + 1.0 / self.weights[priority]
+        self._last_finish[priority] = tag
+
+        waiter = _Waiter(tag, next(self._seq), deadline, asyncio.get_running_loop().create_future())
+        self._queues[priority].append(waiter)
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            # 마감과 같은 루프 반복에서 슬롯이 배정되었을 수 있음
+            self._abandon(priority, waiter)
+            raise DeadlineExceeded("LLM 호출 대기 중 마감 시간이 지났습니다.")
+        except asyncio.CancelledError:
+            self._abandon(priority, waiter)
+            raise
+
+    def _abandon(self, priority: str, waiter: _Waiter):
+        """대기를 그만둔 요청 정리: 이미 슬롯을 받았다면 반납, 아니면 큐에서 제거"""
+        future = waiter.future
+        if future.done() and not future.cancelled():
+            if future.exception() is None:
+                self._release()
+            return  # 마감으로 버려진 경우는 _dispatch에서 이미 집계됨
+        self._drop(priority, waiter)
+
+    def _drop(self, priority: str, waiter: _Waiter):
+        if not waiter.future.done():
+            waiter.future.cancel()
+        try:
+            self._queues[priority].remove(waiter)
+        except ValueError:
+            pass
+        self.dropped[priority] += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        now = time.monotonic()
+        while self.in_flight < self.max_concurrency:
+            heads = [(q[0].tag, q[0].seq, name) for name, q in self._queues.items() if q]
+            if not heads:
+                return
+            _, _, name = min(heads)
+            waiter = self._queues[name].popleft()
+            if waiter.future.done():
+                continue
+            if waiter.deadline is not None and waiter.deadline <= now:
+                # 마감이 지난 요청은 업스트림에 보내지 않고 버림
+                self.dropped[name] += 1
+                waiter.future.set_exception(DeadlineExceeded("LLM 호출 대기 중 마감 시간이 지났습니다."))
+                continue
+            self._virtual_time = max(self._virtual_time, waiter.tag - 1.0 / self.weights[name])
+            self.in_flight += 1
+            self.dispatched[name] += 1
+            self.wait_seconds[name] += now - waiter.enqueued_at
+            waiter.future.set_result(None)
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "classes": {
+                name: {
+                    "weight": self.weights[name],
+                    "queued": len(self._queues[name]),
+                    "dispatched": self.dispatched[name],
+                    "dropped": self.dropped[name],
+                    "avg_wait_ms": round(self.wait_seconds[name] / self.dispatched[name] * 1000, 1)
+                    if self.dispatched[name] else 0.0,
+                }
+                for name in self.weights
+            },
+        }
+
+
+_request_calls: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("llm_request_calls", default=None)
+
+
+@contextmanager
+def request_scope(fan_out: int = REQUEST_FAN_OUT):
+    """with 블록 안의 (자식 태스크 포함) LLM 호출을 동시에 fan_out개까지만 큐에 올립니다.
+
+    조항이 수백 개인 계약서 하나가 대량 분석 큐를 혼자 채워 다른 사용자의 요청이
+    입장 제어에 막히지 않도록, 나머지 호출은 요청 안에서 기다립니다.
+    """
+    token = _request_calls.set(asyncio.Semaphore(fan_out) if fan_out > 0 else None)
+    try:
+        yield
+    finally:
+        _request_calls.reset(token)
+
+
+@asynccontextmanager
+async def request_share():
+    """현재 요청의 호출 몫을 받은 동안만 스케줄러에 줄을 섭니다. (request_scope 밖이면 제한 없음)"""
+    limit = _request_calls.get()
+    if limit is None:
+        yield
+        return
+    async with limit:
+        yield
+
+
+# 전역 인스턴스
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,173 @@
+import os
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+from . import tracing
+from .json_response import FastJSONResponse
+
+# 프로세스 내 경량 메트릭 저장소 (Prometheus 텍스트 형식으로 노출)
+# 핫패스에서는 레이블 튜플로 dict 조회 + 덧셈만 합니다.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, value: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 → [버킷별 개수..., +Inf 개수, 합계]
+        self.values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+GaugeValue = Union[float, Dict[tuple, float]]
+
+
+class Gauge:
+    """값은 수집(스크레이프) 시점에 콜백으로 읽습니다. 레이블이 있으면 {레이블 튜플: 값}을 반환"""
+
+    def __init__(self, name: str, help: str, callback: Callable[[], GaugeValue], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            value = self.callback()
+        except Exception:
+            return lines
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for labels, v in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(v)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        # 같은 이름을 다시 등록하면 기존 메트릭을 그대로 사용
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, callback: Callable[[], GaugeValue], labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, callback, labelnames))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 인스턴스
+registry = MetricsRegistry()
+
+http_requests = registry.counter("checky_http_requests_total", "HTTP 요청 수", ("method", "route", "status"))
+http_latency = registry.histogram("checky_http_request_seconds", "HTTP 요청 처리 시간", ("method", "route"))
+stage_latency = registry.histogram("checky_stage_seconds", "파이프라인 단계별 처리 시간", ("stage", "detail"))
+
+
+@contextmanager
+def stage(name: str, detail: str = ""):
+    """with 블록의 처리 시간을 단계 히스토그램과 현재 요청의 트레이스에 기록합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stage_latency.observe(elapsed, name, detail)
+        tracing.record(name, elapsed)
+
+
+def observe_request(method: str, route: str, status: int, elapsed: float):
+    http_requests.inc(method, route, str(status))
+    http_latency.observe(elapsed, method, route)
+
+
+class TimedJSONResponse(FastJSONResponse):
+    """응답 JSON 인코딩 시간을 serialization 단계로 기록"""
+
+    def render(self, content) -> bytes:
+        with stage("serialization", "json"):
+            return super().render(content)
+
+
+def directory_size(path) -> Tuple[int, int]:
+    """디렉터리의 (파일 수, 전체 바이트)"""
+    files = size = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    files += 1
+                    size += entry.stat(follow_symlinks=False).st_size
+    except FileNotFoundError:
+        pass
+    return files, size
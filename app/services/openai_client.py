@@ -1,18 +1,46 @@
-import os, httpx
+import os, time, httpx
 from dotenv import load_dotenv
+from .rate_limiter import llm_limiter, estimate_tokens
+from .llm_scheduler import llm_scheduler, request_share, BULK, INTERACTIVE
+from . import usage, metrics
 
 load_dotenv()
 API_KEY = os.getenv("OPENAI_API_KEY") or os.getenv("AI_API_KEY")
 BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-async def chat_completion(messages, temperature=0.2, timeout=60):
+async def chat_completion(messages, temperature=0.2, timeout=60, priority=BULK, deadline=None, model=None,
+                          response_format=None):
     if not API_KEY:
         raise RuntimeError("OpenAI API 키가 설정되어 있지 않습니다. (.env의 OPENAI_API_KEY)")
     headers = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
-    data = {"model": MODEL, "messages": messages, "temperature": temperature}
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        r = await client.post(f"{BASE_URL}/chat/completions", headers=headers, json=data)
-        r.raise_for_status()
-        return r.json()
+    data = {"model": model or MODEL, "messages": messages, "temperature": temperature}
+    if response_format:
+        data["response_format"] = response_format
 
+    async def send():
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            r = await client.post(f"{BASE_URL}/chat/completions", headers=headers, json=data)
+            r.raise_for_status()
+            return r.json()
+
+    # 시도마다 우선순위 스케줄러에서 슬롯을 받은 뒤 요청/토큰 한도, 서킷 브레이커 적용
+    # (재시도 백오프 대기 중에는 슬롯을 반납)
+    # 대화형 호출만 기본 대기 마감을 둠: 계약서 분석은 조항 전체를 한꺼번에 올리므로
+    # 뒤쪽 조항이 큐에서 오래 기다렸다는 이유만으로 규칙 기반 결과로 떨어지지 않도록
+    if deadline is None and priority == INTERACTIVE:
+        deadline = time.monotonic() + timeout
+    async with request_share():
+        # 요청별 토큰 예산 확인 (초과 시 BudgetExceeded, 호출하지 않음)
+        estimated = estimate_tokens(messages)
+        tracker = usage.current()
+        if tracker is not None:
+            tracker.reserve(estimated)
+        try:
+            with metrics.stage("llm_call", data["model"]):
+                result = await llm_limiter.call(send, estimated, slot=lambda: llm_scheduler.slot(priority, deadline))
+        finally:
+            if tracker is not None:
+                tracker.release(estimated)
+    usage.record(data["model"], result.get("usage"))
+    return result
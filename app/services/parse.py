@@ -1,20 +1,90 @@
 # app/services/parse.py
+import re
 import json
-from typing import List
+from typing import List, Optional
 from .schemas_llm import LLMItem, ValidationError
 
-def parse_llm_array(raw: str, expected_len: int) -> List[LLMItem]:
-    try:
-        data = json.loads(raw)
-        if not isinstance(data, list):
-            raise ValueError("not a list")
-    except Exception:
-        return [LLMItem(risk="safe", why="-", fix="-") for _ in range(expected_len)]
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_decoder = json.JSONDecoder()
 
-    items: List[LLMItem] = []
-    for i in range(expected_len):
+
+def _find_list(data) -> Optional[list]:
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        # JSON 모드/스키마 출력: {"items": [...]} 처럼 객체로 감싼 경우
+        for value in data.values():
+            if isinstance(value, list):
+                return value
+    return None
+
+
+def extract_json_array(raw: str) -> Optional[list]:
+    """코드펜스나 설명 문구가 섞인 응답에서 JSON 배열을 찾아냅니다."""
+    if not raw:
+        return None
+    candidates = [raw.strip()] + [m.strip() for m in _FENCE.findall(raw)]
+    for text in candidates:
+        try:
+            found = _find_list(json.loads(text))
+            if found is not None:
+                return found
+        except ValueError:
+            pass
+
+    # 앞뒤에 다른 텍스트가 있으면 '[' / '{' 위치부터 디코딩 시도
+    for match in re.finditer(r"[\[{]", raw):
+        try:
+            data, _ = _decoder.raw_decode(raw, match.start())
+        except ValueError:
+            continue
+        found = _find_list(data)
+        if found is not None:
+            return found
+    return None
+
+
+def _item_index(entry: dict, expected_len: int) -> Optional[int]:
+    """항목의 "index"(입력 문장 번호, 1부터)를 0부터 시작하는 위치로. 없거나 범위 밖이면 None"""
+    index = entry.get("index")
+    if isinstance(index, str) and index.strip().isdigit():
+        index = int(index)
+    if not isinstance(index, int) or isinstance(index, bool):
+        return None
+    return index - 1 if 1 <= index <= expected_len else None
+
+
+def index_items(data: Optional[list], expected_len: int) -> List[Optional[dict]]:
+    """응답 항목을 순서가 아니라 "index"로 입력 문장에 맞춥니다.
+
+    모델이 중간 항목을 빠뜨리거나 합쳐도 뒤 문장의 결과가 밀리지 않도록,
+    index가 없거나 범위 밖인 항목은 버리고 같은 index가 두 번 나오면 그 문장은 None(재요청 대상)
+    """
+    items: List[Optional[dict]] = [None] * expected_len
+    duplicated = set()
+    for entry in data or []:
+        if not isinstance(entry, dict):
+            continue
+        i = _item_index(entry, expected_len)
+        if i is None or i in duplicated:
+            continue
+        if items[i] is not None:
+            items[i] = None
+            duplicated.add(i)
+            continue
+        items[i] = entry
+    return items
+
+
+def parse_llm_array(raw: str, expected_len: int) -> List[Optional[LLMItem]]:
+    """항목별로 검증합니다. 누락되었거나 index가 중복되었거나 형식이 잘못된 항목은 None"""
+    items: List[Optional[LLMItem]] = []
+    for entry in index_items(extract_json_array(raw), expected_len):
+        if entry is None:
+            items.append(None)
+            continue
         try:
-            items.append(LLMItem(**(data[i] if i < len(data) else {})))
+            items.append(LLMItem(**entry))
         except ValidationError:
-            items.append(LLMItem(risk="safe", why="-", fix="-"))
-    return items[:expected_len]
\ No newline at end of file
+            items.append(None)
+    return items
@@ -0,0 +1,62 @@
+from typing import List, Optional
+
+# 분석 결과 부분 조회: 문장 필드 선택(fields), 위험도 필터(risk), 조항 페이지네이션(offset/limit)
+SENTENCE_FIELDS = ("id", "text", "risk", "why", "fix")
+RISK_LEVELS = ("danger", "warning", "safe")
+
+
+def _split(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+class Projection:
+    def __init__(self, fields=SENTENCE_FIELDS, risks=None, offset: int = 0, limit: Optional[int] = None):
+        self.fields = tuple(fields)
+        self.risks = set(risks) if risks is not None else None
+        self.offset = offset
+        self.limit = limit
+
+    @classmethod
+    def parse(cls, fields: Optional[str], risk: Optional[str], offset: int = 0,
+              limit: Optional[int] = None) -> Optional["Projection"]:
+        """쿼리 파라미터 → Projection (아무것도 지정하지 않으면 None: 전체 응답)"""
+        if fields is None and risk is None and not offset and limit is None:
+            return None
+        selected = _split(fields) if fields is not None else list(SENTENCE_FIELDS)
+        unknown = [f for f in selected if f not in SENTENCE_FIELDS]
+        if unknown:
+            raise ValueError(f"알 수 없는 필드: {', '.join(unknown)} (가능: {', '.join(SENTENCE_FIELDS)})")
+        risks = _split(risk) if risk is not None else None
+        if risks is not None and any(r not in RISK_LEVELS for r in risks):
+            raise ValueError(f"risk는 {', '.join(RISK_LEVELS)} 중에서 선택해야 합니다.")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset/limit은 0 이상이어야 합니다.")
+        return cls(selected, risks, offset, limit)
+
+    def apply(self, articles) -> dict:
+        """조항 목록에서 필터 → 페이지 → 필드 선택 순으로 줄인 결과
+
+        위험도 필터로 문장이 모두 빠진 조항은 제외하고, total은 필터 후 조항 수입니다.
+        """
+        matched = []
+        for article in articles:
+            sentences = article.sentences
+            if self.risks is not None:
+                sentences = [s for s in sentences if s.risk in self.risks]
+                if not sentences:
+                    continue
+            matched.append((article, sentences))
+
+        end = None if self.limit is None else self.offset + self.limit
+        fields = self.fields
+        return {
+            "articles": [
+                {
+                    "id": article.id,
+                    "title": article.title,
+                    "sentences": [{f: getattr(s, f) for f in fields} for s in sentences],
+                }
+                for article, sentences in matched[self.offset:end]
+            ],
+            "page": {"offset": self.offset, "limit": self.limit, "total": len(matched)},
+        }
@@ -0,0 +1,194 @@
+import os
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 버전별 프롬프트 저장소
+# system 메시지는 버전마다 바이트 단위로 고정해 제공자 프롬프트 접두사 캐시가 적중하도록 하고,
+# 조항 제목/문장처럼 매번 달라지는 내용은 마지막 user 메시지에만 넣습니다.
+CLASSIFY_PROMPT_VERSION = os.getenv("CLASSIFY_PROMPT_VERSION", "v2")
+
+_CRITERIA = """[분류 키]
+- index: 입력 문장 번호(1부터), 결과를 문장에 맞추는 데 사용
+- risk: "danger" | "warning" | "safe"
+- why:  한 줄(최대 120자), 한국 법/관행/판례 흐름에 맞춘 간결 근거
+- fix:  한 줄(최대 120자), 계약서에 바로 쓸 수 있는 개선 문구, "~이다" 체로 끝냄. safe이면 ""
+
+[판단 기준]
+- "danger" (즉시 위험)
+  • 해고: 즉시 해고/예고 없이 해고/서면통지 없음/정당사유 불명
+  • 임금·수당: 연장·야간·휴일근로 수당 미지급/포괄임금으로 수당 전면 배제
+  • 손해배상: 사업상 위험·모든 손해의 전적 부담 등 포괄 전가
+  • 업무조건: 일방적 근로조건 변경/근로시간 중 대기·지시로 휴게 침해
+- "warning" (주의·조정 필요)
+  • 경업금지: 과도한 범위/지역/기간(일반적으로 1년 초과, 직무 불특정, 전 업종 등)
+  • 비밀유지: 비밀 범위 불명확/과도한 포괄성
+  • 기타: 불명확 표현으로 근로자 권리 침해 우려
+- "safe"
+  • 법정 기준 충족 또는 통상적·명확한 조항
+
+[타이브레이커]
+- 애매하면 근로자 보호 관점에서 더 보수적으로("warning" → "danger" 우선)."""
+
+_EXAMPLE_ITEMS = """{"index":1,"risk":"danger","why":"해고예고·서면통지 의무 위반 소지","fix":"해고는 정당사유·서면통지·예고수당 원칙을 준수한다"},
+  {"index":2,"risk":"warning","why":"경업금지 기간·범위 과도","fix":"기간은 1년 내로, 직무·지역을 한정하고 비밀보호 범위를 특정한다"},
+  {"index":3,"risk":"safe","why":"법정 기준에 부합","fix":""}"""
+
+_CLASSIFY_SYSTEM_V2 = f"""당신은 계약서 분석 전문가입니다. 모든 답변은 한국어로만 하며, 설명 문구나 마크다운을 출력하지 않습니다.
+입력은 조항 제목과 "번호. 문장" 형식의 문장 목록입니다. 각 문장을 아래 기준으로 분류하고,
+문장마다 결과 하나를 반환하고, 각 결과의 index에 해당 문장 번호를 적습니다.
+
+{_CRITERIA}
+"""
+
+CLASSIFY_SYSTEM_V2 = _CLASSIFY_SYSTEM_V2 + f"""
+[출력 형식 예시 — JSON 배열]
+[
+  {_EXAMPLE_ITEMS}
+]"""
+
+CLASSIFY_JSON_SYSTEM_V2 = _CLASSIFY_SYSTEM_V2 + f"""
+[출력 형식 예시 — JSON 객체]
+{{"items": [
+  {_EXAMPLE_ITEMS}
+]}}"""
+
+FIRST_PASS_SYSTEM = """당신은 계약서 조항 위험도 1차 분류기입니다.
+각 문장을 "danger" | "warning" | "safe" 중 하나로 분류하고 0~1 사이 확신도(confidence)를 붙입니다.
+근로자에게 불리할 가능성이 조금이라도 있으면 safe로 분류하지 않습니다.
+문장마다 결과 하나씩, index에 문장 번호를 적은 JSON 배열만 반환합니다. 예: [{"index":1,"risk":"safe","confidence":0.95}]"""
+
+
+def numbered_lines(texts: List[str]) -> str:
+    """문장을 "번호. 문장" 줄로 (JSON 문자열 배열보다 이스케이프/따옴표 토큰이 적음)"""
+    return "\n".join(f"{i + 1}. {' '.join(t.split())}" for i, t in enumerate(texts))
+
+
+def _indexed_user(texts: List[str], title: str = "") -> str:
+    head = f"조항: {title}\n" if title else ""
+    return f"{head}문장 {len(texts)}개:\n{numbered_lines(texts)}"
+
+
+def _legacy_user(structured: bool) -> Callable[[List[str], str], str]:
+    # v1: 지시문/예시가 가변 문장 뒤에 오는 기존 배치 (비교용)
+    def render(texts: List[str], title: str = "") -> str:
+        n = len(texts)
+        if structured:
+            instruction = f'반드시 {{"items": [...]}} 형태의 JSON 객체만 반환하세요. items 길이는 {n}이어야 합니다:'
+        else:
+            instruction = f"반드시 길이가 {n}인 JSON 배열만 반환하세요:"
+        return f"""다음은 계약서의 '{title}' 조항에 속한 문장들입니다.
+각 문장의 위험도를 분석해주세요.
+
+문장들:
+{json.dumps(texts, ensure_ascii=False)}
+
+위험도는 다음 중 하나로 분류해주세요:
+- danger: 위험한 조항 (법적 문제 가능성 높음)
+- warning: 주의가 필요한 조항 (개선 권장)
+- safe: 안전한 조항 (문제없음)
+
+각 문장에 대해 다음을 제공해주세요:
+1. 문장 번호 (index, 목록 순서대로 1부터)
+2. 위험도 (danger/warning/safe)
+3. 위험한 이유 (why)
+4. 개선 방안 (fix)
+
+{instruction}
+[
+  {_EXAMPLE_ITEMS}
+]"""
+    return render
+
+
+_LEGACY_SYSTEM = "당신은 계약서 분석 전문가입니다. 한국어로 간결하게 답하세요. 반드시 JSON만 반환하세요."
+
+
+def estimate_prompt_tokens(messages: List[dict]) -> int:
+    """입력 토큰 수 추정 (한국어 기준 약 2자당 1토큰 + 메시지당 4토큰)"""
+    return sum(len(m.get("content") or "") // 2 + 4 for m in messages)
+
+
+class PromptTemplate:
+    """고정 system 메시지 + 가변 user 메시지로 이루어진 프롬프트"""
+
+    def __init__(self, name: str, version: str, system: str, render_user: Callable[[List[str], str], str]):
+        self.name = name
+        self.version = version
+        self.system = system
+        self.render_user = render_user
+        self.key = f"{name}:{version}"
+        self.prefix_tokens = estimate_prompt_tokens([{"role": "system", "content": system}])
+
+    def messages(self, texts: List[str], title: str = "") -> List[dict]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render_user(texts, title)},
+        ]
+
+
+class PromptRegistry:
+    """(이름, 버전)별 프롬프트와 요청당 토큰/지연 시간 통계"""
+
+    def __init__(self):
+        self._templates: Dict[Tuple[str, str], PromptTemplate] = {}
+        self._active: Dict[str, str] = {}
+        self._stats: Dict[str, dict] = {}
+
+    def register(self, template: PromptTemplate):
+        self._templates[(template.name, template.version)] = template
+        self._active.setdefault(template.name, template.version)
+
+    def activate(self, name: str, version: str):
+        if (name, version) in self._templates:
+            self._active[name] = version
+
+    def get(self, name: str, version: Optional[str] = None) -> PromptTemplate:
+        return self._templates[(name, version or self._active[name])]
+
+    def record(self, template: PromptTemplate, messages: List[dict], response: dict, elapsed: float):
+        """요청 1건의 추정/실제 토큰 수와 지연 시간을 누적합니다."""
+        usage = response.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        stats = self._stats.setdefault(template.key, {
+            "requests": 0,
+            "estimated_prompt_tokens": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "completion_tokens": 0,
+            "latency_total": 0.0,
+        })
+        stats["requests"] += 1
+        stats["estimated_prompt_tokens"] += estimate_prompt_tokens(messages)
+        stats["prompt_tokens"] += usage.get("prompt_tokens") or 0
+        stats["cached_tokens"] += details.get("cached_tokens") or 0
+        stats["completion_tokens"] += usage.get("completion_tokens") or 0
+        stats["latency_total"] += elapsed
+
+    def snapshot(self) -> dict:
+        templates = {
+            t.key: {"active": self._active.get(t.name) == t.version, "prefix_tokens": t.prefix_tokens}
+            for t in self._templates.values()
+        }
+        stats = {}
+        for key, s in self._stats.items():
+            n = s["requests"] or 1
+            stats[key] = {
+                "requests": s["requests"],
+                "avg_estimated_prompt_tokens": round(s["estimated_prompt_tokens"] / n, 1),
+                "avg_prompt_tokens": round(s["prompt_tokens"] / n, 1),
+                "avg_completion_tokens": round(s["completion_tokens"] / n, 1),
+                "cached_ratio": round(s["cached_tokens"] / s["prompt_tokens"], 3) if s["prompt_tokens"] else 0.0,
+                "avg_latency_ms": round(s["latency_total"] / n * 1000, 1),
+            }
+        return {"templates": templates, "stats": stats}
+
+
+# 전역 인스턴스
+prompt_registry = PromptRegistry()
+prompt_registry.register(PromptTemplate("classify", "v1", _LEGACY_SYSTEM, _legacy_user(False)))
+prompt_registry.register(PromptTemplate("classify", "v2", CLASSIFY_SYSTEM_V2, _indexed_user))
+prompt_registry.register(PromptTemplate("classify_json", "v1", _LEGACY_SYSTEM, _legacy_user(True)))
+prompt_registry.register(PromptTemplate("classify_json", "v2", CLASSIFY_JSON_SYSTEM_V2, _indexed_user))
+prompt_registry.register(PromptTemplate("first_pass", "v1", FIRST_PASS_SYSTEM, _indexed_user))
+prompt_registry.activate("classify", CLASSIFY_PROMPT_VERSION)
+prompt_registry.activate("classify_json", CLASSIFY_PROMPT_VERSION)
@@ -0,0 +1,247 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+from typing import AsyncContextManager, Awaitable, Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_PER_MINUTE = float(os.getenv("LLM_RPM", "500"))
+TOKENS_PER_MINUTE = float(os.getenv("LLM_TPM", "200000"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """업스트림 장애로 서킷이 열려 있어 즉시 실패하는 경우"""
+
+
+class TokenBucket:
+    """분당 한도를 초 단위로 채워 넣는 토큰 버킷"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.scale = 1.0  # 429 발생 시 줄어드는 적응형 배율
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate * self.scale)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """토큰이 쌓일 때까지 대기 후 차감합니다.
+
+        확인/차감 사이에 await가 없으므로 잠금 없이 처리하고, 부족하면 필요한 시간만큼 잠든 뒤 다시 확인합니다.
+        (잠금을 쥔 채 잠들면 스케줄러 슬롯을 받은 대량 분석 호출 하나가 뒤의 대화형 호출까지 막음)
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / (self.rate * self.scale))
+
+    def adjust(self, delta: float):
+        """예상치와 실제 사용량의 차이를 반영합니다. (음수 잔량 허용)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+    def snapshot(self) -> dict:
+        self._refill()
+        return {
+            "available": round(self.tokens, 1),
+            "capacity": self.capacity,
+            "effective_per_minute": round(self.capacity * self.scale, 1),
+        }
+
+
+class CircuitBreaker:
+    """연속 실패가 임계값을 넘으면 일정 시간 동안 호출을 차단합니다."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_count = 0
+        self._probe_in_flight = False
+
+    def before_call(self):
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                raise CircuitOpenError("LLM 업스트림이 불안정하여 요청을 일시적으로 차단했습니다.")
+            self.state = "half_open"
+        if self.state == "half_open":
+            # 반개방 상태에서는 탐색 요청 하나만 통과
+            if self._probe_in_flight:
+                raise CircuitOpenError("LLM 업스트림 복구 여부를 확인하는 중입니다.")
+            self._probe_in_flight = True
+
+    def record_success(self):
+        self.failures = 0
+        self.state = "closed"
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.open_count += 1
+                logger.warning("LLM 서킷 오픈 (연속 실패 %d회)", self.failures)
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """결과를 기록하지 못하고 끝난 호출(취소 등)의 탐색 요청 표시를 해제합니다."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "open_count": self.open_count,
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환합니다."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMRateLimiter:
+    """요청/토큰 버킷 + 지수 백오프 재시도 + 서킷 브레이커"""
+
+    def __init__(self, rpm: float = REQUESTS_PER_MINUTE, tpm: float = TOKENS_PER_MINUTE,
+                 max_retries: int = MAX_RETRIES, backoff_base: float = BACKOFF_BASE,
+                 backoff_max: float = BACKOFF_MAX):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.breaker = CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        # full jitter 지수 백오프, Retry-After가 있으면 그 이상 대기
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max) + random.uniform(0, self.backoff_base))
+        return delay
+
+    def _throttle(self):
+        """429 응답 시 유효 처리율을 절반으로 낮춥니다."""
+        self.throttled += 1
+        for bucket in (self.requests, self.tokens):
+            bucket.scale = max(0.1, bucket.scale * 0.5)
+
+    def _recover(self):
+        for bucket in (self.requests, self.tokens):
+            bucket.scale = min(1.0, bucket.scale + 0.05)
+
+    async def call(self, send: Callable[[], Awaitable[dict]], estimated_tokens: int = 0,
+                   slot: Optional[Callable[[], AsyncContextManager]] = None) -> dict:
+        """send()를 한도 내에서 실행하고, 일시적 오류는 재시도합니다.
+
+        slot은 시도마다 들어가는 실행 슬롯(스케줄러)으로, 백오프 대기 중에는 반납해
+        재시도가 다른(우선순위가 높은) 호출을 막지 않게 합니다.
+        """
+        attempt = 0
+        while True:
+            async with (slot() if slot is not None else nullcontext()):
+                self.breaker.before_call()
+                retry_after = None
+                try:
+                    await self.requests.acquire(1)
+                    await self.tokens.acquire(estimated_tokens)
+                    self.calls += 1
+                    result = await send()
+                except httpx.HTTPStatusError as e:
+                    status = e.response.status_code
+                    if status not in RETRYABLE_STATUS:
+                        # 요청 자체의 문제는 업스트림 상태를 알려주지 않으므로 서킷 상태는 그대로 두고
+                        # 탐색 표시만 해제 (잘못된 요청 하나가 진행 중인 장애를 가리지 않도록)
+                        self.breaker.release()
+                        raise
+                    self.breaker.record_failure()
+                    if status == 429:
+                        self._throttle()
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                    error = e
+                except httpx.TransportError as e:
+                    self.breaker.record_failure()
+                    error = e
+                except Exception:
+                    # 응답 파싱 오류 등 예상하지 못한 예외도 실패로 기록 (재시도하지 않음)
+                    self.breaker.record_failure()
+                    self.failures += 1
+                    raise
+                except BaseException:
+                    # 대기/호출 중 취소: 결과를 알 수 없으므로 기록 없이 탐색 표시만 해제
+                    self.breaker.release()
+                    raise
+                else:
+                    self.breaker.record_success()
+                    self._recover()
+                    usage = result.get("usage") or {}
+                    if usage.get("total_tokens"):
+                        self.tokens.adjust(usage["total_tokens"] - estimated_tokens)
+                    return result
+
+            if attempt >= self.max_retries or self.breaker.state == "open":
+                self.failures += 1
+                raise error
+
+            delay = self._backoff(attempt, retry_after)
+            logger.warning("LLM 호출 재시도 %d/%d (%.2fs 후): %s", attempt + 1, self.max_retries, delay, error)
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests.snapshot(),
+            "tokens": self.tokens.snapshot(),
+            "breaker": self.breaker.snapshot(),
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+        }
+
+
+def estimate_tokens(messages) -> int:
+    """메시지 길이로 토큰 수를 대략 추정합니다. (한국어 기준 약 2자당 1토큰)"""
+    return sum(len(m.get("content") or "") for m in messages) // 2 + 256
+
+
+# 전역 인스턴스
+llm_limiter = LLMRateLimiter()
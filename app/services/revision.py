@@ -0,0 +1,79 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+
+from app.schemas.contract.types import Article, RevisionSummary
+from app.services.analyzer import DEGRADED_REASONS
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sentence(text: str) -> str:
+    """띄어쓰기/전각 문자 차이는 같은 문장으로 봅니다."""
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", text))
+
+
+def _codes(texts: List[str], table: Dict[str, int]) -> List[int]:
+    # 문자열 대신 정수로 비교하면 SequenceMatcher가 훨씬 빠름
+    return [table.setdefault(normalize_sentence(t), len(table)) for t in texts]
+
+
+def apply_revision(previous: List, current: List[Article]) -> Tuple[List[Article], RevisionSummary]:
+    """이전 분석과 새 문장들을 정렬해 변경 없는 문장의 결과를 재사용합니다.
+
+    새로 분석해야 할 문장만 담은 조항 목록과 변경 요약을 반환합니다.
+    반환된 조항의 문장은 current의 문장 객체와 같으므로 분석 결과가 바로 반영됩니다.
+    장애·예산 초과로 규칙 기반 판단만 받은 이전 문장은 그대로 두지 않고 수정된 문장으로 다시 분석합니다.
+    """
+    old_sentences = [s for a in previous for s in a.sentences]
+    new_pairs = [(a, s) for a in current for s in a.sentences]
+
+    table: Dict[str, int] = {}
+    old_codes = _codes([s.text for s in old_sentences], table)
+    new_codes = _codes([s.text for _, s in new_pairs], table)
+
+    unchanged = 0
+    modified, inserted, deleted = [], [], []
+    changed = set()
+
+    matcher = SequenceMatcher(None, old_codes, new_codes, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for old, (_, new) in zip(old_sentences[i1:i2], new_pairs[j1:j2]):
+                if old.why in DEGRADED_REASONS:
+                    modified.append(new.id)
+                    changed.add(id(new))
+                    continue
+                new.risk = getattr(old.risk, "value", old.risk)
+                new.why = old.why
+                new.fix = old.fix
+                unchanged += 1
+            continue
+
+        # 새 문장보다 남는 이전 문장은 삭제된 것
+        deleted += [s.id for s in old_sentences[i1 + (j2 - j1):i2]]
+        if tag == "replace":
+            # 앞쪽은 수정, 새 문장이 더 많으면 나머지는 추가로 간주
+            pairs = new_pairs[j1:j2]
+            n_modified = min(i2 - i1, j2 - j1)
+            modified += [s.id for _, s in pairs[:n_modified]]
+            inserted += [s.id for _, s in pairs[n_modified:]]
+        elif tag == "insert":
+            inserted += [s.id for _, s in new_pairs[j1:j2]]
+        changed.update(id(s) for _, s in new_pairs[j1:j2])
+
+    # 변경된 문장만 담은 조항 (분석 대상)
+    targets = []
+    for article in current:
+        sentences = [s for s in article.sentences if id(s) in changed]
+        if sentences:
+            targets.append(Article.model_construct(id=article.id, title=article.title, sentences=sentences))
+
+    summary = RevisionSummary(
+        unchanged=unchanged,
+        modified=modified,
+        inserted=inserted,
+        deleted=deleted,
+    )
+    return targets, summary
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field, ValidationError
 Risk = Literal["danger", "warning", "safe"]
 
 class LLMItem(BaseModel):
+    # 입력 문장 번호(index)는 parse.index_items에서 위치를 맞추는 데만 쓰고 결과에는 넣지 않음
     risk: Risk
     why: Optional[str] = Field("", max_length=300)
     fix: Optional[str] = Field("", max_length=300)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import re
+from typing import List
+
+from app.schemas.contract.types import Article, Sentence
+
+# 서문 패턴 (하나의 정규식으로 결합)
+PREAMBLE_PATTERN = re.compile("|".join([
+    r'본 계약(?:은|서는).*간의.*(?:체결한다|다음과 같이)',
+    r'^(?:근로|임대차|매매|도급|용역)계약서$',
+]))
+
+# 조항이 아닌 문장 패턴 (서명란, 날짜, 당사자 표기 등)
+NON_ARTICLE_PATTERN = re.compile("|".join([
+    r'본 계약의 효력을 증명하기 위하여',
+    r'계약 당사자가 서명 또는 날인한다',
+    r'^\d{4}년 \d{1,2}월 \d{1,2}일',  # 문장 시작에 날짜만 있는 경우
+    r'사용자\(대표자\)',
+    r'근로자:',
+    r'임대인:',
+    r'임차인:',
+    r'매도인:',
+    r'매수인:',
+]))
+
+# "제N조" 또는 "제N조 (제목)"
+CLAUSE_PATTERN = re.compile(r'제\s*(\d+)\s*조(?:\s*\(([^)]+)\))?')
+CLAUSE_STRIP_PATTERN = re.compile(r'제\s*\d+\s*조(?:\s*\([^)]+\))?\s*')
+LEADING_NUMBER_PATTERN = re.compile(r'^\s*\d+\s*')
+PAREN_NUMBER_PATTERN = re.compile(r'(\([^)]+\))\s*\d+\s*')
+
+
+PREAMBLE, NON_ARTICLE, CLAUSE_START, BODY = range(4)
+
+
+def is_preamble_sentence(text: str) -> bool:
+    """서문 문장인지 판단하는 함수"""
+    return PREAMBLE_PATTERN.search(text) is not None
+
+
+def is_non_article_sentence(text: str) -> bool:
+    """조항이 아닌 문장인지 판단하는 함수 (제N조 패턴이 있으면 조항으로 간주)"""
+    return CLAUSE_PATTERN.search(text) is None and NON_ARTICLE_PATTERN.search(text) is not None
+
+
+def classify_sentence(text: str):
+    """문장 종류를 판별하고 (종류, 조항 매칭) 을 반환합니다."""
+    if PREAMBLE_PATTERN.search(text):
+        return PREAMBLE, None
+    clause_match = CLAUSE_PATTERN.search(text)
+    if clause_match:
+        return CLAUSE_START, clause_match
+    if NON_ARTICLE_PATTERN.search(text):
+        return NON_ARTICLE, None
+    return BODY, None
+
+
+def _copy_with_text(sentence: Sentence, text: str) -> Sentence:
+    # 이미 검증된 값이므로 재검증 없이 얕은 복사
+    return sentence.model_copy(update={"text": text})
+
+
+def _keep_paren(match) -> str:
+    return match.group(1)
+
+
+def _strip_leading_number(text: str) -> str:
+    if text and (text[0].isdigit() or text[0].isspace()):
+        return LEADING_NUMBER_PATTERN.sub('', text, count=1).strip()
+    return text
+
+
+def segment_clauses(articles: List[Article]) -> List[Article]:
+    """문장들을 한 번만 훑으면서 서문 / 제N조 / 기타 사항으로 묶습니다."""
+    clauses = []  # (조항 id, 제목, 문장 목록), 등장한 순서대로
+    clause_counts = {}  # 조항 번호 → 등장 횟수
+    current = None
+    preamble_sentences = []
+    non_article_sentences = []
+
+    for article in articles:
+        for sentence in article.sentences:
+            text = sentence.text
+            kind, clause_match = classify_sentence(text)
+
+            if kind == PREAMBLE:
+                preamble_sentences.append(sentence)
+            elif kind == NON_ARTICLE:
+                non_article_sentences.append(sentence)
+            elif kind == CLAUSE_START:
+                # 새로운 조항 시작 (같은 번호가 다시 나오면 "3_2"처럼 순번을 붙인 별도 조항, TextSegmenter와 같은 규칙)
+                clause_num, clause_title = clause_match.group(1), clause_match.group(2)
+                title = f'제{clause_num}조 ({clause_title})' if clause_title else f'제{clause_num}조'
+                number = int(clause_num)
+                count = clause_counts[number] = clause_counts.get(number, 0) + 1
+                current = []
+                clauses.append((number if count == 1 else f"{number}_{count}", title, current))
+
+                # "제n조" 부분과 문장 시작의 불필요한 숫자를 제거하고 실제 내용만 추출
+                clean_text = _strip_leading_number(CLAUSE_STRIP_PATTERN.sub('', text).strip())
+                if clean_text:
+                    current.append(_copy_with_text(sentence, clean_text))
+            elif current is not None:
+                # 괄호 뒤 번호 (예: "(근로시간 및 휴게시간) 1") 및 문장 시작 번호 제거
+                clean_text = text.strip()
+                if '(' in clean_text:
+                    clean_text = PAREN_NUMBER_PATTERN.sub(_keep_paren, clean_text).strip()
+                clean_text = _strip_leading_number(clean_text)
+                if clean_text:
+                    current.append(_copy_with_text(sentence, clean_text))
+            else:
+                # 조항 매칭에 실패한 문장들은 기타사항으로 분류
+                non_article_sentences.append(sentence)
+
+    result = []
+    if preamble_sentences:
+        result.append(Article.model_construct(id="preamble", title="서문", sentences=preamble_sentences))
+    for clause_id, title, sentences in clauses:
+        result.append(Article.model_construct(id=clause_id, title=title, sentences=sentences))
+    if non_article_sentences:
+        result.append(Article.model_construct(id="non_article", title="기타 사항", sentences=non_article_sentences))
+    return result
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+REPLAY_TTL = float(os.getenv("ANALYZE_REPLAY_TTL", "300"))  # 5분
+REPLAY_SIZE = int(os.getenv("ANALYZE_REPLAY_SIZE", "128"))
+
+
+class IdempotencyConflict(Exception):
+    """같은 Idempotency-Key로 다른 내용의 요청이 들어온 경우"""
+
+
+def request_key(payload: Any, idempotency_key: Optional[str] = None) -> Tuple[str, str]:
+    """요청의 (키, 지문)을 만듭니다. 지문은 정규화한 payload의 SHA-256"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    if idempotency_key:
+        return f"idem:{idempotency_key}", fingerprint
+    return f"sha256:{fingerprint}", fingerprint
+
+
+class _Flight:
+    __slots__ = ("task", "fingerprint", "waiters")
+
+    def __init__(self, task: asyncio.Task, fingerprint: str):
+        self.task = task
+        self.fingerprint = fingerprint
+        self.waiters = 0
+
+
+class SingleFlight:
+    """동일한 진행 중 작업을 하나의 실행으로 합치고, 완료된 결과를 잠시 재사용합니다."""
+
+    def __init__(self, ttl: float = REPLAY_TTL, max_size: int = REPLAY_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._in_flight: Dict[str, _Flight] = {}
+        self._done: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self.executions = 0
+        self.coalesced = 0
+        self.replayed = 0
+        self.abandoned = 0
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]], fingerprint: str = "") -> Tuple[Any, str]:
+        """fn()을 실행하거나 진행 중/완료된 결과를 공유합니다. (결과, "executed"|"coalesced"|"replayed") 반환"""
+        cached = self._done.get(key)
+        if cached is not None:
+            expires_at, cached_fingerprint, result = cached
+            if expires_at > time.monotonic():
+                self._check(fingerprint, cached_fingerprint)
+                self._done.move_to_end(key)
+                self.replayed += 1
+                return result, "replayed"
+            del self._done[key]
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self._check(fingerprint, flight.fingerprint)
+            self.coalesced += 1
+            return await self._wait(key, flight), "coalesced"
+
+        # 첫 요청이 취소되어도 다른 대기자를 위해 작업은 계속 진행 (대기자가 모두 떠나면 취소)
+        flight = _Flight(asyncio.ensure_future(fn()), fingerprint)
+        self._in_flight[key] = flight
+        self.executions += 1
+        flight.task.add_done_callback(lambda t: self._finish(key, flight))
+        return await self._wait(key, flight), "executed"
+
+    async def _wait(self, key: str, flight: _Flight):
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # 결과를 받을 요청이 없으면 LLM 호출을 계속하지 않음 (취소된 작업은 재사용 대상도 아님)
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                flight.task.cancel()
+                self.abandoned += 1
+
+    @staticmethod
+    def _check(fingerprint: str, stored: str):
+        if fingerprint and stored and fingerprint != stored:
+            raise IdempotencyConflict("같은 Idempotency-Key로 다른 요청이 이미 처리되었습니다.")
+
+    def _finish(self, key: str, flight: _Flight):
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        task = flight.task
+        if task.cancelled() or task.exception() is not None:
+            # 실패/취소된 결과는 재사용하지 않음
+            return
+        self._done[key] = (time.monotonic() + self.ttl, flight.fingerprint, task.result())
+        self._done.move_to_end(key)
+        while len(self._done) > self.max_size:
+            self._done.popitem(last=False)
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "replay_entries": len(self._done),
+            "replay_ttl_seconds": self.ttl,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "replayed": self.replayed,
+            "abandoned": self.abandoned,
+        }
+
+
+# 전역 인스턴스 (계약서 분석용)
+analyze_flight = SingleFlight()
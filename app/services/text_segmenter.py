@@ -0,0 +1,151 @@
+import re
+from typing import Dict, Iterable, List, Optional, Union
+
+from app.schemas.contract.types import Article, Sentence
+from .segmenter import NON_ARTICLE_PATTERN
+
+# 줄 시작의 "제N조" / "제N조 (제목)" 헤딩 ("제3조에 따라", "제2조 제1항" 같은 인용은 제외)
+HEADING_PATTERN = re.compile(r'^제\s*(\d+)\s*조(?![에의와과를을은는이가및])(?!\s*제\s*\d+\s*항)(?:\s*\(([^)]+)\))?\s*')
+# 항/호 번호: ①, 1., 1), (1), 가.
+PARAGRAPH_MARKER_PATTERN = re.compile(r'^(?:[①-⑳]|\d{1,2}[.)](?!\d)|\(\d{1,2}\)|[가-하]\.)\s*')
+# 한국어 문장 경계: 한글/닫는 괄호 뒤의 종결부호 다음 공백
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[가-힣)\]"”’][.!?])\s+')
+SENTENCE_END_PATTERN = re.compile(r'[가-힣)\]"”’][.!?]$')
+# 문서 제목 줄 (예: "표준 근로계약서")
+TITLE_LINE_PATTERN = re.compile(r'^[가-힣\s]*계약서$')
+
+# 줄바꿈 없이 이어지는 텍스트가 이 길이를 넘으면 문장 단위로 먼저 내보냄
+MAX_PARAGRAPH_CHARS = 4000
+
+
+class TextSegmenter:
+    """추출된 텍스트를 조금씩 받아 Article/Sentence 로 나눕니다.
+
+    feed()는 완성된 조항(다음 조항 헤딩이 나온 조항)을 바로 반환하므로
+    추출이 끝나기 전에 분석을 시작할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._pending_line = ""
+        self._paragraph: List[str] = []
+        self._preamble = Article(id="preamble", title="서문", sentences=[])
+        self._non_article = Article(id="non_article", title="기타 사항", sentences=[])
+        self._current: Optional[Article] = None
+        self._clauses: List[Article] = []
+        self._clause_counts: Dict[int, int] = {}
+        self._preamble_emitted = False
+
+    @property
+    def articles(self) -> List[Article]:
+        """지금까지 만들어진 조항 목록 (서문 → 제N조 → 기타 사항 순서)"""
+        result = [self._preamble] if self._preamble.sentences else []
+        result += self._clauses
+        if self._non_article.sentences:
+            result.append(self._non_article)
+        return result
+
+    def feed(self, chunk: str) -> List[Article]:
+        """텍스트 조각을 추가하고, 완성된 조항들을 반환합니다."""
+        completed: List[Article] = []
+        lines = (self._pending_line + chunk).split("\n")
+        self._pending_line = lines.pop()
+        for line in lines:
+            self._process_line(line, completed)
+        return completed
+
+    def finish(self) -> List[Article]:
+        """남은 텍스트를 모두 처리하고 아직 반환하지 않은 조항들을 반환합니다."""
+        completed: List[Article] = []
+        if self._pending_line:
+            self._process_line(self._pending_line, completed)
+            self._pending_line = ""
+        self._flush_paragraph()
+        if not self._preamble_emitted and self._preamble.sentences:
+            completed.append(self._preamble)
+            self._preamble_emitted = True
+        if self._current is not None:
+            completed.append(self._current)
+            self._current = None
+        if self._non_article.sentences:
+            completed.append(self._non_article)
+        return completed
+
+    def _process_line(self, line: str, completed: List[Article]):
+        line = line.strip()
+        if not line:
+            self._flush_paragraph()
+            return
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            self._flush_paragraph()
+            if self._current is not None:
+                completed.append(self._current)
+            elif not self._preamble_emitted and self._preamble.sentences:
+                completed.append(self._preamble)
+            self._preamble_emitted = True
+
+            clause_num, clause_title = heading.group(1), heading.group(2)
+            title = f'제{clause_num}조 ({clause_title})' if clause_title else f'제{clause_num}조'
+            self._current = Article(id=self._article_id(int(clause_num)), title=title, sentences=[])
+            self._clauses.append(self._current)
+            line = line[heading.end():]
+            if not line:
+                return
+
+        # 제목, 서명란/날짜/당사자 표기는 앞뒤 줄과 합치지 않음
+        if TITLE_LINE_PATTERN.match(line) or NON_ARTICLE_PATTERN.search(line):
+            self._flush_paragraph()
+            self._add_sentence(line)
+            return
+
+        marker = PARAGRAPH_MARKER_PATTERN.match(line)
+        if marker:
+            self._flush_paragraph()
+            line = line[marker.end():]
+
+        self._paragraph.append(line)
+        # 긴 문단은 완성된 문장까지만 먼저 내보냄
+        if SENTENCE_END_PATTERN.search(line) and sum(len(p) for p in self._paragraph) > MAX_PARAGRAPH_CHARS:
+            self._flush_paragraph()
+
+    def _article_id(self, number: int) -> Union[int, str]:
+        """조항 id: 같은 번호가 다시 나오면(부칙의 번호 재시작 등) "3_2"처럼 순번을 붙여 문장 id가 겹치지 않게 함"""
+        count = self._clause_counts[number] = self._clause_counts.get(number, 0) + 1
+        return number if count == 1 else f"{number}_{count}"
+
+    def _flush_paragraph(self):
+        if not self._paragraph:
+            return
+        text = " ".join(self._paragraph)
+        self._paragraph = []
+        for sentence_text in split_sentences(text):
+            self._add_sentence(sentence_text)
+
+    def _add_sentence(self, text: str):
+        if NON_ARTICLE_PATTERN.search(text):
+            target = self._non_article
+            prefix = "n"
+        elif self._current is None:
+            target = self._preamble
+            prefix = "p"
+        else:
+            target = self._current
+            prefix = f"s{target.id}"
+        target.sentences.append(
+            Sentence.model_construct(id=f"{prefix}-{len(target.sentences) + 1}", text=text, risk="safe")
+        )
+
+
+def split_sentences(text: str) -> List[str]:
+    """한국어 문장 경계로 나눕니다."""
+    return [s.strip() for s in SENTENCE_BOUNDARY_PATTERN.split(text) if s.strip()]
+
+
+def segment_text(chunks: Iterable[str]) -> List[Article]:
+    """텍스트(또는 페이지 스트림) 전체를 한 번에 조항 목록으로 변환합니다."""
+    segmenter = TextSegmenter()
+    for chunk in chunks:
+        segmenter.feed(chunk)
+    segmenter.finish()
+    return segmenter.articles
@@ -0,0 +1,146 @@
+import os
+import sys
+import hmac
+import time
+import uuid
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# 관리자 토큰 (X-Profile 헤더에 같은 값을 보내면 그 요청만 샘플링 프로파일)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# 보관할 프로파일 파일 수 (넘으면 오래된 것부터 삭제)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+
+# 대기 중인 스레드(이벤트 루프 select, 빈 워커)는 프로파일에서 제외
+_IDLE_FRAMES = {("selectors.py", "select"), ("threading.py", "wait"), ("thread.py", "_worker")}
+
+
+class Trace:
+    """요청 하나의 단계별 누적 시간"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}  # 이름 → [누적 초, 횟수]
+
+    def add(self, name: str, elapsed: float):
+        span = self.spans.get(name)
+        if span is None:
+            self.spans[name] = [elapsed, 1]
+        else:
+            span[0] += elapsed
+            span[1] += 1
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (동시 실행된 단계는 합계라 전체 시간보다 클 수 있음)"""
+        parts = [
+            f'{name};dur={total * 1000:.1f};desc="x{count}"' if count > 1 else f"{name};dur={total * 1000:.1f}"
+            for name, (total, count) in self.spans.items()
+        ]
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+def start() -> Trace:
+    trace = Trace()
+    _current.set(trace)
+    return trace
+
+
+def record(name: str, elapsed: float):
+    """현재 요청의 트레이스에 단계 시간을 더합니다. (요청 밖이면 무시)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, elapsed)
+
+
+def profiling_allowed(token: Optional[str]) -> bool:
+    return bool(ADMIN_TOKEN) and bool(token) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+class SamplingProfiler:
+    """모든 스레드의 스택을 주기적으로 샘플링해 folded stack 형식으로 모읍니다.
+
+    결과는 flamegraph.pl / speedscope 에서 바로 열 수 있습니다.
+    이벤트 루프를 함께 쓰는 다른 요청의 스택도 섞일 수 있습니다.
+    """
+
+    _lock = threading.Lock()  # 동시에 하나의 프로파일만
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        if not self._lock.acquire(blocking=False):
+            return False
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> str:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._lock.release()
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, "thread"))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def save_profile(folded: str) -> str:
+    """프로파일을 PROFILE_DIR에 저장하고 id를 반환"""
+    profile_id = uuid.uuid4().hex
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(PROFILE_DIR, f"{profile_id}.folded"), "w", encoding="utf-8") as f:
+        f.write(folded)
+    _prune_profiles(PROFILE_MAX_FILES)
+    return profile_id
+
+
+def _prune_profiles(keep: int):
+    """가장 최근 keep개만 남기고 오래된 프로파일 삭제 (디스크 사용량 상한)"""
+    with os.scandir(PROFILE_DIR) as entries:
+        profiles = [(e.stat().st_mtime, e.path) for e in entries if e.name.endswith(".folded") and e.is_file()]
+    if len(profiles) <= keep:
+        return
+    profiles.sort()
+    for _, path in profiles[:len(profiles) - keep]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # 동시에 저장한 다른 요청이 이미 삭제
+
+
+def load_profile(profile_id: str) -> Optional[str]:
+    if not profile_id.isalnum():
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.folded")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
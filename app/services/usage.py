@@ -0,0 +1,168 @@
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+def _parse_prices(raw: str) -> Dict[str, tuple]:
+    # "모델=입력단가/출력단가" (100만 토큰당 USD)
+    prices = {}
+    for part in raw.split(","):
+        model, _, value = part.partition("=")
+        prompt, _, completion = value.partition("/")
+        if model.strip() and prompt.strip():
+            prices[model.strip()] = (float(prompt), float(completion or prompt))
+    return prices
+
+
+# 요청 하나가 쓸 수 있는 토큰 수 (0이면 제한 없음)
+ANALYZE_TOKEN_BUDGET = int(os.getenv("ANALYZE_TOKEN_BUDGET", "0"))
+CHAT_TOKEN_BUDGET = int(os.getenv("CHAT_TOKEN_BUDGET", "0"))
+PRICES = _parse_prices(os.getenv("LLM_PRICES", "gpt-4o-mini=0.15/0.6,gpt-4o=2.5/10"))
+TASK_HISTORY_SIZE = int(os.getenv("USAGE_TASK_HISTORY", "256"))
+
+
+class BudgetExceeded(Exception):
+    """요청의 토큰 예산을 다 쓴 경우 (LLM 호출 전에 발생)"""
+
+
+def _empty() -> dict:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "cost_usd": 0.0}
+
+
+def _add(totals: dict, other: dict):
+    for key in totals:
+        totals[key] += other[key]
+
+
+def _call_totals(model: str, usage: dict) -> dict:
+    """응답 usage 블록 → 호출 1건의 토큰/비용"""
+    prompt_tokens = usage.get("prompt_tokens") or 0
+    completion_tokens = usage.get("completion_tokens") or 0
+    prompt_price, completion_price = PRICES.get(model, (0.0, 0.0))
+    return {
+        "calls": 1,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0,
+        "cost_usd": (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000,
+    }
+
+
+class UsageTracker:
+    """요청 하나의 LLM 토큰 사용량과 예산"""
+
+    def __init__(self, endpoint: str, budget: int = 0):
+        self.endpoint = endpoint
+        self.budget = budget
+        self.task_id: Optional[str] = None
+        self.totals = _empty()
+        self.reserved = 0
+        self.rejected_calls = 0
+        self.degraded_sentences = 0
+
+    @property
+    def used(self) -> int:
+        return self.totals["prompt_tokens"] + self.totals["completion_tokens"]
+
+    def reserve(self, estimated: int):
+        """호출 전 추정 토큰만큼 예산을 잡아둡니다. (동시 호출이 예산을 함께 넘지 않도록)"""
+        if self.budget and self.used + self.reserved + estimated > self.budget:
+            self.rejected_calls += 1
+            raise BudgetExceeded(f"토큰 예산({self.budget})을 초과했습니다.")
+        self.reserved += estimated
+
+    def release(self, estimated: int):
+        self.reserved -= estimated
+
+    def add(self, call: dict):
+        _add(self.totals, call)
+
+    def summary(self) -> dict:
+        return {
+            **self.totals,
+            "cost_usd": round(self.totals["cost_usd"], 6),
+            "total_tokens": self.used,
+            "budget": self.budget or None,
+            "degraded_sentences": self.degraded_sentences,
+        }
+
+
+class UsageLedger:
+    """엔드포인트/task_id/모델별 누적 사용량"""
+
+    def __init__(self):
+        self.requests: Dict[str, int] = {}
+        self.endpoints: Dict[str, dict] = {}
+        self.models: Dict[str, dict] = {}
+        self.tasks: "OrderedDict[str, dict]" = OrderedDict()
+        self.degraded_requests = 0
+
+    def record_call(self, model: str, call: dict):
+        _add(self.models.setdefault(model, _empty()), call)
+
+    def finish(self, tracker: UsageTracker):
+        self.requests[tracker.endpoint] = self.requests.get(tracker.endpoint, 0) + 1
+        _add(self.endpoints.setdefault(tracker.endpoint, _empty()), tracker.totals)
+        if tracker.degraded_sentences:
+            self.degraded_requests += 1
+        if tracker.task_id:
+            self.tasks[tracker.task_id] = {"endpoint": tracker.endpoint, **tracker.summary()}
+            while len(self.tasks) > TASK_HISTORY_SIZE:
+                self.tasks.popitem(last=False)
+
+    def task(self, task_id: str) -> Optional[dict]:
+        return self.tasks.get(task_id)
+
+    def snapshot(self) -> dict:
+        endpoints = {}
+        for name, totals in self.endpoints.items():
+            n = self.requests.get(name) or 1
+            endpoints[name] = {
+                "requests": self.requests.get(name, 0),
+                **totals,
+                "cost_usd": round(totals["cost_usd"], 6),
+                "avg_tokens_per_request": round((totals["prompt_tokens"] + totals["completion_tokens"]) / n, 1),
+            }
+        return {
+            "budgets": {"analyze": ANALYZE_TOKEN_BUDGET or None, "chat": CHAT_TOKEN_BUDGET or None},
+            "endpoints": endpoints,
+            "models": {name: {**t, "cost_usd": round(t["cost_usd"], 6)} for name, t in self.models.items()},
+            "degraded_requests": self.degraded_requests,
+            "recent_tasks": len(self.tasks),
+        }
+
+
+_current: ContextVar[Optional[UsageTracker]] = ContextVar("llm_usage", default=None)
+
+
+def current() -> Optional[UsageTracker]:
+    return _current.get()
+
+
+@contextmanager
+def track(endpoint: str, budget: int = 0):
+    """with 블록 안의 (자식 태스크 포함) LLM 호출 사용량을 하나의 요청으로 집계합니다."""
+    tracker = UsageTracker(endpoint, budget)
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+        usage_ledger.finish(tracker)
+
+
+def record(model: str, usage: Optional[dict]):
+    """chat_completion 응답의 usage 블록을 현재 요청과 전체 통계에 반영합니다."""
+    if not usage:
+        return
+    call = _call_totals(model, usage)
+    usage_ledger.record_call(model, call)
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.add(call)
+
+
+# 전역 인스턴스
+usage_ledger = UsageLedger()
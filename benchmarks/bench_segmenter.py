@@ -0,0 +1,256 @@
+"""
+조항 그룹화(segmenter) 벤치마크
+사용법: python -m benchmarks.bench_segmenter [--clauses 1000 2000 4000] [--repeat 5]
+
+합성 계약서(조항 수 N)에 대해 기존 group_articles_by_clause 구현과
+app.services.segmenter.segment_clauses 의 처리 시간을 비교하고,
+두 구현의 결과가 동일한지 확인합니다.
+"""
+
+import argparse
+import re
+import time
+
+from app.schemas.contract.types import Article, Sentence
+from app.services.segmenter import segment_clauses
+
+
+def make_document(n_clauses: int, sentences_per_clause: int = 4):
+    """프론트엔드가 보내는 형태(한 조항 = 여러 문장)의 합성 계약서를 만듭니다."""
+    sentences = [
+        Sentence(id="s0-0", text="근로계약서", risk="safe"),
+        Sentence(id="s0-1", text="본 계약은 주식회사 체키와 홍길동 간의 근로조건을 정하기 위하여 다음과 같이 체결한다.", risk="safe"),
+    ]
+    for i in range(1, n_clauses + 1):
+        sentences.append(Sentence(id=f"s{i}-0", text=f"제{i}조 (근로조건 {i}) 1 근로시간은 1일 8시간으로 한다.", risk="safe"))
+        for j in range(1, sentences_per_clause):
+            sentences.append(Sentence(
+                id=f"s{i}-{j}",
+                text=f"{j + 1} 사용자는 근로자에게 (수당 {j}) {j} 연장근로에 대한 가산임금을 지급한다.",
+                risk="safe",
+            ))
+    sentences += [
+        Sentence(id="s-end-0", text="본 계약의 효력을 증명하기 위하여 계약 당사자가 서명 또는 날인한다.", risk="safe"),
+        Sentence(id="s-end-1", text="2025년 1월 1일", risk="safe"),
+        Sentence(id="s-end-2", text="근로자: 홍길동 (인)", risk="safe"),
+    ]
+    return [Article(id=1, title="본문", sentences=sentences)]
+
+
+# ---------------------------------------------------------------------------
+# 기준선: 기존 app/routers/contract/analyze.py 구현 (비교용으로 그대로 보관)
+# ---------------------------------------------------------------------------
+
+def _legacy_is_non_article_sentence(text):
+    """조항이 아닌 문장인지 판단하는 함수"""
+    # 먼저 조항인지 확인 (제N조 패턴이 있으면 조항으로 간주)
+    if re.search(r'제\s*(\d+)\s*조', text):
+        return False
+    
+    non_article_patterns = [
+        r'본 계약의 효력을 증명하기 위하여',
+        r'계약 당사자가 서명 또는 날인한다',
+        r'^\d{4}년 \d{1,2}월 \d{1,2}일',  # 문장 시작에 날짜만 있는 경우
+        r'사용자\(대표자\)',
+        r'근로자:',
+        r'임대인:',
+        r'임차인:',
+        r'매도인:',
+        r'매수인:',
+    ]
+    
+    for pattern in non_article_patterns:
+        if re.search(pattern, text):
+            return True
+    return False
+
+def _legacy_is_preamble_sentence(text):
+    """서문 문장인지 판단하는 함수"""
+    preamble_patterns = [
+        r'본 계약은.*간의.*체결한다',
+        r'본 계약은.*간의.*다음과 같이',
+        r'본 계약서는.*간의.*체결한다',
+        r'본 계약서는.*간의.*다음과 같이',
+        r'^근로계약서$',
+        r'^임대차계약서$',
+        r'^매매계약서$',
+        r'^도급계약서$',
+        r'^용역계약서$',
+    ]
+    
+    for pattern in preamble_patterns:
+        if re.search(pattern, text):
+            return True
+    return False
+
+def legacy_group_articles_by_clause(articles):
+    """조항별로 그룹화하는 함수 - 문장 안에서 '제N조' 패턴 찾기"""
+    grouped = {}
+    current_clause = None
+    current_sentences = []
+    non_article_sentences = []  # 조항이 아닌 문장들
+    preamble_sentences = []  # 서문 문장들
+    
+    for article in articles:
+        for sentence in article.sentences:
+            # 서문 문장인지 먼저 확인
+            if _legacy_is_preamble_sentence(sentence.text):
+                preamble_sentences.append(sentence)
+                continue
+            
+            # 조항이 아닌 문장인지 확인
+            if _legacy_is_non_article_sentence(sentence.text):
+                # 조항이 아닌 문장은 별도로 저장 (숫자 제거하지 않음)
+                non_article_sentences.append(sentence)
+                continue
+            
+            # 문장 안에서 "제n조" 패턴 찾기 (괄호 있음/없음 모두 처리)
+            clause_match = re.search(r'제\s*(\d+)\s*조(?:\s*\([^)]+\))?', sentence.text)
+            
+            if clause_match:
+                # 새로운 조항이 시작됨
+                if current_clause and current_sentences:
+                    # 이전 조항 저장 (제목은 이미 생성됨)
+                    grouped[current_clause] = {
+                        'title': grouped[current_clause]['title'],
+                        'sentences': current_sentences.copy()
+                    }
+                
+                # 새 조항 시작
+                clause_num = clause_match.group(1)
+                
+                # 제목 생성 (괄호 내용이 있으면 포함)
+                full_match = clause_match.group(0)  # 전체 매칭된 문자열
+                title = f'제{clause_num}조'
+                
+                # 괄호 내용이 있으면 제목에 포함
+                if '(' in full_match and ')' in full_match:
+                    # 괄호 내용 추출
+                    paren_match = re.search(r'\(([^)]+)\)', full_match)
+                    if paren_match:
+                        title = f'제{clause_num}조 ({paren_match.group(1)})'
+                
+                current_clause = clause_num
+                current_sentences = []
+                
+                # 제목을 저장 (나중에 사용하기 위해)
+                grouped[clause_num] = {
+                    'title': title,
+                    'sentences': []
+                }
+                
+                # 문장에서 "제n조" 부분을 제거하고 실제 내용만 추출
+                clean_text = re.sub(r'제\s*\d+\s*조(?:\s*\([^)]+\))?\s*', '', sentence.text).strip()
+                
+                # 문장 시작의 불필요한 숫자 제거 (예: "1 근로시간은..." → "근로시간은...")
+                clean_text = re.sub(r'^\s*\d+\s*', '', clean_text).strip()
+                
+                if clean_text:
+                    sentence_obj = Sentence(
+                        id=sentence.id,
+                        text=clean_text,
+                        risk=sentence.risk,
+                        why=sentence.why,
+                        fix=sentence.fix
+                    )
+                    current_sentences.append(sentence_obj)
+                    grouped[clause_num]['sentences'].append(sentence_obj)
+            else:
+                # 조항 내 문장들
+                if current_clause:
+                    # 현재 조항에 속하는 문장
+                    clean_text = sentence.text.strip()
+                    
+                    # 괄호 내용 뒤의 불필요한 숫자 제거 (예: "(근로시간 및 휴게시간) 1" → "(근로시간 및 휴게시간)")
+                    clean_text = re.sub(r'(\([^)]+\))\s*\d+\s*', r'\1', clean_text).strip()
+                    
+                    # 문장 시작의 불필요한 숫자 제거 (예: "1 근로시간은..." → "근로시간은...")
+                    clean_text = re.sub(r'^\s*\d+\s*', '', clean_text).strip()
+                    
+                    if clean_text:
+                        sentence_obj = Sentence(
+                            id=sentence.id,
+                            text=clean_text,
+                            risk=sentence.risk,
+                            why=sentence.why,
+                            fix=sentence.fix
+                        )
+                        current_sentences.append(sentence_obj)
+                        grouped[current_clause]['sentences'].append(sentence_obj)
+                else:
+                    # 조항 매칭에 실패한 문장들은 기타사항으로 분류
+                    non_article_sentences.append(sentence)
+    
+    # 마지막 조항 저장
+    if current_clause and current_sentences:
+        grouped[current_clause] = {
+            'title': grouped[current_clause]['title'],
+            'sentences': current_sentences.copy()
+        }
+    
+    # Article 객체로 변환
+    result = []
+    
+    # 서문이 있으면 맨 앞에 추가
+    if preamble_sentences:
+        result.append(Article(
+            id="preamble",
+            title="서문",
+            sentences=preamble_sentences
+        ))
+    
+    # 조항들을 순서대로 추가
+    for clause_num, data in grouped.items():
+        result.append(Article(
+            id=int(clause_num),
+            title=data['title'],
+            sentences=data['sentences']
+        ))
+    
+    # 조항이 아닌 문장들을 별도 Article로 추가
+    if non_article_sentences:
+        result.append(Article(
+            id="non_article",
+            title="기타 사항",
+            sentences=non_article_sentences
+        ))
+    
+    return result
+
+
+# ---------------------------------------------------------------------------
+
+
+def _dump(articles):
+    return [a.model_dump() for a in articles]
+
+
+def _best_of(fn, articles, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(articles)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조항 그룹화 벤치마크")
+    parser.add_argument("--clauses", type=int, nargs="+", default=[1000, 2000, 4000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'clauses':>8} {'sentences':>10} {'legacy(ms)':>11} {'segmenter(ms)':>14} {'speedup':>8} {'us/sentence':>12}")
+    for n in args.clauses:
+        doc = make_document(n)
+        n_sentences = sum(len(a.sentences) for a in doc)
+        assert _dump(legacy_group_articles_by_clause(doc)) == _dump(segment_clauses(doc)), "결과 불일치"
+
+        legacy = _best_of(legacy_group_articles_by_clause, doc, args.repeat)
+        new = _best_of(segment_clauses, doc, args.repeat)
+        print(f"{n:>8} {n_sentences:>10} {legacy * 1000:>11.1f} {new * 1000:>14.1f} "
+              f"{legacy / new:>7.1f}x {new / n_sentences * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
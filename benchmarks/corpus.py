@@ -0,0 +1,474 @@
+"""
+합성 한국어 계약서 생성기와 파일 픽스처
+사용법: python -m benchmarks.corpus --out corpus [--kinds 근로 임대차 용역] [--clauses 10 50 200]
+        [--duplicate-ratio 0.2] [--formats txt docx doc pdf hwp] [--seed 42]
+
+근로/임대차/용역 템플릿으로 제목, 전문, 제N조 조항, 서명란을 갖춘 계약서를 만들고
+TXT/DOCX/PDF/HWP 파일로 저장합니다. (외부 라이브러리 없이 직접 작성)
+--duplicate-ratio 는 조항 문장 중 앞에서 나온 문장을 그대로 반복하는 비율입니다.
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import zipfile
+import zlib
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+TEMPLATES = {
+    "근로": {
+        "title": "근로계약서",
+        "preamble": "본 계약은 주식회사 체키(이하 \"사용자\")와 {name}(이하 \"근로자\") 간의 근로조건을 정하기 위하여 다음과 같이 체결한다.",
+        "clauses": [
+            ("근로계약기간", ["근로계약기간은 {year}년 {month}월 1일부터 {year}년 12월 31일까지로 한다.",
+                         "수습기간은 입사일로부터 {n}개월로 한다."]),
+            ("근무장소 및 업무", ["근무장소는 서울특별시 강남구 소재 본사로 한다.",
+                            "업무내용은 소프트웨어 개발 및 유지보수로 한다."]),
+            ("근로시간", ["근로시간은 1일 8시간, 1주 40시간으로 한다.",
+                      "휴게시간은 12시부터 13시까지 1시간으로 한다."]),
+            ("임금", ["월 기본급은 {amount}원으로 한다.",
+                    "임금은 매월 {day}일에 근로자 명의의 계좌로 지급한다.",
+                    "연장근로에 대하여는 통상임금의 50%를 가산하여 지급한다."]),
+            ("휴일 및 휴가", ["주휴일은 매주 일요일로 한다.",
+                         "연차유급휴가는 근로기준법에서 정하는 바에 따른다."]),
+            ("계약해지", ["회사는 필요 시 예고 없이 즉시 해고할 수 있다.",
+                      "근로자는 퇴직 {n}개월 전에 회사에 서면으로 통보하여야 한다."]),
+            ("비밀유지", ["근로자는 업무상 알게 된 회사의 비밀을 누설하여서는 아니 된다.",
+                      "근로자는 퇴직 후 {n}년간 동종 업계에 취업할 수 없다."]),
+            ("손해배상", ["근로자의 귀책사유로 발생한 모든 손해는 근로자가 전적으로 부담한다."]),
+        ],
+        "signature": ["본 계약의 효력을 증명하기 위하여 계약 당사자가 서명 또는 날인한다.",
+                      "{year}년 {month}월 {day}일",
+                      "사용자(대표자): 주식회사 체키 대표이사 김대표 (인)",
+                      "근로자: {name} (인)"],
+    },
+    "임대차": {
+        "title": "주택 임대차계약서",
+        "preamble": "본 계약은 임대인 {name}과 임차인 이세입 간의 아래 주택에 관한 임대차를 위하여 다음과 같이 체결한다.",
+        "clauses": [
+            ("목적물", ["임대할 부분은 서울특별시 마포구 소재 아파트 {n}층 전부로 한다."]),
+            ("보증금 및 차임", ["보증금은 금 {amount}원으로 한다.",
+                           "차임은 매월 {day}일에 임대인의 계좌로 지급한다."]),
+            ("존속기간", ["임대차 기간은 인도일로부터 {n}년으로 한다."]),
+            ("용도변경 및 전대", ["임차인은 임대인의 동의 없이 용도를 변경하거나 전대할 수 없다."]),
+            ("계약의 해지", ["임차인이 차임을 2기 이상 연체한 경우 임대인은 예고 없이 계약을 해지할 수 있다.",
+                          "임대인은 서면 통지 의무 없이 계약을 해지할 수 있다."]),
+            ("원상회복", ["임대차가 종료한 경우 임차인은 목적물을 원상으로 회복하여 반환한다.",
+                      "목적물의 하자로 발생한 모든 손해는 임차인이 전적으로 부담한다."]),
+            ("중개보수", ["중개보수는 거래가액의 {n}%로 하며 임대인과 임차인이 각각 부담한다."]),
+        ],
+        "signature": ["본 계약을 증명하기 위하여 계약 당사자가 이의 없음을 확인하고 각각 서명 또는 날인한다.",
+                      "{year}년 {month}월 {day}일",
+                      "임대인: {name} (인)",
+                      "임차인: 이세입 (인)"],
+    },
+    "용역": {
+        "title": "용역계약서",
+        "preamble": "본 계약서는 주식회사 체키(이하 \"발주자\")와 {name}(이하 \"수급자\") 간의 용역 수행에 관하여 다음과 같이 체결한다.",
+        "clauses": [
+            ("목적", ["본 계약은 발주자가 의뢰한 모바일 앱 개발 용역의 수행 조건을 정함을 목적으로 한다."]),
+            ("용역기간", ["용역기간은 계약일로부터 {n}개월로 한다."]),
+            ("용역대금", ["용역대금은 금 {amount}원(부가가치세 별도)으로 한다.",
+                      "대금은 검수 완료 후 {day}일 이내에 지급한다."]),
+            ("검수", ["수급자는 결과물을 납품하고 발주자는 {n}일 이내에 검수한다."]),
+            ("지식재산권", ["결과물에 대한 모든 권리는 발주자에게 귀속된다."]),
+            ("경업금지", ["수급자는 계약 종료 후 {n}년간 경업 금지 의무를 진다."]),
+            ("계약해제", ["발주자는 필요 시 예고 없이 계약을 해제할 수 있다."]),
+            ("손해배상", ["수급자의 과실로 발생한 모든 손해는 수급자가 전적으로 부담한다."]),
+        ],
+        "signature": ["위 계약 내용을 증명하기 위하여 계약서 2부를 작성하여 각 1부씩 보관한다.",
+                      "{year}년 {month}월 {day}일",
+                      "발주자: 주식회사 체키 대표이사 김대표 (인)",
+                      "수급자: {name} (인)"],
+    },
+}
+NAMES = ["홍길동", "김철수", "이영희", "박민수", "최지은", "정하늘"]
+
+
+def generate_contract(
+    kind: str = "근로",
+    n_clauses: int = 20,
+    duplicate_ratio: float = 0.0,
+    seed: int = 0,
+    nonce: str = "",
+) -> dict:
+    """{"title", "preamble", "clauses": [(제목, [문장...])], "signature"} 형식의 합성 계약서
+
+    템플릿 조항을 순환하며 숫자(기간/금액/날짜)를 바꿔 n_clauses 개를 채우고,
+    조항 문장의 duplicate_ratio 비율은 앞에서 나온 문장을 그대로 반복합니다.
+    """
+    template = TEMPLATES[kind]
+    rng = random.Random(seed)
+    fields = {
+        "name": rng.choice(NAMES),
+        "year": rng.randint(2024, 2026),
+        "month": rng.randint(1, 12),
+        "day": rng.randint(1, 28),
+    }
+
+    def fill(text: str) -> str:
+        return text.format(n=rng.randint(1, 5), amount=f"{rng.randint(20, 900) * 100000:,}", **fields)
+
+    clauses = []
+    seen: List[str] = []
+    pool = template["clauses"]
+    for i in range(n_clauses):
+        title, bodies = pool[i % len(pool)]
+        if i >= len(pool):
+            title = f"{title} {i // len(pool) + 1}"
+        sentences = []
+        for body in bodies:
+            if seen and rng.random() < duplicate_ratio:
+                sentences.append(rng.choice(seen))
+            else:
+                sentences.append(fill(body))
+                seen.append(sentences[-1])
+        clauses.append((title, sentences))
+
+    return {
+        "title": template["title"],
+        "preamble": [fill(template["preamble"]) + nonce],
+        "clauses": clauses,
+        "signature": [fill(line) for line in template["signature"]],
+    }
+
+
+def contract_lines(contract: dict) -> List[str]:
+    """문서 파일 본문 줄 ("제N조 (제목)" 다음에 번호 매긴 문장)"""
+    lines = [contract["title"], *contract["preamble"]]
+    for number, (title, sentences) in enumerate(contract["clauses"], 1):
+        lines.append(f"제{number}조 ({title})")
+        lines.extend(f"{j}. {s}" for j, s in enumerate(sentences, 1))
+    lines.extend(contract["signature"])
+    return lines
+
+
+def contract_articles(contract: dict) -> List[dict]:
+    """/contract/analyze 요청 형식 (조항 첫 문장에 "제N조 (제목)" 포함)"""
+    head = [contract["title"], *contract["preamble"]]
+    articles = [{
+        "id": 0,
+        "title": "전문",
+        "sentences": [{"id": f"p-{j}", "text": t, "risk": "safe"} for j, t in enumerate(head)],
+    }]
+    for number, (title, sentences) in enumerate(contract["clauses"], 1):
+        heading = f"제{number}조 ({title})"
+        articles.append({
+            "id": number,
+            "title": heading,
+            "sentences": [
+                {"id": f"s{number}-{j}", "text": f"{heading} {s}" if j == 0 else s, "risk": "safe"}
+                for j, s in enumerate(sentences)
+            ],
+        })
+    articles[-1]["sentences"] += [
+        {"id": f"e-{j}", "text": t, "risk": "safe"} for j, t in enumerate(contract["signature"])
+    ]
+    return articles
+
+
+def make_articles(n_clauses: int, nonce: str = "", kind: str = "근로", duplicate_ratio: float = 0.0, seed: int = 0) -> List[dict]:
+    return contract_articles(generate_contract(kind, n_clauses, duplicate_ratio, seed, nonce))
+
+
+def write_txt(path: str, lines: List[str]):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_docx(path: str, lines: List[str]):
+    """문단만 있는 최소 DOCX"""
+    body = "".join(f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>" for line in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", content_types)
+        z.writestr("_rels/.rels", rels)
+        z.writestr("word/document.xml", document)
+
+
+def write_pdf(path: str, lines: List[str], lines_per_page: int = 50):
+    """한글 텍스트 PDF (임베딩 없는 CID 글꼴 HYSMyeongJo + UniKS-UCS2-H, 텍스트 추출 가능)"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    n = len(pages)
+    # 1: Catalog, 2: Pages, 3: Type0 글꼴, 4: CID 글꼴, 5..: (Page, Contents) 쌍
+    kids = " ".join(f"{5 + 2 * i} 0 R" for i in range(n))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>",
+        "<< /Type /Font /Subtype /Type0 /BaseFont /HYSMyeongJo-Medium /Encoding /UniKS-UCS2-H /DescendantFonts [4 0 R] >>",
+        "<< /Type /Font /Subtype /CIDFontType0 /BaseFont /HYSMyeongJo-Medium "
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (Korea1) /Supplement 1 >> >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        shown = " ".join(f"<{line.encode('utf-16-be').hex().upper()}> Tj T*" for line in page_lines)
+        content = f"BT /F1 10 Tf 14 TL 40 800 Td {shown} ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {6 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+# ---------------------------------------------------------------------------
+# HWP 5.0: OLE 복합 문서(CFB) 안에 FileHeader, DocInfo, BodyText/Section0(압축 레코드), PrvText
+# ---------------------------------------------------------------------------
+
+_SECTOR, _MINI_SECTOR, _MINI_CUTOFF = 512, 64, 4096
+_FREE, _END, _FAT_SECT, _NOSTREAM = 0xFFFFFFFF, 0xFFFFFFFE, 0xFFFFFFFD, 0xFFFFFFFF
+_HWPTAG_PARA_HEADER, _HWPTAG_PARA_TEXT = 0x10 + 50, 0x10 + 51
+
+
+def _hwp_record(tag: int, level: int, data: bytes) -> bytes:
+    size = len(data)
+    if size >= 0xFFF:
+        return struct.pack("<II", tag | (level << 10) | (0xFFF << 20), size) + data
+    return struct.pack("<I", tag | (level << 10) | (size << 20)) + data
+
+
+def _hwp_section(lines: List[str]) -> bytes:
+    """문단마다 PARA_HEADER + PARA_TEXT(UTF-16LE, 문단 끝 0x0D) 레코드"""
+    records = []
+    for line in lines:
+        text = (line + "\r").encode("utf-16-le")
+        header = struct.pack("<IIHBBHHHI", len(line) + 1, 0, 0, 0, 0, 1, 0, 1, 0)
+        records.append(_hwp_record(_HWPTAG_PARA_HEADER, 0, header))
+        records.append(_hwp_record(_HWPTAG_PARA_TEXT, 1, text))
+    return b"".join(records)
+
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)  # HWP는 헤더 없는 raw deflate
+    return compressor.compress(data) + compressor.flush()
+
+
+def _cfb(entries: List[tuple]) -> bytes:
+    """OLE 복합 문서 (v3, 512바이트 섹터).
+
+    entries: (경로, 데이터) - 데이터가 None이면 스토리지. 부모 스토리지가 먼저 와야 합니다.
+    4096바이트 미만 스트림은 미니 스트림에 저장합니다.
+    """
+    # 디렉터리 항목: [이름, 종류, 데이터, 자식 목록]
+    nodes = [["Root Entry", 5, b"", []]]
+    index = {"": 0}
+    for path, data in entries:
+        parent, _, name = path.rpartition("/")
+        index[path] = len(nodes)
+        nodes[index[parent]][3].append(len(nodes))
+        nodes.append([name, 1 if data is None else 2, data or b"", []])
+
+    sectors: List[bytes] = []
+    fat: List[int] = []
+
+    def allocate(data: bytes, marker: Optional[int] = None) -> int:
+        if not data:
+            return _END
+        start = len(sectors)
+        count = (len(data) + _SECTOR - 1) // _SECTOR
+        for i in range(count):
+            sectors.append(data[i * _SECTOR:(i + 1) * _SECTOR].ljust(_SECTOR, b"\0"))
+            fat.append(marker if marker is not None else (start + i + 1 if i < count - 1 else _END))
+        return start
+
+    mini_stream, mini_fat, starts = bytearray(), [], {}
+    for i, (name, kind, data, _) in enumerate(nodes):
+        if kind != 2:
+            continue
+        if len(data) < _MINI_CUTOFF:
+            first = len(mini_stream) // _MINI_SECTOR
+            count = (len(data) + _MINI_SECTOR - 1) // _MINI_SECTOR
+            mini_fat += [first + j + 1 if j < count - 1 else _END for j in range(count)]
+            mini_stream += data.ljust(count * _MINI_SECTOR, b"\0")
+            starts[i] = first if data else _END
+        else:
+            starts[i] = allocate(data)
+    starts[0] = allocate(bytes(mini_stream))
+    mini_fat_start = allocate(b"".join(struct.pack("<I", v) for v in mini_fat))
+    mini_fat_sectors = (len(mini_fat) * 4 + _SECTOR - 1) // _SECTOR
+
+    # 형제 트리: 이름 길이 → 대문자 순으로 정렬해 오른쪽 형제로 연결 (모두 검은색)
+    right, child = {}, {}
+    for i, node in enumerate(nodes):
+        ordered = sorted(node[3], key=lambda c: (len(nodes[c][0]), nodes[c][0].upper()))
+        if ordered:
+            child[i] = ordered[0]
+        for a, b in zip(ordered, ordered[1:]):
+            right[a] = b
+    directory = bytearray()
+    for i, (name, kind, data, _) in enumerate(nodes):
+        encoded = name.encode("utf-16-le") + b"\0\0"
+        directory += encoded.ljust(64, b"\0")
+        directory += struct.pack("<HBB", len(encoded), kind, 1)
+        directory += struct.pack("<III", _NOSTREAM, right.get(i, _NOSTREAM), child.get(i, _NOSTREAM))
+        directory += b"\0" * 16 + b"\0" * 4 + b"\0" * 16
+        size = len(mini_stream) if i == 0 else len(data)
+        directory += struct.pack("<IQ", starts.get(i, _END) if kind != 1 else 0, size)
+    while len(directory) % _SECTOR:
+        directory += (b"\0" * 64 + struct.pack("<HBB", 0, 0, 0) + struct.pack("<III", _NOSTREAM, _NOSTREAM, _NOSTREAM)).ljust(128, b"\0")
+    dir_start = allocate(bytes(directory))
+
+    # FAT 섹터 수: (데이터 섹터 + FAT 섹터) 를 모두 담을 수 있을 만큼
+    n_fat = 1
+    while (len(sectors) + n_fat) > n_fat * (_SECTOR // 4):
+        n_fat += 1
+    if n_fat > 109:
+        raise ValueError("문서가 너무 큽니다 (DIFAT 미지원)")
+    fat_start = len(sectors)
+    fat += [_FAT_SECT] * n_fat
+    fat += [_FREE] * (n_fat * (_SECTOR // 4) - len(fat))
+    fat_bytes = b"".join(struct.pack("<I", v) for v in fat)
+    for i in range(n_fat):
+        sectors.append(fat_bytes[i * _SECTOR:(i + 1) * _SECTOR])
+
+    difat = [fat_start + i for i in range(n_fat)] + [_FREE] * (109 - n_fat)
+    header = bytes.fromhex("D0CF11E0A1B11AE1") + b"\0" * 16
+    header += struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + b"\0" * 6
+    header += struct.pack("<IIIIIIIII", 0, n_fat, dir_start, 0, _MINI_CUTOFF,
+                          mini_fat_start, mini_fat_sectors, _END, 0)
+    header += b"".join(struct.pack("<I", v) for v in difat)
+    return header + b"".join(sectors)
+
+
+def write_hwp(path: str, lines: List[str]):
+    """본문이 압축된 HWP 5.0 문서 (Section0 하나)"""
+    signature = b"HWP Document File".ljust(32, b"\0")
+    file_header = (signature + struct.pack("<II", 0x05000300, 0x1)).ljust(256, b"\0")  # 속성 bit0: 압축
+    preview = "\r\n".join(lines)[:1024].encode("utf-16-le")
+    data = _cfb([
+        ("FileHeader", file_header),
+        ("DocInfo", _deflate(b"")),
+        ("BodyText", None),
+        ("BodyText/Section0", _deflate(_hwp_section(lines))),
+        ("PrvText", preview),
+    ])
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_doc(path: str, lines: List[str]):
+    """Word 97-2003 문서 (FIB + 조각 하나짜리 조각 테이블, UTF-16LE 본문)"""
+    text = "".join(line + "\r" for line in lines).encode("utf-16-le")
+    fib = bytearray(0x200)
+    struct.pack_into("<HH", fib, 0, 0xA5EC, 0x00C1)  # wIdent, nFib (Word 97)
+    struct.pack_into("<H", fib, 0x0A, 0x0200)  # fWhichTblStm: 1Table
+    struct.pack_into("<I", fib, 0x4C, len(text) // 2)  # ccpText
+    plc = struct.pack("<II", 0, len(text) // 2) + struct.pack("<HIH", 0, len(fib), 0)
+    clx = b"\x02" + struct.pack("<I", len(plc)) + plc
+    struct.pack_into("<II", fib, 0x1A2, 0, len(clx))  # fcClx, lcbClx
+    data = _cfb([
+        ("WordDocument", bytes(fib) + text),
+        ("1Table", clx),
+    ])
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_png(path: str, width: int = 800, height: int = 1100):
+    """흰 배경 이미지 (OCR 경로 부하용)"""
+    raw = b"".join(b"\x00" + b"\xff" * width for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    png = b"\x89PNG\r\n\x1a\n"
+    png += chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+    png += chunk(b"IDAT", zlib.compress(raw, 6))
+    png += chunk(b"IEND", b"")
+    with open(path, "wb") as f:
+        f.write(png)
+
+
+WRITERS = {
+    "TXT": ("txt", write_txt),
+    "DOCX": ("docx", write_docx),
+    "PDF": ("pdf", write_pdf),
+    "HWP": ("hwp", write_hwp),
+    "DOC": ("doc", write_doc),
+}
+
+
+def build_fixtures(directory: str, n_clauses: int = 20, file_types: Optional[List[str]] = None, kind: str = "근로") -> Dict[str, str]:
+    """파일 형식별 픽스처를 만들고 {FileType 값: 경로}를 반환"""
+    os.makedirs(directory, exist_ok=True)
+    lines = contract_lines(generate_contract(kind, n_clauses))
+    fixtures = {}
+    for file_type in file_types or list(WRITERS) + ["IMAGE"]:
+        if file_type == "IMAGE":
+            path = os.path.join(directory, "contract.png")
+            write_png(path)
+        else:
+            ext, writer = WRITERS[file_type]
+            path = os.path.join(directory, f"contract.{ext}")
+            writer(path, lines)
+        fixtures[file_type] = path
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 한국어 계약서 생성기")
+    parser.add_argument("--out", default="corpus", help="출력 디렉터리")
+    parser.add_argument("--kinds", nargs="+", default=list(TEMPLATES), choices=list(TEMPLATES))
+    parser.add_argument("--clauses", type=int, nargs="+", default=[10, 50, 200], help="문서별 조항 수")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="반복 문장 비율 (0~1)")
+    parser.add_argument("--formats", nargs="+", default=["txt", "docx", "doc", "pdf", "hwp", "json"],
+                        choices=["txt", "docx", "doc", "pdf", "hwp", "json"], help="json은 /contract/analyze 요청 본문")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    writers = {ext: writer for ext, writer in WRITERS.values()}
+    manifest = []
+    for kind in args.kinds:
+        for n in args.clauses:
+            contract = generate_contract(kind, n, args.duplicate_ratio, args.seed)
+            lines = contract_lines(contract)
+            stem = os.path.join(args.out, f"{kind}_{n}")
+            for ext in args.formats:
+                path = f"{stem}.{ext}"
+                if ext == "json":
+                    with open(path, "w", encoding="utf-8") as f:
+                        json.dump({"articles": contract_articles(contract)}, f, ensure_ascii=False)
+                else:
+                    writers[ext](path, lines)
+                manifest.append({"kind": kind, "clauses": n, "format": ext, "path": path, "bytes": os.path.getsize(path)})
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": args.seed, "duplicate_ratio": args.duplicate_ratio, "files": manifest}, f, ensure_ascii=False, indent=2)
+    print(f"{len(manifest)}개 파일 생성: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+엔드투엔드 부하 벤치마크 (실제 ASGI 앱 + 모의 LLM 서버)
+사용법: python -m benchmarks.load [--scenarios analyze_small chat chat_cached mixed ...] [--duration 10] [--concurrency 8]
+        [--llm-latency lognormal:0.3,0.4] [--output result.json]
+        [--save-baseline benchmarks/baseline.json] [--baseline benchmarks/baseline.json --threshold 0.2]
+
+모의 LLM 서버(benchmarks.mock_llm)와 앱을 각각 uvicorn 스레드로 띄우고,
+시나리오별로 동시 요청을 --duration 초 동안 보낸 뒤 처리량과 p50/p95/p99 지연 시간을 출력합니다.
+--baseline 과 비교해 p95가 threshold 이상 늘거나 처리량이 threshold 이상 줄면 종료 코드 1을 반환합니다.
+
+챗봇 응답 캐시는 chat_cached 시나리오에서만 켭니다. (chat, mixed는 캐시를 꺼서 LLM 경로를 측정)
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+
+import httpx
+
+from benchmarks import corpus, mock_llm
+
+ANALYZE_SIZES = {"analyze_small": 5, "analyze_medium": 40, "analyze_huge": 300}
+UPLOAD_TYPES = {"upload_txt": "TXT", "upload_docx": "DOCX", "upload_pdf": "PDF", "upload_hwp": "HWP", "upload_image": "IMAGE"}
+CHAT_QUESTIONS = [
+    "근로계약서에 꼭 들어가야 하는 내용은 무엇인가요?",
+    "수습 기간에도 최저임금을 받아야 하나요?",
+    "경업금지 조항은 어디까지 유효한가요?",
+    "연장근로수당은 어떻게 계산하나요?",
+    "퇴직금은 언제까지 지급해야 하나요?",
+    "주휴수당 지급 조건이 궁금해요.",
+    "해고 예고는 며칠 전에 해야 하나요?",
+    "포괄임금제 계약은 문제가 없나요?",
+]
+# mixed 시나리오 구성 비율
+MIX = {"chat": 4, "analyze_small": 3, "analyze_medium": 1, "upload_txt": 1, "upload_pdf": 1}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port: int):
+    """uvicorn을 별도 스레드(별도 이벤트 루프)로 실행"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError(f"서버 시작 실패 (port {port})")
+        time.sleep(0.05)
+    return server, thread
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """최근접 순위(nearest-rank) 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: List[tuple], elapsed: float) -> dict:
+    """samples: (지연 시간 초, 상태 코드)"""
+    latencies = sorted(s[0] for s in samples)
+    ok = sum(1 for _, status in samples if 200 <= status < 300)
+    rejected = sum(1 for _, status in samples if status == 503)
+    return {
+        "requests": len(samples),
+        "ok": ok,
+        "rejected": rejected,
+        "errors": len(samples) - ok - rejected,
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+        "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+    }
+
+
+class Scenarios:
+    """시나리오 이름 → 요청 1건을 보내는 코루틴"""
+
+    def __init__(self, fixtures: Dict[str, str]):
+        self.fixtures = fixtures
+        self.files = {file_type: open(path, "rb").read() for file_type, path in fixtures.items()}
+        self.nonce = itertools.count()
+        self.rng = random.Random(7)
+
+    def get(self, name: str) -> Callable:
+        if name in ANALYZE_SIZES:
+            return lambda client: self.analyze(client, ANALYZE_SIZES[name])
+        if name in UPLOAD_TYPES:
+            return lambda client: self.upload(client, UPLOAD_TYPES[name])
+        if name == "upload_analyze":
+            return lambda client: self.upload(client, "PDF", path="/upload/analyze")
+        if name in ("chat", "chat_cached"):
+            return self.chat
+        raise KeyError(name)
+
+    async def analyze(self, client: httpx.AsyncClient, n_clauses: int) -> int:
+        # 요청마다 내용을 조금씩 바꿔 결과 재사용(single-flight replay)을 피함
+        articles = corpus.make_articles(n_clauses, nonce=f" ({next(self.nonce)})")
+        r = await client.post("/contract/analyze", json={"articles": articles})
+        return r.status_code
+
+    async def upload(self, client: httpx.AsyncClient, file_type: str, path: str = "/upload/") -> int:
+        name = os.path.basename(self.fixtures[file_type])
+        r = await client.post(path, files={"file": (name, self.files[file_type])})
+        return r.status_code
+
+    async def chat(self, client: httpx.AsyncClient) -> int:
+        message = self.rng.choice(CHAT_QUESTIONS)
+        r = await client.post("/chat/", json={"message": message, "conversation_history": []})
+        return r.status_code
+
+
+async def run_scenario(base_url: str, scenarios: Scenarios, name: str, duration: float, concurrency: int) -> Dict[str, dict]:
+    """closed-loop: concurrency 개 작업자가 duration 초 동안 요청을 반복"""
+    if name == "mixed":
+        names = [n for n, weight in MIX.items() for _ in range(weight)]
+    else:
+        names = [name]
+    samples: Dict[str, List[tuple]] = {n: [] for n in set(names)}
+    rng = random.Random(11)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        # 워밍업 1회 (기록하지 않음)
+        for n in set(names):
+            await scenarios.get(n)(client)
+
+        stop_at = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < stop_at:
+                n = rng.choice(names)
+                started = time.perf_counter()
+                try:
+                    status = await scenarios.get(n)(client)
+                except httpx.HTTPError:
+                    status = 599
+                samples[n].append((time.perf_counter() - started, status))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    results = {name: summarize([s for group in samples.values() for s in group], elapsed)}
+    if name == "mixed":
+        for n, group in samples.items():
+            results[f"mixed/{n}"] = summarize(group, elapsed)
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """기준선 대비 회귀 목록 (p95 증가, 처리량 감소)"""
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        cur = current["results"].get(name)
+        if cur is None:
+            continue
+        if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms → {cur['p95_ms']}ms")
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: 처리량 {base['throughput_rps']} → {cur['throughput_rps']} rps")
+    return regressions
+
+
+def print_table(results: Dict[str, dict]):
+    print(f"{'scenario':<24} {'req':>6} {'ok':>6} {'503':>5} {'err':>5} {'rps':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+    for name, r in results.items():
+        print(f"{name:<24} {r['requests']:>6} {r['ok']:>6} {r['rejected']:>5} {r['errors']:>5} "
+              f"{r['throughput_rps']:>8} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+
+
+def main():
+    all_scenarios = list(ANALYZE_SIZES) + list(UPLOAD_TYPES) + ["upload_analyze", "chat", "chat_cached", "mixed"]
+    parser = argparse.ArgumentParser(description="엔드투엔드 부하 벤치마크")
+    parser.add_argument("--scenarios", nargs="+", default=["analyze_small", "analyze_medium", "chat", "chat_cached", "upload_txt", "upload_pdf", "mixed"],
+                        choices=all_scenarios)
+    parser.add_argument("--duration", type=float, default=10.0, help="시나리오별 실행 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency", default="lognormal:0.3,0.4", help="모의 LLM 지연 시간 분포")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--fixture-clauses", type=int, default=20, help="업로드 픽스처 조항 수")
+    parser.add_argument("--output", default="", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", default="", help="결과를 기준선으로 저장할 경로")
+    parser.add_argument("--baseline", default="", help="비교할 기준선 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 회귀 비율")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(os.path.abspath(args.baseline), encoding="utf-8") as f:
+            baseline = json.load(f)
+    output_paths = [os.path.abspath(p) for p in (args.output, args.save_baseline) if p]
+
+    # 업로드 파일/프로파일 등은 임시 작업 디렉터리에 생성
+    workdir = tempfile.mkdtemp(prefix="checky-load-")
+    os.chdir(workdir)
+    try:
+        mock_port, app_port = _free_port(), _free_port()
+        mock_args = mock_llm.build_parser().parse_args([
+            "--port", str(mock_port),
+            "--latency", args.llm_latency,
+            "--error-rate", str(args.llm_error_rate),
+            "--rate-limit-rate", str(args.llm_rate_limit_rate),
+        ])
+        start_server(mock_llm.create_app(mock_args), mock_port)
+
+        # 앱 설정은 import 시점에 읽으므로 환경 변수를 먼저 지정
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{mock_port}/v1"
+        os.environ["OPENAI_API_KEY"] = "mock-key"
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        from app.main import app
+        from app.services.chat_cache import chat_cache
+        cache_size = chat_cache.max_size
+
+        start_server(app, app_port)
+        fixtures = corpus.build_fixtures(os.path.join(workdir, "fixtures"), args.fixture_clauses)
+        scenarios = Scenarios(fixtures)
+
+        results: Dict[str, dict] = {}
+        for name in args.scenarios:
+            print(f"[{name}] {args.duration:.0f}초, 동시 {args.concurrency}", file=sys.stderr)
+            # 같은 질문을 반복하므로 캐시를 켜면 chat은 딕셔너리 조회만 측정하게 됨
+            chat_cache.clear()
+            chat_cache.max_size = cache_size if name == "chat_cached" else 0
+            results.update(asyncio.run(run_scenario(f"http://127.0.0.1:{app_port}", scenarios, name,
+                                                    args.duration, args.concurrency)))
+    finally:
+        os.chdir(os.path.dirname(workdir))
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency,
+        },
+        "results": results,
+    }
+    print_table(results)
+    for path in output_paths:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n성능 회귀 (허용 {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\n기준선 대비 회귀 없음 (허용 {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
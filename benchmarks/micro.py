@@ -0,0 +1,132 @@
+"""
+핫 패스 마이크로 벤치마크 (처리 시간 + tracemalloc 최대 메모리)
+사용법: python -m benchmarks.micro [--clauses 50 500] [--repeat 20] [--only rules serialize ...]
+        [--duplicate-ratio 0.2] [--json micro.json]
+
+합성 계약서(benchmarks.corpus)로 아래 함수를 각각 따로 측정합니다.
+- group_articles_by_clause / extract_document_title / apply_rules / compute_counts
+- TextExtractor 형식별 추출 (TXT, DOCX, PDF, HWP, 설치된 경우 IMAGE)
+- AnalyzeResponse 직렬화 (pydantic model_dump_json, FastAPI 기본 경로인 jsonable_encoder + json.dumps)
+- 분석 결과 저장소 (압축 형식 변환, 조회 JSON, 모델 복원)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.routers.contract.analyze import extract_document_title, group_articles_by_clause
+from app.schemas.contract.types import AnalyzeRequest, AnalyzeResponse
+from app.schemas.upload.file_upload import AnalysisResult, FileType
+from app.services.analysis_store import CompactAnalysis
+from app.services.analyzer import compute_counts, safety_percent
+from app.services.file.text_extractor import text_extractor
+from app.services.rules import apply_rules
+from benchmarks import corpus
+
+RISKS = ["safe", "safe", "safe", "warning", "danger"]
+
+
+def measure(fn: Callable, repeat: int) -> dict:
+    """repeat 회 실행한 시간(최소/중앙값)과 1회 실행의 최대 추가 메모리"""
+    fn()  # 워밍업 (import/정규식 컴파일 캐시 등)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "best_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "peak_kib": round((peak - base) / 1024, 1),
+    }
+
+
+def _analyzed(articles) -> AnalyzeResponse:
+    """분류가 끝난 것처럼 위험도/사유를 채운 응답"""
+    for i, s in enumerate(x for a in articles for x in a.sentences):
+        s.risk = RISKS[i % len(RISKS)]
+        if s.risk != "safe":
+            s.why, s.fix = "근로자에게 일방적으로 불리한 조항", "정당한 사유와 서면 통지 절차를 거쳐야 한다"
+    counts = compute_counts(articles)
+    return AnalyzeResponse(
+        articles=articles,
+        counts=counts,
+        safety_percent=safety_percent(counts),
+        title=extract_document_title(articles),
+    )
+
+
+def build_cases(n_clauses: int, duplicate_ratio: float, fixture_dir: str) -> Dict[str, Callable]:
+    contract = corpus.generate_contract("근로", n_clauses, duplicate_ratio)
+    articles = AnalyzeRequest(articles=corpus.contract_articles(contract)).articles
+    grouped = group_articles_by_clause(articles)
+    texts = [s.text for a in grouped for s in a.sentences]
+    response = _analyzed(grouped)
+
+    cases = {
+        "group_articles_by_clause": lambda: group_articles_by_clause(articles),
+        "extract_document_title": lambda: extract_document_title(articles),
+        "apply_rules": lambda: [apply_rules(t, "safe") for t in texts],
+        "compute_counts": lambda: compute_counts(grouped),
+        "serialize/model_dump_json": lambda: response.model_dump_json(),
+        "serialize/jsonable_encoder": lambda: json.dumps(jsonable_encoder(response), ensure_ascii=False),
+    }
+
+    result = AnalysisResult.model_construct(id="bench", title=response.title, articles=response.articles)
+    compact = CompactAnalysis.from_result(result)
+    cases.update({
+        "store/put": lambda: CompactAnalysis.from_result(result),
+        "store/get_json": compact.to_json,
+        "store/to_result": compact.to_result,
+    })
+
+    fixtures = corpus.build_fixtures(fixture_dir, n_clauses)
+    for file_type, path in fixtures.items():
+        if not text_extractor.is_supported(FileType(file_type)):
+            continue
+        cases[f"extract/{file_type}"] = (lambda p, ft: lambda: text_extractor._extract_sync(p, ft))(path, FileType(file_type))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핫 패스 마이크로 벤치마크")
+    parser.add_argument("--clauses", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--only", nargs="+", default=[], help="이름에 이 문자열이 들어간 항목만 실행")
+    parser.add_argument("--json", default="", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results: List[dict] = []
+    print(f"{'case':<30} {'clauses':>8} {'best(ms)':>10} {'median(ms)':>11} {'peak(KiB)':>10}")
+    with tempfile.TemporaryDirectory(prefix="checky-micro-") as fixture_dir:
+        for n in args.clauses:
+            for name, fn in build_cases(n, args.duplicate_ratio, os.path.join(fixture_dir, str(n))).items():
+                if args.only and not any(key in name for key in args.only):
+                    continue
+                result = {"case": name, "clauses": n, **measure(fn, args.repeat)}
+                results.append(result)
+                print(f"{name:<30} {n:>8} {result['best_ms']:>10} {result['median_ms']:>11} {result['peak_kib']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "duplicate_ratio": args.duplicate_ratio, "results": results},
+                      f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+OpenAI 호환 모의 LLM 서버 (부하 테스트용)
+사용법: python -m benchmarks.mock_llm [--port 8100] [--latency lognormal:0.4,0.5] [--error-rate 0.01]
+        [--rate-limit-rate 0.02] [--seed 42] [--record out.jsonl --upstream https://api.openai.com/v1]
+        [--replay out.jsonl]
+
+앱은 OPENAI_BASE_URL=http://127.0.0.1:8100/v1 로 실행합니다.
+
+- /v1/chat/completions: 스트리밍(SSE) 포함
+- 지연 시간 분포(fixed/uniform/normal/lognormal), 500/429 오류 주입
+- 분류/1차 분류 프롬프트에는 결정적이고 스키마에 맞는 결과를 반환
+  (같은 문장 → 같은 결과, 위험도는 규칙 엔진 기준)
+- --record: 실제 upstream 응답을 JSONL로 기록, --replay: 기록된 응답을 그대로 재생
+- system 메시지 접두사 캐시를 흉내 내 usage.prompt_tokens_details.cached_tokens 를 채움
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services.rules import apply_rules
+
+NUMBERED_LINE = re.compile(r"^\s*(\d+)\.\s?(.*)$", re.MULTILINE)
+SENTENCE_COUNT = re.compile(r"문장\s*(\d+)개")
+
+WHY = {"danger": "근로자에게 일방적으로 불리한 조항", "warning": "범위·기간이 불명확하여 조정 필요", "safe": "법정 기준에 부합"}
+FIX = {"danger": "정당한 사유와 서면 통지 절차를 거쳐야 한다", "warning": "적용 범위와 기간을 구체적으로 한정한다", "safe": ""}
+
+
+def parse_latency(spec: str):
+    """"fixed:0.2" | "uniform:0.1,0.5" | "normal:0.3,0.1" | "lognormal:중앙값,sigma" → 샘플 함수(초)"""
+    kind, _, raw = spec.partition(":")
+    params = [float(p) for p in raw.split(",") if p.strip()] if raw else []
+    if kind == "fixed":
+        return lambda rng: params[0] if params else 0.0
+    if kind == "uniform":
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(params[0], params[1]))
+    if kind == "lognormal":
+        mu = math.log(params[0])
+        return lambda rng: rng.lognormvariate(mu, params[1])
+    raise ValueError(f"알 수 없는 지연 시간 분포: {spec}")
+
+
+def request_key(body: dict) -> str:
+    """기록/재생용 요청 키 (모델, 메시지, 온도, 응답 형식)"""
+    canonical = {k: body.get(k) for k in ("model", "messages", "temperature", "response_format")}
+    return hashlib.sha256(json.dumps(canonical, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+def extract_sentences(user: str) -> List[str]:
+    """분류 프롬프트에서 문장 목록을 꺼냅니다. (번호 줄 형식 / JSON 배열 형식 모두)"""
+    if "문장들:\n[" in user:
+        start = user.index("문장들:\n[") + len("문장들:\n")
+        try:
+            texts, _ = json.JSONDecoder().raw_decode(user, start)
+            return [str(t) for t in texts]
+        except ValueError:
+            return []
+    count = SENTENCE_COUNT.search(user)
+    lines = user[count.end():] if count else user
+    return [m.group(2) for m in NUMBERED_LINE.finditer(lines)]
+
+
+def classify(texts: List[str]) -> List[dict]:
+    return [
+        {"index": i, "risk": risk, "why": WHY[risk], "fix": FIX[risk]}
+        for i, risk in enumerate((apply_rules(t, "safe") for t in texts), 1)
+    ]
+
+
+def first_pass(texts: List[str]) -> List[dict]:
+    items = []
+    for i, t in enumerate(texts, 1):
+        risk = apply_rules(t, "safe")
+        # 문장마다 고정된 확신도 (일부 safe 문장은 확신도가 낮아 상위 모델로 넘어감)
+        digest = hashlib.md5(t.encode("utf-8")).digest()[0]
+        confidence = 0.95 if risk == "safe" and digest % 5 else 0.6
+        items.append({"index": i, "risk": risk, "confidence": confidence})
+    return items
+
+
+def synthesize(body: dict) -> str:
+    """요청 형식에 맞는 결정적 응답 본문"""
+    messages = body.get("messages") or []
+    system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+    user = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+
+    if "1차 분류기" in system:
+        return json.dumps(first_pass(extract_sentences(user)), ensure_ascii=False)
+
+    if "계약서 분석 전문가" in system and ("문장들:" in user or SENTENCE_COUNT.search(user)):
+        items = classify(extract_sentences(user))
+        if body.get("response_format"):
+            return json.dumps({"items": items}, ensure_ascii=False)
+        return json.dumps(items, ensure_ascii=False)
+
+    # 챗봇: 질문에 따라 고정된 답변
+    digest = hashlib.md5(user.encode("utf-8")).hexdigest()[:8]
+    return f"모의 응답({digest}): 계약서의 해당 조항은 근로기준법에 따라 검토가 필요합니다."
+
+
+class MockState:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.latency = parse_latency(args.latency)
+        self.seen_prefixes = set()
+        self.replay: Dict[str, dict] = {}
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "replayed": 0, "recorded": 0, "streamed": 0}
+        if args.replay:
+            with open(args.replay, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.replay[entry["key"]] = entry["response"]
+
+    def usage(self, body: dict, content: str) -> dict:
+        messages = body.get("messages") or []
+        prompt_tokens = sum(_tokens(m.get("content") or "") + 4 for m in messages)
+        cached = 0
+        if messages and messages[0].get("role") == "system":
+            prefix = messages[0].get("content") or ""
+            if prefix in self.seen_prefixes:
+                # 제공자처럼 128토큰 단위로 캐시
+                cached = (_tokens(prefix) // 128) * 128
+            self.seen_prefixes.add(prefix)
+        completion_tokens = _tokens(content)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+
+def completion_body(body: dict, content: str, usage: dict) -> dict:
+    return {
+        "id": f"chatcmpl-mock-{hashlib.md5(content.encode('utf-8')).hexdigest()[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": usage,
+    }
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="Mock LLM")
+    state = MockState(args)
+    app.state.mock = state
+
+    async def upstream(body: dict, authorization: Optional[str]) -> dict:
+        headers = {"Authorization": authorization or f"Bearer {os.getenv('OPENAI_API_KEY', '')}"}
+        async with httpx.AsyncClient(timeout=120) as client:
+            r = await client.post(f"{args.upstream}/chat/completions", json={**body, "stream": False}, headers=headers)
+            r.raise_for_status()
+            return r.json()
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        state.stats["requests"] += 1
+
+        delay = state.latency(state.rng)
+        roll = state.rng.random()
+        await asyncio.sleep(delay)
+
+        if roll < args.rate_limit_rate:
+            state.stats["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"Retry-After": str(args.retry_after)},
+            )
+        if roll < args.rate_limit_rate + args.error_rate:
+            state.stats["errors"] += 1
+            return JSONResponse({"error": {"message": "Internal error (mock)", "type": "server_error"}}, status_code=500)
+
+        key = request_key(body)
+        if key in state.replay:
+            state.stats["replayed"] += 1
+            result = state.replay[key]
+        elif args.upstream:
+            result = await upstream(body, request.headers.get("authorization"))
+            if args.record:
+                with open(args.record, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "request": body, "response": result}, ensure_ascii=False) + "\n")
+                state.stats["recorded"] += 1
+        else:
+            content = synthesize(body)
+            result = completion_body(body, content, state.usage(body, content))
+
+        if not body.get("stream"):
+            return JSONResponse(result)
+
+        state.stats["streamed"] += 1
+        include_usage = (body.get("stream_options") or {}).get("include_usage")
+        content = result["choices"][0]["message"]["content"]
+
+        async def events():
+            base = {"id": result["id"], "object": "chat.completion.chunk", "created": result["created"], "model": result["model"]}
+            for i in range(0, len(content), args.chunk_chars):
+                delta = {"content": content[i:i + args.chunk_chars]}
+                if i == 0:
+                    delta["role"] = "assistant"
+                yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]}, ensure_ascii=False)}\n\n"
+                if args.chunk_delay:
+                    await asyncio.sleep(args.chunk_delay)
+            yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+            if include_usage:
+                yield f"data: {json.dumps({**base, 'choices': [], 'usage': result.get('usage')})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return state.stats
+
+    return app
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="OpenAI 호환 모의 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:0.4,0.5", help="fixed:s | uniform:a,b | normal:mu,sigma | lognormal:median,sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-chars", type=int, default=16, help="스트리밍 청크 크기(문자)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="스트리밍 청크 간 지연(초)")
+    parser.add_argument("--upstream", default="", help="기록 모드에서 실제 요청을 보낼 API 주소")
+    parser.add_argument("--record", default="", help="upstream 응답을 기록할 JSONL 경로")
+    parser.add_argument("--replay", default="", help="기록된 응답을 재생할 JSONL 경로")
+    return parser
+
+
+def main():
+    import uvicorn
+
+    args = build_parser().parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+분석 결과 저장소: 열 형식(CompactAnalysis) 왕복 변환, 저장소 API
+"""
+
+import json
+
+from app.schemas.upload.file_upload import AnalysisResult
+from app.services.analysis_store import AnalysisStore, CompactAnalysis
+
+RESULT = AnalysisResult(
+    id="task-1",
+    title="근로계약서 \"표준\"",
+    articles=[
+        {"id": "preamble", "title": "서문", "sentences": [
+            {"id": "p-1", "text": "본 계약은 갑과 을 간에 체결한다.", "risk": "safe", "why": None, "fix": None},
+        ]},
+        {"id": 1, "title": "제1조 (기간)", "sentences": [
+            {"id": "s1-1", "text": "기간은 1년으로 한다.", "risk": "safe", "why": "문제 없음", "fix": ""},
+            {"id": "s1-2", "text": "회사는 언제든 😀 해지할 수 있다.", "risk": "danger", "why": "일방 해지", "fix": "사유를 정한다."},
+        ]},
+        {"id": 2, "title": "제2조 (빈 조항)", "sentences": []},
+        {"id": "1_2", "title": "제1조 (시행일)", "sentences": [
+            {"id": "s1_2-1", "text": "서명한 날부터 시행한다.", "risk": "warning", "why": "문제 없음", "fix": None},
+        ]},
+    ],
+)
+
+
+def test_to_json_matches_model_serialization():
+    compact = CompactAnalysis.from_result(RESULT)
+    assert len(compact) == 4
+    assert json.loads(compact.to_json()) == json.loads(RESULT.model_dump_json())
+    assert compact.to_json() == RESULT.model_dump_json().encode()
+
+
+def test_to_result_round_trip():
+    restored = CompactAnalysis.from_result(RESULT).to_result()
+    assert restored.model_dump() == RESULT.model_dump()
+
+
+def test_repeated_reasons_are_stored_once():
+    compact = CompactAnalysis.from_result(RESULT)
+    assert compact.strings.count("문제 없음") == 1
+
+
+def test_store_get_and_delete():
+    store = AnalysisStore()
+    store.put(RESULT)
+    assert "task-1" in store and len(store) == 1
+    assert store.get("task-1").articles[1].sentences[1].risk == "danger"
+    assert store.get_json("missing") is None
+    store.delete("task-1")
+    assert store.get("task-1") is None
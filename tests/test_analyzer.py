@@ -0,0 +1,139 @@
+"""
+LLM 응답 항목별 검증, 누락 문장 재요청, 구조화 출력 미지원 시 전환 테스트 (LLM 호출은 가짜 함수)
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services import analyzer, cascade
+from app.services.parse import parse_llm_array
+
+GOOD = {"risk": "danger", "why": "위험", "fix": "수정"}
+
+
+def _item(index: int, **fields) -> dict:
+    return {"index": index, **GOOD, **fields}
+
+
+def _response(items) -> dict:
+    return {"choices": [{"message": {"content": json.dumps({"items": items}, ensure_ascii=False)}}]}
+
+
+def _bad_request(message: str) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://llm.test/chat/completions")
+    response = httpx.Response(400, json={"error": {"message": message}}, request=request)
+    return httpx.HTTPStatusError("400", request=request, response=response)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """응답(또는 예외)을 차례로 돌려주는 가짜 chat_completion"""
+    replies, requests = [], []
+
+    async def fake_chat_completion(messages, model=None, response_format=None, **kwargs):
+        requests.append({"messages": messages, "response_format": response_format})
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(analyzer, "chat_completion", fake_chat_completion)
+    monkeypatch.setattr(analyzer, "_structured", {"enabled": True, "disabled_until": 0.0})
+    monkeypatch.setattr(analyzer, "REASK_ROUNDS", 1)
+    return replies, requests
+
+
+def test_parse_llm_array_validates_each_item():
+    raw = "설명입니다\n```json\n[" + json.dumps(_item(1)) + ', {"index": 2, "risk": "unknown"}, "x"]\n```'
+    items = parse_llm_array(raw, 4)
+    assert items[0].risk == "danger"
+    assert items[1:] == [None, None, None]
+
+
+def test_parse_llm_array_matches_by_index():
+    # 두 번째 문장을 빠뜨려도 세 번째 결과가 앞으로 밀리지 않음
+    raw = json.dumps([_item(3, risk="safe"), _item(1), {**GOOD, "risk": "warning"}])
+    items = parse_llm_array(raw, 3)
+    assert items[0].risk == "danger"
+    assert items[1] is None
+    assert items[2].risk == "safe"
+    assert "index" not in items[0].model_dump()
+
+
+def test_parse_llm_array_rejects_duplicate_and_out_of_range_indices():
+    raw = json.dumps([_item(1), _item(2), _item(2, risk="safe"), _item(2), _item(0), _item(4), _item(True)])
+    assert [item and item.risk for item in parse_llm_array(raw, 3)] == ["danger", None, None]
+
+
+def test_reask_only_missing_items(llm):
+    replies, requests = llm
+    replies += [
+        _response([_item(1), {"index": 2, "risk": "bad"}, _item(3)]),
+        _response([{"index": 1, "risk": "warning", "why": "w", "fix": "f"}]),
+    ]
+    results = asyncio.run(analyzer._llm_classify("제1조", ["가", "나", "다"]))
+    assert [r["risk"] for r in results] == ["danger", "warning", "danger"]
+    assert len(requests) == 2
+    # 재요청에는 형식이 잘못된 두 번째 문장만
+    assert "나" in requests[1]["messages"][-1]["content"]
+    assert "가" not in requests[1]["messages"][-1]["content"]
+
+
+def test_merged_item_reasks_the_right_sentence(llm):
+    replies, requests = llm
+    # 1차 응답이 가운데 문장을 건너뜀 → 재요청은 "나"만, 번호는 1부터 다시
+    replies += [
+        _response([_item(1), _item(3, risk="safe")]),
+        _response([_item(1, risk="warning")]),
+    ]
+    results = asyncio.run(analyzer._llm_classify("제1조", ["가", "나", "다"]))
+    assert [r["risk"] for r in results] == ["danger", "warning", "safe"]
+    assert "1. 나" in requests[1]["messages"][-1]["content"]
+
+
+def test_unresolved_items_fall_back_to_rules(llm):
+    replies, _ = llm
+    replies += [_response([_item(1)]), _response([])]
+    results = asyncio.run(analyzer._llm_classify("제1조", ["가", "나"]))
+    assert results[0]["risk"] == "danger"
+    assert results[1]["why"] == analyzer.UNAVAILABLE_WHY
+
+
+def test_unsupported_response_format_falls_back(llm):
+    replies, requests = llm
+    replies += [
+        _bad_request("Invalid parameter: 'response_format' of type 'json_schema' is not supported with this model."),
+        _response([_item(1)]),
+    ]
+    results = asyncio.run(analyzer._llm_classify("제1조", ["가"]))
+    assert results[0]["risk"] == "danger"
+    assert requests[0]["response_format"] is not None
+    assert requests[1]["response_format"] is None
+    assert not analyzer.structured_enabled()
+
+    # 일정 시간이 지나면 다시 구조화 출력 시도
+    analyzer._structured["disabled_until"] = 0.0
+    assert analyzer.structured_enabled()
+
+
+def test_other_bad_requests_keep_structured_output(llm):
+    replies, requests = llm
+    replies.append(_bad_request("This model's maximum context length is 128000 tokens."))
+    results = asyncio.run(analyzer._llm_classify("제1조", ["가"]))
+    assert results[0]["why"] == analyzer.UNAVAILABLE_WHY
+    assert len(requests) == 1
+    assert analyzer.structured_enabled()
+
+
+def test_first_pass_matches_by_index(monkeypatch):
+    async def fake_chat_completion(messages, **kwargs):
+        content = json.dumps([{"index": 2, "risk": "safe", "confidence": 0.9}, {"index": 3, "risk": "danger", "confidence": 0.7}])
+        return {"choices": [{"message": {"content": content}}]}
+
+    monkeypatch.setattr(cascade, "chat_completion", fake_chat_completion)
+    results = asyncio.run(cascade.first_pass(["가", "나", "다"]))
+    # 빠진 1번 문장은 확신도 0 → 상위 모델로
+    assert results == [("warning", 0.0), ("safe", 0.9), ("danger", 0.7)]
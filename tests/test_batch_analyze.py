@@ -0,0 +1,46 @@
+"""
+배치 CLI: 작업자 비정상 종료 뒤 풀 재생성, 문장 결과 재사용(SentenceMemo) 범위
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from app.cli.batch_analyze import SentenceMemo
+from app.schemas.contract.types import Article, Sentence
+from app.services.analyzer import OVER_BUDGET_WHY, UNAVAILABLE_WHY
+from app.services.file import sandbox
+
+
+def _article(*texts):
+    return Article(id=1, title="제1조", sentences=[Sentence(id=f"s1-{i}", text=t, risk="safe") for i, t in enumerate(texts)])
+
+
+def test_memo_skips_degraded_results():
+    memo = SentenceMemo()
+    first = _article("모델 판단", "장애 대체", "예산 대체")
+    for s, why in zip(first.sentences, ("모델 사유", UNAVAILABLE_WHY, OVER_BUDGET_WHY)):
+        s.risk, s.why, s.fix = "warning", why, "고칠 점"
+    memo.remember([first])
+
+    second = _article("모델 판단", "장애 대체", "예산 대체")
+    targets = memo.fill([second])
+    assert memo.hits == 1
+    assert second.sentences[0].why == "모델 사유"
+    # 대체 결과는 재사용하지 않고 다시 분석 대상으로
+    assert [s.text for a in targets for s in a.sentences] == ["장애 대체", "예산 대체"]
+
+
+@pytest.mark.skipif(sandbox.resource is None, reason="POSIX 전용")
+def test_pool_recovers_after_worker_dies():
+    async def scenario():
+        pool = sandbox.ExtractionPool(1)
+        try:
+            with pytest.raises(sandbox.ExtractionLimitError):
+                await pool.run(os._exit, 1)  # OOM kill 등으로 작업자가 죽은 경우
+            return await pool.run(len, "abc")
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(scenario()) == 3
@@ -0,0 +1,61 @@
+"""
+챗봇 응답 캐시: 정규화/유사 질문 매칭, 숫자·부정 표현 구분, 후속 질문 제외
+"""
+
+import asyncio
+
+import pytest
+
+from app.schemas.chat.types import ChatMessage
+from app.services import chat_service as chat_service_module
+from app.services.chat_cache import ChatAnswerCache
+
+
+def test_exact_and_similar_hits():
+    cache = ChatAnswerCache(max_size=8, ttl=60)
+    cache.put("근로계약서에 꼭 들어가야 하는 내용은 무엇인가요?", "답변")
+    assert cache.get("근로계약서에 꼭 들어가야 하는 내용은 무엇인가요") == "답변"
+    assert cache.get("근로 계약서에 꼭 들어가야 하는 내용은 무엇인가요?!") == "답변"
+    assert cache.get("근로계약서에 꼭 들어가야 하는 내용이 무엇인가요?") == "답변"
+    assert (cache.exact_hits, cache.similar_hits) == (2, 1)
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("수습기간 3개월 동안 임금을 90%만 줘도 되나요?", "수습기간 6개월 동안 임금을 90%만 줘도 되나요?"),
+    ("재계약을 하게 되면 퇴직금을 따로 받을 수 있나요?", "재계약을 하게 되면 퇴직금을 따로 받을 수 없나요?"),
+    ("근로계약서를 서면으로 작성하고 교부받은 경우 문제가 되나요?", "근로계약서를 서면으로 작성하지 않고 교부받은 경우 문제가 되나요?"),
+])
+def test_numbers_and_negation_must_match(stored, asked):
+    # n-gram 유사도는 임계값(0.8) 이상이지만 숫자/부정 표현이 달라 다른 질문
+    cache = ChatAnswerCache(max_size=8, ttl=60, threshold=0.8)
+    cache.put(stored, "답변")
+    assert cache.get(asked) is None
+
+
+def test_only_first_turn_is_cacheable():
+    cache = ChatAnswerCache(max_size=8)
+    assert cache.is_cacheable(0)
+    assert not cache.is_cacheable(1)
+    assert not ChatAnswerCache(max_size=0).is_cacheable(0)
+
+
+def test_follow_up_question_skips_cache(monkeypatch):
+    cache = ChatAnswerCache(max_size=8, ttl=60)
+    cache.put("그럼 그 조항은?", "맥락 없이 만든 답변")
+    calls = []
+
+    async def fake_chat_completion(messages, **kwargs):
+        calls.append(messages)
+        return {"choices": [{"message": {"content": "맥락에 맞는 답변"}}]}
+
+    monkeypatch.setattr(chat_service_module, "chat_cache", cache)
+    monkeypatch.setattr(chat_service_module, "chat_completion", fake_chat_completion)
+    history = [
+        ChatMessage(role="user", content="경업금지 조항이 궁금해요"),
+        ChatMessage(role="assistant", content="경업금지 조항은..."),
+    ]
+    service = chat_service_module.ChatService()
+    answer = asyncio.run(service.get_chat_response("그럼 그 조항은?", history))
+    assert answer == "맥락에 맞는 답변"
+    assert len(calls) == 1
+    assert cache.get("그럼 그 조항은?") == "맥락 없이 만든 답변"  # 후속 질문 응답으로 덮어쓰지 않음
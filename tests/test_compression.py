@@ -0,0 +1,53 @@
+"""
+응답 압축 미들웨어: 인코딩 협상, 크기 기준, HEAD 응답
+"""
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.services.compression import CompressionMiddleware, negotiate
+
+BODY = {"articles": [{"id": i, "text": "근로시간은 1일 8시간으로 한다."} for i in range(100)]}
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.api_route("/result", methods=["GET", "HEAD"])
+    async def result():
+        return JSONResponse(BODY)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_negotiate():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0, identity") is None
+    assert negotiate("identity") is None
+
+
+def test_large_json_is_gzipped():
+    response = _client().get("/result", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] in ("gzip", "br")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == BODY
+
+
+def test_small_response_is_not_compressed():
+    response = _client().get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_head_keeps_content_length():
+    client = _client()
+    length = client.get("/result", headers={"Accept-Encoding": "identity"}).headers["content-length"]
+    response = client.head("/result", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-length"] == length
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,56 @@
+"""
+추출 작업자 풀(시간 초과 시 다른 작업 재실행)과 PDF 페이지 묶음 크기 테스트
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.schemas.upload.file_upload import FileType
+from app.services.file import sandbox, text_extractor as extractor_module
+from app.services.file.text_extractor import TextExtractor
+
+
+def test_timeout_kill_retries_other_jobs(monkeypatch):
+    monkeypatch.setattr(sandbox, "EXTRACTION_TIMEOUT", 1.5)
+
+    async def scenario():
+        pool = sandbox.ExtractionPool(2)
+        try:
+            await pool.run(len, "warm")  # 작업자 기동 시간 제외
+            hung = asyncio.create_task(pool.run(time.sleep, 30))
+            await asyncio.sleep(0.8)
+            # 멈춘 작업 때문에 풀이 강제 종료될 때 실행 중인 정상 작업
+            other = asyncio.create_task(pool.run(time.sleep, 1.0))
+            with pytest.raises(sandbox.ExtractionLimitError):
+                await hung
+            await other
+            return await pool.run(len, "abc")
+        finally:
+            pool.shutdown()
+
+    before = sandbox.retries.values.get((), 0)
+    assert asyncio.run(scenario()) == 3
+    assert sandbox.retries.values[()] == before + 1
+
+
+def test_pdf_stream_batches_grow(monkeypatch):
+    extractor = TextExtractor()
+    extractor.supported_types[FileType.PDF] = True
+    calls = []
+
+    async def fake_run(fn, file_path, start, count):
+        calls.append((start, count))
+        return [f"page {i}" for i in range(start, min(start + count, 100))], 100
+
+    monkeypatch.setattr(extractor, "_run", fake_run)
+    monkeypatch.setattr(extractor_module, "PDF_PAGE_BATCH_MAX", 32)
+
+    async def collect():
+        return [chunk async for chunk in extractor.stream_text("contract.pdf", FileType.PDF)]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) == 100
+    # 첫 묶음은 작게, 이후 두 배씩 (상한까지) → 파일을 여는 횟수가 페이지 수에 비례하지 않음
+    assert calls == [(0, 4), (4, 8), (12, 16), (28, 32), (60, 32), (92, 32)]
@@ -0,0 +1,65 @@
+"""
+DOCX/DOC/HWP 본문 추출기 테스트 (픽스처는 benchmarks.corpus 작성기로 생성)
+"""
+
+import olefile
+import pytest
+
+from benchmarks import corpus
+from app.services.file import doc_reader, docx_reader, hwp_reader
+
+LINES = corpus.contract_lines(corpus.generate_contract("근로", 3))
+
+
+def _nonempty(text: str):
+    return [line for line in text.splitlines() if line.strip()]
+
+
+def test_docx_paragraphs(tmp_path):
+    path = str(tmp_path / "contract.docx")
+    corpus.write_docx(path, LINES)
+    assert [p.text for p in docx_reader.iter_paragraphs(path)] == LINES
+    assert _nonempty(docx_reader.extract_text(path)) == LINES
+
+
+def test_docx_decompressed_size_limit(tmp_path):
+    path = str(tmp_path / "contract.docx")
+    corpus.write_docx(path, LINES)
+    with pytest.raises(ValueError):
+        list(docx_reader.iter_paragraphs(path, max_bytes=100))
+
+
+def test_docx_numbered_heading_line():
+    assert docx_reader.Paragraph("목적", "제1조", 0).line == "제1조 (목적)"
+    assert docx_reader.Paragraph("근무장소는 본사로 한다.", "①").line == "① 근무장소는 본사로 한다."
+    assert docx_reader.Paragraph("본문").line == "본문"
+
+
+def test_doc_piece_table(tmp_path):
+    path = str(tmp_path / "contract.doc")
+    corpus.write_doc(path, LINES)
+    assert _nonempty(doc_reader.extract_text(path, olefile)) == LINES
+
+
+def test_doc_field_codes_keep_result_only():
+    assert doc_reader._clean("날짜: \x13 DATE \\@ \x142025-01-01\x15\r") == "날짜: 2025-01-01\n"
+
+
+def test_hwp_body_text(tmp_path):
+    path = str(tmp_path / "contract.hwp")
+    corpus.write_hwp(path, LINES)
+    assert _nonempty(hwp_reader.extract_text(path, olefile, 1 << 20)) == LINES
+
+
+def test_hwp_decompression_limit(tmp_path):
+    path = str(tmp_path / "contract.hwp")
+    corpus.write_hwp(path, LINES * 50)
+    with pytest.raises(hwp_reader.DecompressionLimitError):
+        hwp_reader.extract_text(path, olefile, 1024)
+
+
+def test_hwp_rejects_other_ole_files(tmp_path):
+    path = str(tmp_path / "contract.doc")
+    corpus.write_doc(path, LINES)
+    with pytest.raises(OSError):  # FileHeader 스트림 없음
+        hwp_reader.extract_text(path, olefile, 1 << 20)
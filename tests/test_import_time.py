@@ -0,0 +1,49 @@
+"""
+콜드 스타트 회귀 테스트: app.main import 시간과 import 시점 부작용 확인
+예산은 IMPORT_TIME_BUDGET_MS 환경 변수로 조정 (CI 머신 성능에 맞춰)
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2500"))
+
+# 첫 요청 또는 lifespan 워밍업에서만 로드되어야 하는 모듈
+HEAVY_MODULES = ("pypdf", "PIL", "easyocr", "docx2txt", "olefile", "chardet", "pillow_heif")
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _import_app(workdir: str):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=workdir, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            modules[m.group(4)] = int(m.group(2)) / 1000  # cumulative (ms)
+    return modules
+
+
+def test_import_time_budget_and_side_effects():
+    with tempfile.TemporaryDirectory() as workdir:
+        modules = _import_app(workdir)
+
+        assert "app.main" in modules
+        assert modules["app.main"] < IMPORT_TIME_BUDGET_MS, (
+            f"app.main import {modules['app.main']:.0f}ms > 예산 {IMPORT_TIME_BUDGET_MS:.0f}ms"
+        )
+
+        loaded = sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES)
+        assert not loaded, f"import 시점에 무거운 모듈이 로드됨: {loaded}"
+
+        # 업로드 디렉터리는 lifespan에서 생성
+        assert not os.path.exists(os.path.join(workdir, "files"))
@@ -0,0 +1,176 @@
+"""
+LLM 스케줄러(WFQ) 배정 순서, 마감, 취소 시 슬롯 반납 테스트
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from contextlib import asynccontextmanager
+
+from app.services import llm_scheduler as scheduler_module, openai_client
+from app.services.llm_scheduler import BULK, INTERACTIVE, DeadlineExceeded, LLMScheduler, request_scope, request_share
+from app.services.rate_limiter import LLMRateLimiter
+
+
+def _scheduler(max_concurrency: int = 1) -> LLMScheduler:
+    return LLMScheduler(max_concurrency, {INTERACTIVE: 8, BULK: 1})
+
+
+def test_weighted_order_prefers_interactive():
+    async def scenario():
+        scheduler = _scheduler()
+        order = []
+        gate = asyncio.Event()
+
+        async def job(priority, name):
+            async with scheduler.slot(priority):
+                order.append(name)
+                if name == "first":
+                    await gate.wait()
+
+        first = asyncio.create_task(job(BULK, "first"))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(job(BULK, f"bulk{i}")) for i in range(3)]
+        tasks += [asyncio.create_task(job(INTERACTIVE, f"chat{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth() == 6
+        gate.set()
+        await asyncio.gather(first, *tasks)
+        assert scheduler.in_flight == 0
+        return order
+
+    order = asyncio.run(scenario())
+    assert order[0] == "first"
+    # 가중치 8:1 → 대화형 요청이 먼저, 같은 클래스 안에서는 FIFO
+    assert order[1:4] == ["chat0", "chat1", "chat2"]
+    assert order[4:] == ["bulk0", "bulk1", "bulk2"]
+
+
+def test_deadline_while_queued():
+    async def scenario():
+        scheduler = _scheduler()
+        async with scheduler.slot(BULK):
+            with pytest.raises(DeadlineExceeded):
+                async with scheduler.slot(BULK, deadline=time.monotonic() + 0.02):
+                    pass
+            assert scheduler.queue_depth() == 0
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.in_flight == 0
+    assert scheduler.dropped[BULK] == 1
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def scenario():
+        scheduler = _scheduler()
+        async with scheduler.slot(BULK):
+            waiter = asyncio.create_task(scheduler._acquire(BULK, None))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert scheduler.queue_depth() == 0
+        return scheduler
+
+    assert asyncio.run(scenario()).in_flight == 0
+
+
+def test_slot_granted_at_timeout_is_released(monkeypatch):
+    scheduler = _scheduler()
+
+    async def racing_wait_for(future, timeout):
+        # 마감 타이머와 같은 루프 반복에서 앞선 슬롯이 반납되어 이 대기자에게 배정됨
+        scheduler._release()
+        future.cancel()
+        raise asyncio.TimeoutError
+
+    async def scenario():
+        await scheduler._acquire(BULK, None)
+        monkeypatch.setattr(scheduler_module.asyncio, "wait_for", racing_wait_for)
+        with pytest.raises(DeadlineExceeded):
+            await scheduler._acquire(BULK, time.monotonic() + 1)
+
+    asyncio.run(scenario())
+    assert scheduler.in_flight == 0
+
+
+def test_slot_released_during_retry_backoff():
+    async def scenario():
+        scheduler = _scheduler()
+        limiter = LLMRateLimiter(rpm=6000, tpm=100000, max_retries=1, backoff_base=0.2, backoff_max=0.2)
+        limiter._backoff = lambda attempt, retry_after=None: 0.2
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise httpx.ConnectError("boom")
+            return {"choices": []}
+
+        async def chat():
+            await asyncio.sleep(0.05)  # 첫 시도가 실패해 백오프 중일 때
+            started = time.monotonic()
+            async with scheduler.slot(INTERACTIVE):
+                return time.monotonic() - started
+
+        bulk = asyncio.create_task(limiter.call(flaky, slot=lambda: scheduler.slot(BULK)))
+        waited = await chat()
+        await bulk
+        return waited, scheduler.in_flight
+
+    waited, in_flight = asyncio.run(scenario())
+    assert waited < 0.1
+    assert in_flight == 0
+
+
+def test_request_scope_limits_fan_out():
+    async def scenario():
+        scheduler = _scheduler()
+        gate = asyncio.Event()
+
+        async def call():
+            async with request_share():
+                async with scheduler.slot(BULK):
+                    await gate.wait()
+
+        with request_scope(fan_out=2):
+            tasks = [asyncio.create_task(call()) for _ in range(10)]
+        await asyncio.sleep(0.01)
+        queued = scheduler.in_flight + scheduler.queue_depth()
+        gate.set()
+        await asyncio.gather(*tasks)
+        # 범위 밖의 호출은 제한 없음
+        async with request_share():
+            pass
+        return queued, scheduler.in_flight
+
+    queued, in_flight = asyncio.run(scenario())
+    # 조항 10개를 한꺼번에 올려도 큐에는 요청당 2개까지만 (실행 1 + 대기 1)
+    assert queued == 2
+    assert in_flight == 0
+
+
+def test_bulk_calls_have_no_queue_deadline(monkeypatch):
+    deadlines = {}
+
+    @asynccontextmanager
+    async def slot(priority, deadline):
+        deadlines[priority] = deadline
+        yield
+
+    async def call(send, estimated_tokens=0, slot=None):
+        async with slot():
+            return {"choices": []}
+
+    monkeypatch.setattr(openai_client, "API_KEY", "test")
+    monkeypatch.setattr(openai_client.llm_scheduler, "slot", slot)
+    monkeypatch.setattr(openai_client.llm_limiter, "call", call)
+    messages = [{"role": "user", "content": "질문"}]
+    asyncio.run(openai_client.chat_completion(messages))
+    asyncio.run(openai_client.chat_completion(messages, priority=INTERACTIVE))
+    assert deadlines[BULK] is None
+    assert deadlines[INTERACTIVE] > time.monotonic()
@@ -0,0 +1,17 @@
+"""
+부하 벤치마크 집계: 최근접 순위 백분위수
+"""
+
+from benchmarks.load import percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 11)]
+    assert percentile(values, 50) == 5.0
+    assert percentile(values, 95) == 10.0
+    assert percentile(values, 100) == 10.0
+    assert percentile(values, 0) == 1.0
+    # 순위가 정확히 .5에 걸리는 경우 (0.25 * 2 = 0.5 → 1번째)
+    assert percentile([1.0, 2.0], 25) == 1.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 75) == 3.0
+    assert percentile([], 50) == 0.0
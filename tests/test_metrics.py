@@ -0,0 +1,41 @@
+"""
+Prometheus 텍스트 형식 렌더링과 /metrics 수집 테스트
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers.metrics import metrics_router
+from app.services import metrics
+
+
+def test_histogram_render_is_cumulative():
+    registry = metrics.MetricsRegistry()
+    latency = registry.histogram("t_seconds", "테스트", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        latency.observe(value, "/a")
+    lines = registry.render().splitlines()
+    assert 't_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 't_seconds_count{route="/a"} 3' in lines
+
+
+def test_upload_dir_gauges_scanned_once_per_scrape(tmp_path, monkeypatch):
+    (tmp_path / "a.pdf").write_bytes(b"x" * 10)
+    (tmp_path / "b.txt").write_bytes(b"y" * 5)
+    monkeypatch.setattr(metrics_router.file_cleaner, "upload_dir", tmp_path)
+    scans = []
+    directory_size = metrics.directory_size
+
+    def counting_directory_size(path):
+        scans.append(path)
+        return directory_size(path)
+
+    monkeypatch.setattr(metrics, "directory_size", counting_directory_size)
+    app = FastAPI()
+    app.include_router(metrics_router.router)
+    body = TestClient(app).get("/metrics").text
+    assert "checky_upload_dir_files 2" in body.splitlines()
+    assert "checky_upload_dir_bytes 15" in body.splitlines()
+    assert scans == [tmp_path]
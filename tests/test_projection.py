@@ -0,0 +1,29 @@
+"""
+분석 결과 부분 조회(Projection): 파라미터 검증, 필터/페이지/필드 선택
+"""
+
+import pytest
+
+from app.services.analysis_store import CompactAnalysis
+from app.services.projection import Projection
+from tests.test_analysis_store import RESULT
+
+
+def test_projection_parse():
+    assert Projection.parse(None, None) is None
+    projection = Projection.parse("id, risk", "danger,warning", 0, 10)
+    assert projection.fields == ("id", "risk")
+    assert projection.risks == {"danger", "warning"}
+    for args in (("id,owner", None), (None, "critical"), (None, None, -1), (None, None, 0, -5)):
+        with pytest.raises(ValueError):
+            Projection.parse(*args)
+
+
+def test_projection_apply_on_compact_rows():
+    rows = CompactAnalysis.from_result(RESULT).articles
+    page = Projection.parse("id,risk", "danger,warning", 1, 1).apply(rows)
+    # 필터 후 조항: 제1조, 제1조(시행일) → offset 1부터 1개
+    assert page == {
+        "articles": [{"id": "1_2", "title": "제1조 (시행일)", "sentences": [{"id": "s1_2-1", "risk": "warning"}]}],
+        "page": {"offset": 1, "limit": 1, "total": 2},
+    }
@@ -0,0 +1,216 @@
+"""
+LLM 호출 한도(토큰 버킷), 서킷 브레이커, Retry-After 파싱 테스트 (네트워크 사용 안 함)
+"""
+
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from app.services.rate_limiter import (
+    CircuitBreaker, CircuitOpenError, LLMRateLimiter, TokenBucket, parse_retry_after,
+)
+
+
+def _status_error(status: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://llm.test/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(threshold=1, reset_seconds=0.0)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("soon") is None
+    assert 5 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
+
+
+def test_token_bucket_waits_for_refill():
+    async def scenario():
+        bucket = TokenBucket(per_minute=600)  # 초당 10개
+        bucket.tokens = 0
+        started = time.monotonic()
+        await bucket.acquire(2)
+        return time.monotonic() - started, bucket.tokens
+
+    waited, left = asyncio.run(scenario())
+    assert 0.15 <= waited < 1.0
+    assert left < 1
+
+
+def test_token_bucket_waiter_does_not_block_smaller_requests():
+    async def scenario():
+        bucket = TokenBucket(per_minute=600)
+        bucket.tokens = 0
+        started = time.monotonic()
+        finished = {}
+
+        async def take(name, amount):
+            await bucket.acquire(amount)
+            finished[name] = time.monotonic() - started
+
+        large = asyncio.create_task(take("large", 5))
+        await asyncio.sleep(0)
+        await take("small", 1)
+        await large
+        return finished
+
+    finished = asyncio.run(scenario())
+    # 먼저 기다리던 큰 요청(0.5초)이 잠금을 쥐고 있지 않으므로 작은 요청은 0.1초 만에 통과
+    assert finished["small"] < 0.3
+    assert finished["large"] >= 0.5
+
+
+def test_token_bucket_adjust_allows_debt():
+    bucket = TokenBucket(per_minute=60)
+    bucket.adjust(100)
+    assert bucket.tokens < 0
+    bucket.adjust(-1000)
+    assert bucket.tokens == bucket.capacity
+
+
+def test_breaker_opens_after_threshold_and_probes_once():
+    breaker = CircuitBreaker(threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.reset_seconds = 0.0
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # 탐색 요청은 하나만
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    breaker = _open_breaker()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.open_count == 2  # 반개방 → 재오픈도 한 번으로 셈
+
+
+def test_limiter_retries_transient_errors():
+    calls = []
+
+    async def send():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _status_error(503)
+        return {"choices": [], "usage": {"total_tokens": 10}}
+
+    limiter = LLMRateLimiter(rpm=6000, tpm=100000, max_retries=3, backoff_base=0.001, backoff_max=0.01)
+    result = asyncio.run(limiter.call(send, estimated_tokens=10))
+    assert result["usage"]["total_tokens"] == 10
+    assert len(calls) == 3
+    assert limiter.retries == 2
+    assert limiter.breaker.state == "closed"
+
+
+def test_limiter_does_not_retry_client_errors():
+    async def send():
+        raise _status_error(400)
+
+    limiter = LLMRateLimiter(rpm=6000, tpm=100000, backoff_base=0.001)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(limiter.call(send))
+    assert limiter.calls == 1
+    assert limiter.breaker.failures == 0
+
+
+def test_client_error_leaves_breaker_state():
+    async def send():
+        raise _status_error(400)
+
+    limiter = LLMRateLimiter(rpm=6000, tpm=100000)
+    limiter.breaker = CircuitBreaker(threshold=5, reset_seconds=60)
+    for _ in range(3):
+        limiter.breaker.record_failure()
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(limiter.call(send))
+    # 잘못된 요청 하나로 연속 실패 수가 초기화되지 않음
+    assert limiter.breaker.failures == 3
+
+    # 반개방 탐색이 400을 받아도 서킷을 닫지 않고 탐색 표시만 해제
+    limiter.breaker = _open_breaker()
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(limiter.call(send))
+    assert limiter.breaker.state == "half_open"
+    limiter.breaker.before_call()
+
+
+def test_probe_cancelled_does_not_stick_half_open():
+    limiter = LLMRateLimiter(rpm=6000, tpm=100000)
+    limiter.breaker = _open_breaker()
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(60)
+
+    async def ok():
+        return {"choices": []}
+
+    async def scenario():
+        probe = asyncio.create_task(limiter.call(hang))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert limiter.breaker.state == "half_open"
+        # 취소된 탐색 뒤에도 다음 호출이 탐색으로 통과해 서킷을 닫음
+        return await limiter.call(ok)
+
+    assert asyncio.run(scenario()) == {"choices": []}
+    assert limiter.breaker.state == "closed"
+
+
+def test_probe_cancelled_while_waiting_for_tokens():
+    limiter = LLMRateLimiter(rpm=6000, tpm=60)
+    limiter.breaker = _open_breaker()
+    limiter.tokens.tokens = 0
+
+    async def send():
+        return {"choices": []}
+
+    async def scenario():
+        probe = asyncio.create_task(limiter.call(send, estimated_tokens=50))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        limiter.breaker.before_call()  # 탐색 표시가 해제되어 있어야 함
+
+    asyncio.run(scenario())
+
+
+def test_unexpected_error_counts_as_failure():
+    limiter = LLMRateLimiter(rpm=6000, tpm=100000)
+    limiter.breaker = _open_breaker()
+
+    async def bad_json():
+        raise ValueError("Expecting value")
+
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.call(bad_json))
+    assert limiter.breaker.state == "open"
+    assert limiter.failures == 1
+    limiter.breaker.before_call()  # 다음 탐색은 가능
@@ -0,0 +1,74 @@
+"""
+수정본 재분석: 이전 결과와 문장 정렬, 변경 없는 문장의 결과 재사용
+"""
+
+from app.schemas.contract.types import Article, Sentence
+from app.services.analyzer import OVER_BUDGET_WHY, UNAVAILABLE_WHY
+from app.services.revision import apply_revision, normalize_sentence
+
+
+def _articles(*groups):
+    """groups: (조항 id, [(문장 id, 본문, 위험도)])"""
+    return [
+        Article(id=article_id, title=f"제{article_id}조",
+                sentences=[Sentence(id=sid, text=text, risk=risk, why=f"{sid} 사유", fix=None) for sid, text, risk in rows])
+        for article_id, rows in groups
+    ]
+
+
+PREVIOUS = _articles(
+    (1, [("s1-1", "기간은 1년으로 한다.", "safe"), ("s1-2", "갱신할 수 있다.", "safe")]),
+    (2, [("s2-1", "사용자는 즉시 해고할 수 있다.", "danger"), ("s2-2", "임금은 매월 지급한다.", "safe")]),
+)
+
+
+def test_normalize_sentence_ignores_spacing_and_width():
+    assert normalize_sentence("기간은  1년으로\t한다.") == normalize_sentence("기간은1년으로한다．")
+
+
+def test_unchanged_document_needs_no_analysis():
+    current = _articles(
+        (1, [("s1-1", "기간은 1년으로 한다.", "safe"), ("s1-2", "갱신할  수 있다.", "safe")]),
+        (2, [("s2-1", "사용자는 즉시 해고할 수 있다.", "safe"), ("s2-2", "임금은 매월 지급한다.", "safe")]),
+    )
+    targets, summary = apply_revision(PREVIOUS, current)
+    assert targets == []
+    assert summary.unchanged == 4
+    # 이전 분석 결과가 그대로 옮겨짐
+    assert current[1].sentences[0].risk == "danger"
+    assert current[1].sentences[0].why == "s2-1 사유"
+
+
+def test_modified_inserted_and_deleted_sentences():
+    current = _articles(
+        (1, [("s1-1", "기간은 2년으로 한다.", "safe"), ("s1-2", "갱신할 수 있다.", "safe")]),
+        (2, [("s2-1", "임금은 매월 지급한다.", "safe"), ("s2-2", "상여금은 연 2회 지급한다.", "safe")]),
+    )
+    targets, summary = apply_revision(PREVIOUS, current)
+    assert summary.unchanged == 2
+    assert summary.modified == ["s1-1"]
+    assert summary.inserted == ["s2-2"]
+    assert summary.deleted == ["s2-1"]
+    # 분석 대상 조항에는 바뀐 문장만, 같은 Sentence 객체로
+    assert [(a.id, [s.id for s in a.sentences]) for a in targets] == [(1, ["s1-1"]), (2, ["s2-2"])]
+    assert targets[0].sentences[0] is current[0].sentences[0]
+    assert current[1].sentences[0].why == "s2-2 사유"  # 옮겨진 문장은 이전 결과 유지
+
+
+def test_degraded_results_are_reanalyzed():
+    previous = _articles(
+        (1, [("s1-1", "기간은 1년으로 한다.", "safe"), ("s1-2", "갱신할 수 있다.", "warning")]),
+        (2, [("s2-1", "임금은 매월 지급한다.", "warning")]),
+    )
+    previous[0].sentences[1].why = UNAVAILABLE_WHY
+    previous[1].sentences[0].why = OVER_BUDGET_WHY
+    current = _articles(
+        (1, [("s1-1", "기간은 1년으로 한다.", "safe"), ("s1-2", "갱신할 수 있다.", "safe")]),
+        (2, [("s2-1", "임금은 매월 지급한다.", "safe")]),
+    )
+    targets, summary = apply_revision(previous, current)
+    # 장애/예산 초과로 규칙 기반 판단만 받은 문장은 재사용하지 않고 다시 분석
+    assert summary.unchanged == 1
+    assert summary.modified == ["s1-2", "s2-1"]
+    assert [(a.id, [s.id for s in a.sentences]) for a in targets] == [(1, ["s1-2"]), (2, ["s2-1"])]
+    assert current[0].sentences[1].why == "s1-2 사유"
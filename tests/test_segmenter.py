@@ -0,0 +1,104 @@
+"""
+조항 분할 테스트: 문장 목록용 segment_clauses와 추출 텍스트용 TextSegmenter
+"""
+
+from app.schemas.contract.types import Article, Sentence
+from app.services.segmenter import segment_clauses
+from app.services.text_segmenter import TextSegmenter, segment_text, split_sentences
+
+CONTRACT = (
+    "표준 근로계약서\n"
+    "본 계약은 갑과 을 간의 근로조건을 다음과 같이 체결한다.\n"
+    "제1조 (계약기간) 계약기간은 1년으로 한다. 갱신할 수 있다.\n"
+    "제2조(근무장소)\n"
+    "① 근무장소는 본사로 한다.\n"
+    "② 회사는 제1조에 따라 근무장소를 바꿀 수 있다.\n"
+    "2025년 1월 1일\n"
+    "근로자: 홍길동\n"
+)
+
+
+def _ids(articles):
+    return [(a.id, [s.id for s in a.sentences]) for a in articles]
+
+
+def test_split_sentences():
+    assert split_sentences("기간은 1년으로 한다. 갱신할 수 있다.") == ["기간은 1년으로 한다.", "갱신할 수 있다."]
+    # 숫자 뒤 마침표는 문장 경계가 아님
+    assert split_sentences("월 2.5일을 준다.") == ["월 2.5일을 준다."]
+
+
+def test_text_segmenter_structure():
+    articles = segment_text([CONTRACT])
+    assert [a.id for a in articles] == ["preamble", 1, 2, "non_article"]
+    assert articles[1].title == "제1조 (계약기간)"
+    assert [s.text for s in articles[1].sentences] == ["계약기간은 1년으로 한다.", "갱신할 수 있다."]
+    assert articles[2].title == "제2조 (근무장소)"
+    # 항 번호는 떼고, 본문 속 "제1조에 따라" 인용은 헤딩으로 보지 않음
+    assert [s.text for s in articles[2].sentences] == [
+        "근무장소는 본사로 한다.", "회사는 제1조에 따라 근무장소를 바꿀 수 있다.",
+    ]
+    assert [s.text for s in articles[3].sentences] == ["2025년 1월 1일", "근로자: 홍길동"]
+
+
+def test_text_segmenter_chunk_boundaries_do_not_matter():
+    whole = _ids(segment_text([CONTRACT]))
+    for size in (1, 7, 64):
+        chunks = [CONTRACT[i:i + size] for i in range(0, len(CONTRACT), size)]
+        assert _ids(segment_text(chunks)) == whole
+
+
+def test_text_segmenter_emits_completed_articles_early():
+    segmenter = TextSegmenter()
+    assert segmenter.feed("제1조 (목적) 목적을 정한다.\n") == []
+    completed = segmenter.feed("제2조 (기간) 기간은 1년이다.\n")
+    assert [a.id for a in completed] == [1]
+    assert [a.id for a in segmenter.finish()] == [2]
+
+
+def test_text_segmenter_repeated_clause_numbers_get_unique_ids():
+    articles = segment_text([
+        "제1조 (목적) 목적을 정한다.\n제2조 (기간) 기간은 1년이다.\n"
+        "부칙\n제1조 (시행일) 이 계약은 서명한 날부터 시행한다.\n제1조 (경과조치) 종전 계약은 폐지한다.\n"
+    ])
+    assert [a.id for a in articles] == [1, 2, "1_2", "1_3"]
+    assert articles[2].title == "제1조 (시행일)"
+    sentence_ids = [s.id for a in articles for s in a.sentences]
+    assert len(sentence_ids) == len(set(sentence_ids))
+
+
+def test_segment_clauses_groups_sentences():
+    sentences = [
+        "본 계약은 갑과 을 간의 근로조건을 다음과 같이 체결한다.",
+        "제1조 (기간) 1 기간은 1년으로 한다.",
+        "갱신할 수 있다.",
+        "제2조 (임금) 임금은 매월 지급한다.",
+        "근로자: 홍길동",
+    ]
+    articles = segment_clauses([
+        Article(id=0, title="", sentences=[Sentence(id=f"x{i}", text=t, risk="safe") for i, t in enumerate(sentences)])
+    ])
+    assert [(a.id, a.title) for a in articles] == [
+        ("preamble", "서문"), (1, "제1조 (기간)"), (2, "제2조 (임금)"), ("non_article", "기타 사항"),
+    ]
+    assert [s.text for s in articles[1].sentences] == ["기간은 1년으로 한다.", "갱신할 수 있다."]
+    # 문장 id는 입력 그대로
+    assert [s.id for s in articles[1].sentences] == ["x1", "x2"]
+
+
+def test_segment_clauses_keeps_repeated_clause_numbers():
+    sentences = [
+        "제1조 (목적) 목적을 정한다.",
+        "제2조 (기간) 기간은 1년이다.",
+        "부칙",
+        "제1조 (시행일) 서명한 날부터 시행한다.",
+        "제1조 (경과조치) 종전 계약은 효력을 잃는다.",
+    ]
+    articles = segment_clauses([
+        Article(id=0, title="", sentences=[Sentence(id=f"x{i}", text=t, risk="safe") for i, t in enumerate(sentences)])
+    ])
+    # 같은 번호가 다시 나와도 앞 조항의 문장을 덮어쓰지 않음
+    assert [(a.id, a.title) for a in articles] == [
+        (1, "제1조 (목적)"), (2, "제2조 (기간)"), ("1_2", "제1조 (시행일)"), ("1_3", "제1조 (경과조치)"),
+    ]
+    assert _ids(articles) == [(1, ["x0"]), (2, ["x1", "x2"]), ("1_2", ["x3"]), ("1_3", ["x4"])]
@@ -0,0 +1,147 @@
+"""
+동일 요청 합치기(single-flight), 완료 결과 재사용, Idempotency-Key 충돌 테스트
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.single_flight import IdempotencyConflict, SingleFlight, request_key
+
+
+def test_request_key_is_order_independent():
+    a = request_key({"articles": [1, 2], "mode": "x"})
+    b = request_key({"mode": "x", "articles": [1, 2]})
+    assert a == b
+    assert a[0].startswith("sha256:")
+    key, fingerprint = request_key({"articles": [1, 2]}, "abc")
+    assert key == "idem:abc"
+    assert fingerprint != a[1]
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight(ttl=60)
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*(flight.run("k", work) for _ in range(5)))
+        replay = await flight.run("k", work)
+        return flight, calls, results, replay
+
+    flight, calls, results, replay = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sorted(mode for _, mode in results) == ["coalesced"] * 4 + ["executed"]
+    assert all(value == "result" for value, _ in results)
+    assert replay == ("result", "replayed")
+    assert (flight.executions, flight.coalesced, flight.replayed) == (1, 4, 1)
+
+
+def test_failures_are_not_replayed():
+    async def scenario():
+        flight = SingleFlight(ttl=60)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("upstream")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await flight.run("k", flaky)
+        return await flight.run("k", flaky)
+
+    assert asyncio.run(scenario()) == ("ok", "executed")
+
+
+def test_expired_results_run_again():
+    async def scenario():
+        flight = SingleFlight(ttl=0)
+
+        async def work():
+            return object()
+
+        first, _ = await flight.run("k", work)
+        second, mode = await flight.run("k", work)
+        return first is second, mode
+
+    assert asyncio.run(scenario()) == (False, "executed")
+
+
+def test_idempotency_key_with_different_payload_conflicts():
+    async def scenario():
+        flight = SingleFlight(ttl=60)
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "a"
+
+        key, fingerprint = request_key({"n": 1}, "same-key")
+        _, other = request_key({"n": 2}, "same-key")
+        running = asyncio.create_task(flight.run(key, work, fingerprint))
+        await asyncio.sleep(0)
+        with pytest.raises(IdempotencyConflict):
+            await flight.run(key, work, other)  # 진행 중
+        await running
+        with pytest.raises(IdempotencyConflict):
+            await flight.run(key, work, other)  # 완료 후 재사용 구간
+        return await flight.run(key, work, fingerprint)
+
+    assert asyncio.run(scenario()) == ("a", "replayed")
+
+
+def test_cancelled_first_caller_does_not_cancel_others():
+    async def scenario():
+        flight = SingleFlight(ttl=60)
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.run("k", work))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.run("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == ("done", "coalesced")
+
+
+def test_work_is_cancelled_when_every_caller_leaves():
+    async def scenario():
+        flight = SingleFlight(ttl=60)
+        started, cancelled = asyncio.Event(), []
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+            return "late"
+
+        callers = [asyncio.create_task(flight.run("k", work)) for _ in range(2)]
+        await started.wait()
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert not cancelled  # 남은 대기자가 있으면 계속 진행
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        async def again():
+            return "fresh"
+
+        # 취소된 작업은 재사용하지 않고, 같은 요청이 다시 오면 새로 실행
+        return cancelled, flight.abandoned, await flight.run("k", again)
+
+    assert asyncio.run(scenario()) == ([1], 1, ("fresh", "executed"))
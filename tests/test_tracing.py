@@ -0,0 +1,28 @@
+"""
+요청 트레이스(Server-Timing)와 프로파일 저장 개수 상한 테스트
+"""
+
+import os
+
+from app.services import tracing
+
+
+def test_server_timing_header():
+    trace = tracing.Trace()
+    trace.add("llm_call", 0.2)
+    trace.add("llm_call", 0.1)
+    trace.add("rules", 0.001)
+    header = trace.server_timing()
+    assert header.startswith('llm_call;dur=300.0;desc="x2", rules;dur=1.0, total;dur=')
+
+
+def test_saved_profiles_are_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(tracing, "PROFILE_MAX_FILES", 3)
+    ids = []
+    for i in range(5):
+        ids.append(tracing.save_profile(f"main;work {i}\n"))
+        os.utime(tmp_path / f"{ids[-1]}.folded", (i, i))  # 저장 순서대로 수정 시각 부여
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{i}.folded" for i in ids[2:])
+    assert tracing.load_profile(ids[0]) is None
+    assert tracing.load_profile(ids[-1]) == "main;work 4\n"
@@ -0,0 +1,88 @@
+"""
+/upload/analyze 추출 실패 처리: 오류 문구를 계약서로 분석하지 않고 422/503, 시작한 분석은 취소
+"""
+
+import asyncio
+import io
+
+import pytest
+from fastapi import FastAPI, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from app.routers.upload import file_upload
+from app.services.file.text_extractor import ExtractionError, ExtractorUnavailable, text_extractor
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / file_upload.UPLOAD_DIR).mkdir()
+    # 작업자 프로세스 대신 스레드에서 추출
+    monkeypatch.setattr(text_extractor, "sandbox", None)
+    app = FastAPI()
+    app.include_router(file_upload.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def classified(monkeypatch):
+    calls = []
+
+    async def fake_classify(articles, tier_counts=None):
+        calls.append([a.id for a in articles])
+
+    monkeypatch.setattr(file_upload, "classify_articles", fake_classify)
+    return calls
+
+
+def test_corrupt_hwp_is_rejected(client, classified):
+    response = client.post("/upload/analyze", files={"file": ("계약서.hwp", b"not an ole file" * 10)})
+    assert response.status_code == 422
+    assert "HWP" in response.json()["detail"]
+    assert classified == []
+
+
+def test_missing_dependency_is_503(client, classified, monkeypatch):
+    def unavailable(file_path):
+        raise ExtractorUnavailable("olefile이 설치되지 않았습니다.")
+
+    monkeypatch.setattr(text_extractor, "_extract_from_doc", unavailable)
+    response = client.post("/upload/analyze", files={"file": ("계약서.doc", b"\xd0\xcf\x11\xe0")})
+    assert response.status_code == 503
+    assert classified == []
+
+
+def test_failure_mid_stream_cancels_started_analyses(client, monkeypatch):
+    cancelled = []
+
+    async def slow_classify(articles, tier_counts=None):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(articles[0].id)
+            raise
+
+    async def partial_stream(file_path, file_type):
+        yield "제1조 (목적) 목적을 정한다.\n제2조 (기간) 기간은 1년이다.\n제3조 (임금) 임금은\n"
+        await asyncio.sleep(0.05)  # 제1조, 제2조 분석이 시작된 뒤 실패
+        raise ExtractionError("PDF 텍스트 추출 실패: 손상된 페이지")
+
+    monkeypatch.setattr(file_upload, "classify_articles", slow_classify)
+    monkeypatch.setattr(text_extractor, "stream_text", partial_stream)
+
+    async def scenario():
+        upload = UploadFile(io.BytesIO(b"%PDF-1.4"), filename="계약서.pdf")
+        with pytest.raises(HTTPException) as error:
+            await file_upload.upload_and_analyze(upload)
+        # 응답을 돌려주기 전에 이미 취소되어 있어야 함 (이벤트 루프 종료 시 정리가 아니라)
+        return error.value.status_code, sorted(cancelled)
+
+    assert asyncio.run(scenario()) == (422, [1, 2])
+
+
+def test_text_file_is_analyzed(client, classified):
+    body = "제1조 (목적) 목적을 정한다.\n제2조 (기간) 기간은 1년이다.\n".encode()
+    response = client.post("/upload/analyze", files={"file": ("계약서.txt", body)})
+    assert response.status_code == 200
+    assert [a["id"] for a in response.json()["articles"]] == [1, 2]
+    assert sorted(classified) == [[1], [2]]